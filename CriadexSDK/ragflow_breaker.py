@@ -0,0 +1,207 @@
+"""
+Circuit breakers keyed by endpoint family and host.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Tuple
+from urllib.parse import urlsplit
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerEvent:
+    key: Tuple[str, str]
+    old_state: BreakerState
+    new_state: BreakerState
+    at: float
+
+
+# First path segment of every Criadex route
+_ROUTE_ROOTS = frozenset({"auth", "group_auth", "groups", "models", "ragflow"})
+
+
+def route_parts(url: str) -> List[str]:
+    """
+    Path segments of a Criadex URL from its route root on, so an ``api_base`` with a path prefix
+    (``http://host/api``) classifies the same as one without.
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    for index, part in enumerate(parts):
+        if part in _ROUTE_ROOTS:
+            return parts[index:]
+    return parts
+
+
+def endpoint_family(url: str) -> str:
+    """
+    Classify a Criadex URL into an endpoint family: content, graph, groups, agents, auth or models.
+    """
+    parts = route_parts(url)
+    if not parts:
+        return "other"
+    head = parts[0]
+    if head in ("auth", "group_auth"):
+        return "auth"
+    if head == "ragflow":
+        return "agents"
+    if head == "groups":
+        action = parts[2] if len(parts) > 2 else ""
+        if action in ("graph_search", "build_graph", "graph_status"):
+            return "graph"
+        if action in ("query", "content"):
+            return "content"
+        return "groups"
+    if head == "models":
+        if "agents" in parts or parts[-1] in ("rerank", "related_prompts"):
+            return "agents"
+        return "models"
+    return "other"
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker.
+
+    Opens after ``failure_threshold`` consecutive failures, rejects calls for ``recovery_timeout``
+    seconds, then lets up to ``half_open_max_calls`` probes through. ``success_threshold`` successful
+    probes close it again; any failed probe re-opens it.
+    """
+
+    def __init__(
+        self,
+        key: Tuple[str, str],
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        success_threshold: int = 1,
+        on_transition: Callable[[BreakerEvent], None] = lambda event: None,
+    ) -> None:
+        self.key = key
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._success_threshold = success_threshold
+        self._on_transition = on_transition
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._successes = 0
+        self._probes = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state is BreakerState.OPEN and time.monotonic() - self._opened_at >= self._recovery_timeout:
+            self._transition(BreakerState.HALF_OPEN)
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        if self._state is not BreakerState.OPEN:
+            return 0.0
+        return max(0.0, self._recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Reserve a call slot; returns ``False`` when the call must fail fast."""
+        state = self.state
+        if state is BreakerState.CLOSED:
+            return True
+        if state is BreakerState.HALF_OPEN and self._probes < self._half_open_max_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state is BreakerState.HALF_OPEN:
+            self._release_probe()
+            self._successes += 1
+            if self._successes >= self._success_threshold:
+                self._transition(BreakerState.CLOSED)
+            return
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        if self._state is BreakerState.HALF_OPEN:
+            self._release_probe()
+            self._transition(BreakerState.OPEN)
+            return
+        self._failures += 1
+        if self._state is BreakerState.CLOSED and self._failures >= self._failure_threshold:
+            self._transition(BreakerState.OPEN)
+
+    def release(self) -> None:
+        """Give back a slot reserved by ``allow`` without recording an outcome (e.g. on cancellation)."""
+        if self._state is BreakerState.HALF_OPEN:
+            self._release_probe()
+
+    def _release_probe(self) -> None:
+        self._probes = max(0, self._probes - 1)
+
+    def _transition(self, new_state: BreakerState) -> None:
+        old_state, self._state = self._state, new_state
+        self._failures = 0
+        self._successes = 0
+        self._probes = 0
+        if new_state is BreakerState.OPEN:
+            self._opened_at = time.monotonic()
+        event = BreakerEvent(key=self.key, old_state=old_state, new_state=new_state, at=time.time())
+        logger.info("Circuit breaker %s/%s: %s -> %s", *self.key, old_state.value, new_state.value)
+        self._on_transition(event)
+
+
+class CircuitBreakerRegistry:
+    """
+    Lazily creates one ``CircuitBreaker`` per (endpoint family, host) and fans out state transitions
+    to subscribers.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        success_threshold: int = 1,
+    ) -> None:
+        self._settings = dict(
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            half_open_max_calls=half_open_max_calls,
+            success_threshold=success_threshold,
+        )
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._subscribers: List[Callable[[BreakerEvent], None]] = []
+        # Most recent transitions, for inspection/debugging
+        self.events: Deque[BreakerEvent] = deque(maxlen=100)
+
+    def subscribe(self, callback: Callable[[BreakerEvent], None]) -> None:
+        self._subscribers.append(callback)
+
+    def get(self, url: str) -> CircuitBreaker:
+        key = (endpoint_family(url), urlsplit(url).netloc)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key, on_transition=self._publish, **self._settings)
+            self._breakers[key] = breaker
+        return breaker
+
+    def states(self) -> Dict[Tuple[str, str], BreakerState]:
+        return {key: breaker.state for key, breaker in self._breakers.items()}
+
+    def _publish(self, event: BreakerEvent) -> None:
+        self.events.append(event)
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Circuit breaker subscriber failed")
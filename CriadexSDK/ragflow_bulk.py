@@ -0,0 +1,128 @@
+"""
+Bounded-concurrency runner for bulk content operations.
+"""
+
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import asyncio
+
+T = TypeVar("T")
+
+
+@dataclass
+class BulkItemResult:
+    index: int
+    key: str
+    ok: bool
+    result: Optional[Any] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class BulkResult:
+    items: List[BulkItemResult] = field(default_factory=list)
+    succeeded: int = 0
+    failed: int = 0
+    token_usage: int = 0
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def errors(self) -> List[BulkItemResult]:
+        return [item for item in self.items if not item.ok]
+
+
+async def _aiter(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncGenerator[T, None]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def run_bulk(
+    items: Union[Iterable[T], AsyncIterable[T]],
+    operation: Callable[[T], Awaitable[Any]],
+    *,
+    key: Callable[[T], str],
+    concurrency: int,
+    catch: Tuple[type, ...],
+    on_progress: Optional[Callable[[BulkItemResult, BulkResult], Any]] = None,
+) -> BulkResult:
+    """
+    Run ``operation`` over ``items`` with at most ``concurrency`` calls in flight.
+
+    Items are pulled lazily from the (async) iterable, so arbitrarily large inputs never
+    materialize more than ``concurrency`` pending calls. Exceptions matching ``catch`` are
+    recorded on the item instead of aborting the batch; anything else propagates.
+
+    :return: Per-item results in input order plus aggregate counts and token usage
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    summary = BulkResult()
+    source = _aiter(items)
+    source_lock = asyncio.Lock()
+    pulled_count = 0
+
+    async def next_item() -> Optional[Tuple[int, T]]:
+        nonlocal pulled_count
+        # Async generators cannot be advanced concurrently
+        async with source_lock:
+            try:
+                item = await source.__anext__()
+            except StopAsyncIteration:
+                return None
+            pulled_count += 1
+            return pulled_count - 1, item
+
+    async def worker() -> None:
+        while True:
+            pulled = await next_item()
+            if pulled is None:
+                return
+            index, item = pulled
+            try:
+                result = await operation(item)
+                outcome = BulkItemResult(index=index, key=key(item), ok=True, result=result)
+                summary.succeeded += 1
+                # Plain dicts, or response models when typed responses are enabled
+                token_usage = result.get("token_usage") if isinstance(result, dict) else getattr(result, "token_usage", None)
+                if isinstance(token_usage, int):
+                    summary.token_usage += token_usage
+            except catch as exc:
+                outcome = BulkItemResult(index=index, key=key(item), ok=False, error=exc)
+                summary.failed += 1
+            summary.items.append(outcome)
+            if on_progress is not None:
+                on_progress(outcome, summary)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        # Let the workers unwind before the source is closed underneath them
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+    finally:
+        await source.aclose()
+    summary.items.sort(key=lambda item: item.index)
+    return summary
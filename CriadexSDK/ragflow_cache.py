@@ -0,0 +1,475 @@
+"""
+In-memory caches used by RAGFlowSDK routers.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Hashable, Iterable, Mapping, Optional, Set, Tuple, Type
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def canonicalize_config(config: Any, model: Optional[Type[BaseModel]] = None) -> str:
+    """
+    Produce a stable string for a search config so equivalent configs share a cache key.
+
+    Dicts are validated into ``model`` when possible so that ``{"prompt": "x"}`` and
+    ``SearchGroupConfig(prompt="x")`` map to the same key.
+    """
+    if model is not None and not isinstance(config, BaseModel):
+        try:
+            config = model.model_validate(config)
+        except ValidationError:
+            pass
+    if isinstance(config, BaseModel):
+        config = config.model_dump(mode="json")
+    return json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class _Entry:
+    __slots__ = ("payload", "size", "expires_at", "groups")
+
+    def __init__(self, payload: bytes, expires_at: float, groups: Tuple[str, ...]) -> None:
+        self.payload = payload
+        self.size = len(payload)
+        self.expires_at = expires_at
+        self.groups = groups
+
+
+class SearchCache:
+    """
+    TTL + LRU cache for search responses, keyed by group, canonicalized search config and API key.
+
+    Responses are stored serialized, so every hit returns a fresh object that callers may mutate.
+    Entries are indexed by every group they read from (including ``extra_groups``) so a write
+    to any of those groups invalidates them.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 1024, max_bytes: Optional[int] = None) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_group: Dict[str, Set[Hashable]] = {}
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        self._stats.entries = len(self._entries)
+        self._stats.bytes = self._bytes
+        return self._stats
+
+    @staticmethod
+    def make_key(kind: str, group_name: str, canonical_config: str, api_key: Optional[str] = None) -> Hashable:
+        # The API key is part of the key so a cache shared between credentials never answers for the wrong one
+        return kind, group_name, canonical_config, api_key
+
+    def generation(self, groups: Iterable[str]) -> Tuple[int, ...]:
+        """Snapshot of the write generation of ``groups``; pass it back to ``put``."""
+        return tuple(self._generations.get(group, 0) for group in groups)
+
+    def get(self, key: Hashable, response_model: Optional[Type[BaseModel]] = None) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        if response_model is not None:
+            return response_model.model_validate_json(entry.payload)
+        return json.loads(entry.payload)
+
+    def put(self, key: Hashable, value: Any, groups: Tuple[str, ...], generation: Tuple[int, ...]) -> None:
+        """
+        Store ``value`` unless one of ``groups`` was written to since ``generation`` was taken,
+        which would mean the response may already be stale.
+        """
+        if self.generation(groups) != generation:
+            return
+        if isinstance(value, BaseModel):
+            payload = value.model_dump_json().encode()
+        else:
+            payload = json.dumps(value, separators=(",", ":")).encode()
+        if self._max_bytes is not None and len(payload) > self._max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(payload, time.monotonic() + self._ttl, groups)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        for group in groups:
+            self._by_group.setdefault(group, set()).add(key)
+        self._evict()
+
+    def invalidate_group(self, group_name: str) -> int:
+        """Drop every entry that read from ``group_name``. Returns the number of entries removed."""
+        self._generations[group_name] = self._generations.get(group_name, 0) + 1
+        keys = self._by_group.pop(group_name, set())
+        for key in keys:
+            self._remove(key)
+        self._stats.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        for group in list(self._by_group):
+            self.invalidate_group(group)
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self._max_entries
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._stats.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for group in entry.groups:
+            keys = self._by_group.get(group)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_group[group]
+
+
+class _AuthEntry:
+    __slots__ = ("payload", "status_code", "message", "expires_at")
+
+    def __init__(self, payload: bytes, status_code: Optional[int], message: str, expires_at: float) -> None:
+        self.payload = payload
+        self.status_code = status_code
+        self.message = message
+        self.expires_at = expires_at
+
+    def value(self, response_model: Optional[Type[BaseModel]] = None) -> Any:
+        if response_model is not None:
+            return response_model.model_validate_json(self.payload)
+        return json.loads(self.payload)
+
+
+def _is_authorized(value: Any) -> bool:
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    return not isinstance(value, dict) or value.get("authorized") is not False
+
+
+def _group_names(listing: Any) -> Optional[FrozenSet[str]]:
+    """Group names from a ``group_auth.list`` response, or ``None`` if they cannot be recovered."""
+    if isinstance(listing, BaseModel):
+        listing = listing.model_dump()
+    if isinstance(listing, dict):
+        listing = listing.get("indexes")
+    if not isinstance(listing, list):
+        return None
+    names = set()
+    for item in listing:
+        name = item if isinstance(item, str) else item.get("name") if isinstance(item, dict) else None
+        if not name:
+            return None
+        names.add(name)
+    return frozenset(names)
+
+
+class AuthCache:
+    """
+    TTL cache for ``auth.check`` and ``group_auth.check`` results.
+
+    Authorized results live for ``ttl`` seconds; unauthorized ones (``authorized: false`` or a
+    401/403/404 error) only for ``negative_ttl``. Everything cached for an API key, including its
+    group index, is dropped when that key or its group access is changed through the same client.
+    """
+
+    negative_statuses: FrozenSet[int] = frozenset({401, 403, 404})
+
+    def __init__(self, ttl: float = 30.0, negative_ttl: float = 5.0, max_entries: int = 10000) -> None:
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _AuthEntry]" = OrderedDict()
+        self._by_api_key: Dict[str, Set[Hashable]] = {}
+        self._group_index: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+        self._generations: Dict[str, int] = {}
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        self._stats.entries = len(self._entries)
+        return self._stats
+
+    @staticmethod
+    def make_key(api_key: str, group_name: Optional[str] = None) -> Hashable:
+        return ("auth", api_key) if group_name is None else ("group_auth", api_key, group_name)
+
+    def generation(self, api_key: str) -> int:
+        """Snapshot of ``api_key``'s write generation; pass it back to ``put``/``put_error``/``index_groups``."""
+        return self._generations.get(api_key, 0)
+
+    def get(self, api_key: str, group_name: Optional[str] = None) -> Optional[_AuthEntry]:
+        key = self.make_key(api_key, group_name)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry
+        if entry is not None:
+            self._remove(key)
+        if group_name is not None and self._indexed(api_key, group_name):
+            self._stats.hits += 1
+            master = self._cached_master(api_key)
+            payload = json.dumps({"authorized": True, "master": master}).encode()
+            return _AuthEntry(payload, None, "", 0.0)
+        self._stats.misses += 1
+        return None
+
+    def put(self, api_key: str, group_name: Optional[str], value: Any, generation: int) -> None:
+        if isinstance(value, BaseModel):
+            payload = value.model_dump_json().encode()
+        else:
+            payload = json.dumps(value, separators=(",", ":")).encode()
+        ttl = self._ttl if _is_authorized(value) else self._negative_ttl
+        self._store(api_key, group_name, _AuthEntry(payload, None, "", time.monotonic() + ttl), generation)
+
+    def put_error(
+        self, api_key: str, group_name: Optional[str], status_code: int, message: str, generation: int
+    ) -> None:
+        if status_code not in self.negative_statuses:
+            return
+        entry = _AuthEntry(b"null", status_code, message, time.monotonic() + self._negative_ttl)
+        self._store(api_key, group_name, entry, generation)
+
+    def index_groups(self, api_key: str, listing: Any, generation: int) -> None:
+        """Remember the groups ``api_key`` can access, from a ``group_auth.list`` response."""
+        names = _group_names(listing)
+        if names is None or self.generation(api_key) != generation:
+            return
+        self._group_index[api_key] = (time.monotonic() + self._ttl, names)
+
+    def invalidate_key(self, api_key: str) -> int:
+        """Drop every result and the group index for ``api_key``. Returns the number of entries removed."""
+        self._generations[api_key] = self._generations.get(api_key, 0) + 1
+        self._group_index.pop(api_key, None)
+        keys = self._by_api_key.pop(api_key, set())
+        for key in keys:
+            self._remove(key)
+        self._stats.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        for api_key in set(self._by_api_key) | set(self._group_index):
+            self.invalidate_key(api_key)
+
+    def _indexed(self, api_key: str, group_name: str) -> bool:
+        indexed = self._group_index.get(api_key)
+        if indexed is None:
+            return False
+        expires_at, names = indexed
+        if expires_at <= time.monotonic():
+            del self._group_index[api_key]
+            return False
+        return group_name in names
+
+    def _cached_master(self, api_key: str) -> Optional[bool]:
+        entry = self._entries.get(self.make_key(api_key))
+        if entry is None or entry.status_code is not None or entry.expires_at <= time.monotonic():
+            return None
+        value = json.loads(entry.payload)
+        return value.get("master") if isinstance(value, dict) else None
+
+    def _store(self, api_key: str, group_name: Optional[str], entry: _AuthEntry, generation: int) -> None:
+        if self.generation(api_key) != generation:
+            return
+        key = self.make_key(api_key, group_name)
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        self._by_api_key.setdefault(api_key, set()).add(key)
+        while len(self._entries) > self._max_entries:
+            self._remove(next(iter(self._entries)))
+            self._stats.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        if self._entries.pop(key, None) is None:
+            return
+        keys = self._by_api_key.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_api_key[key[1]]
+
+
+@dataclass
+class ValidatorStats:
+    not_modified: int = 0
+    refetched: int = 0
+    stale_served: int = 0
+    background_refreshes: int = 0
+    bytes_saved: int = 0
+
+
+def _request_url(key: Hashable) -> str:
+    url = key[1] if isinstance(key, tuple) and len(key) > 1 else None
+    return url if isinstance(url, str) else ""
+
+
+def _request_group(key: Hashable) -> Optional[str]:
+    """The group a ``request_key`` reads from, taken from a ``.../groups/{group_name}/...`` URL."""
+    url = _request_url(key)
+    if not url:
+        return None
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    if "groups" in parts[:-1]:
+        return parts[parts.index("groups") + 1]
+    return None
+
+
+class _ValidatedEntry:
+    __slots__ = ("body", "etag", "last_modified", "stored_at")
+
+    def __init__(self, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ValidatorCache:
+    """
+    Remember response bodies with their ``ETag``/``Last-Modified`` validators so metadata endpoints
+    can be re-requested conditionally and served from memory on ``304 Not Modified``.
+
+    With ``stale_while_revalidate`` a cached body younger than ``max_stale`` seconds is returned
+    immediately while a single background request per key revalidates it.
+
+    Writes to a group call ``invalidate_group`` so its ``about``, ``graph_status`` and ``content/list``
+    entries are dropped, and model writes call ``invalidate_prefix`` for the ``models/`` endpoints.
+    Responses to requests that started before such a write are not stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        stale_while_revalidate: bool = False,
+        max_stale: float = 300.0,
+    ) -> None:
+        self._max_entries = max_entries
+        self.stale_while_revalidate = stale_while_revalidate
+        self._max_stale = max_stale
+        self._entries: "OrderedDict[Hashable, _ValidatedEntry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        # Bumped by invalidate_group/invalidate_prefix so in-flight reads cannot store pre-write bodies
+        self._generations: Dict[str, int] = {}
+        self._prefix_generations: Dict[str, int] = {}
+        self.stats = ValidatorStats()
+
+    def get(self, key: Hashable) -> Optional[_ValidatedEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get_stale(self, key: Hashable) -> Optional[_ValidatedEntry]:
+        """An entry that may be served before revalidation, when stale-while-revalidate is on."""
+        entry = self.get(key) if self.stale_while_revalidate else None
+        if entry is None or time.monotonic() - entry.stored_at > self._max_stale:
+            return None
+        self.stats.stale_served += 1
+        return entry
+
+    def generation(self, key: Hashable) -> Tuple[int, int]:
+        """Pass to ``store`` to drop a response if the key's group or URL is invalidated while it is in flight."""
+        url = _request_url(key)
+        prefixes = sum(count for prefix, count in self._prefix_generations.items() if url.startswith(prefix))
+        return self._generations.get(_request_group(key) or "", 0), prefixes
+
+    def store(
+        self, key: Hashable, body: bytes, headers: Mapping[str, str], generation: Optional[Tuple[int, int]] = None
+    ) -> None:
+        if generation is not None and generation != self.generation(key):
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = _ValidatedEntry(body, headers.get("etag"), headers.get("last-modified"))
+        self.stats.refetched += 1
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def not_modified(self, key: Hashable) -> Optional[bytes]:
+        """Record a ``304`` for ``key`` and return the cached body (``None`` if it was evicted meanwhile)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.stored_at = time.monotonic()
+        self.stats.not_modified += 1
+        self.stats.bytes_saved += len(entry.body)
+        return entry.body
+
+    def refresh_in_background(self, key: Hashable, refresh: Callable[[], Awaitable[Any]]) -> None:
+        """Run ``refresh`` in a task unless one is already running for ``key``; failures are only logged."""
+        if key in self._refreshing:
+            return
+        self.stats.background_refreshes += 1
+        task = asyncio.ensure_future(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done: self._refreshed(key, done))
+
+    def invalidate_group(self, group_name: str) -> int:
+        """Drop every entry read from ``group_name``. Returns the number of entries removed."""
+        self._generations[group_name] = self._generations.get(group_name, 0) + 1
+        keys = [key for key in self._entries if _request_group(key) == group_name]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def invalidate_prefix(self, url_prefix: str) -> int:
+        """Drop every entry whose URL starts with ``url_prefix``. Returns the number of entries removed."""
+        self._prefix_generations[url_prefix] = self._prefix_generations.get(url_prefix, 0) + 1
+        keys = [key for key in self._entries if _request_url(key).startswith(url_prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _refreshed(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        self._refreshing.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Background revalidation of %s failed: %s", key, task.exception())
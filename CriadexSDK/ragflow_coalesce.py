@@ -0,0 +1,69 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import asyncio
+import json
+
+
+@dataclass
+class CoalescingStats:
+    calls: int = 0
+    executed: int = 0
+    coalesced: int = 0
+
+    @property
+    def saved_ratio(self) -> float:
+        return self.coalesced / self.calls if self.calls else 0.0
+
+
+def request_key(method: str, url: str, api_key: Optional[str] = None, **kwargs: Any) -> Hashable:
+    """
+    Build a coalescing key from everything that can change the response of a request.
+    """
+    body = {name: kwargs.get(name) for name in ("params", "json", "content", "headers") if kwargs.get(name) is not None}
+    return method.upper(), url, api_key, json.dumps(body, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+class RequestCoalescer:
+    """
+    Share one underlying call between identical requests that are in flight at the same time.
+
+    The first caller for a key runs the call; callers that arrive before it finishes await the
+    same result (or exception) instead of issuing their own request. All of them receive the
+    same result object, so treat coalesced responses as read-only.
+
+    The call runs in its own task, so cancelling one waiter does not cancel the others.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._stats = CoalescingStats()
+
+    @property
+    def stats(self) -> CoalescingStats:
+        return self._stats
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        self._stats.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self._stats.executed += 1
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self._stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        self._in_flight.pop(key, None)
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
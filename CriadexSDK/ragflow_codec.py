@@ -0,0 +1,92 @@
+"""
+Pluggable JSON codecs for encoding request bodies and decoding responses.
+
+``orjson`` and ``msgspec`` are optional; ``get_codec("auto")`` picks the fastest one installed
+and falls back to the standard library.
+"""
+
+from typing import Any, Union
+import json
+
+
+class JSONCodec:
+    """Encode Python objects to JSON bytes and decode JSON bytes back."""
+
+    name: str = "base"
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        raise NotImplementedError
+
+
+class StdlibCodec(JSONCodec):
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decode_error = msgspec.DecodeError
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as exc:
+            # Match json/orjson, whose decode errors are ValueErrors
+            raise ValueError(str(exc)) from exc
+
+
+_CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "stdlib": StdlibCodec,
+}
+
+
+def get_codec(codec: Union[str, JSONCodec] = "auto") -> JSONCodec:
+    """
+    Resolve a codec by name (``"auto"``, ``"orjson"``, ``"msgspec"`` or ``"stdlib"``) or pass one through.
+
+    :raises ImportError: If a specific optional codec is requested but not installed
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _CODECS[name]()
+            except ImportError:
+                continue
+        return StdlibCodec()
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown JSON codec {codec!r}; expected one of 'auto', {', '.join(map(repr, _CODECS))}")
+    return _CODECS[codec]()
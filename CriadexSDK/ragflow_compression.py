@@ -0,0 +1,94 @@
+"""
+Request body compression, response encoding negotiation and per-endpoint byte accounting.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Container, Dict, Optional, Tuple
+import gzip
+
+
+@dataclass
+class CompressionStats:
+    requests: int = 0
+    request_bytes: int = 0
+    request_wire_bytes: int = 0
+    responses: int = 0
+    response_bytes: int = 0
+    response_wire_bytes: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return (self.request_bytes - self.request_wire_bytes) + (self.response_bytes - self.response_wire_bytes)
+
+
+def _httpx_decoders() -> Container[str]:
+    try:
+        from httpx._decoders import SUPPORTED_DECODERS
+    except ImportError:
+        return ("gzip", "deflate")
+    return SUPPORTED_DECODERS
+
+
+def accept_encoding() -> str:
+    """
+    ``Accept-Encoding`` value listing every response encoding the installed httpx can decode.
+
+    Asks httpx itself rather than probing for ``brotli``/``zstandard``: httpx before 0.27.1 cannot
+    decode zstd even when ``zstandard`` is importable.
+    """
+    decoders = _httpx_decoders()
+    return ", ".join(encoding for encoding in ("gzip", "deflate", "br", "zstd") if encoding in decoders)
+
+
+class CompressionPolicy:
+    """
+    Compress request bodies of at least ``threshold`` bytes with ``encoding`` (``"gzip"`` or ``"zstd"``),
+    advertise br/zstd responses when their decoders are installed, and keep byte counts per endpoint family.
+
+    The server must accept ``Content-Encoding`` on requests for request compression to be usable.
+
+    :raises ImportError: If ``"zstd"`` is requested but ``zstandard`` is not installed
+    """
+
+    def __init__(self, encoding: str = "gzip", threshold: int = 1024, level: Optional[int] = None) -> None:
+        if encoding == "gzip":
+            compress_level = 6 if level is None else level
+            self._compress: Callable[[bytes], bytes] = lambda body: gzip.compress(body, compresslevel=compress_level)
+        elif encoding == "zstd":
+            import zstandard
+
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+            self._compress = compressor.compress
+        else:
+            raise ValueError(f"Unsupported request encoding {encoding!r}; expected 'gzip' or 'zstd'")
+        self.encoding = encoding
+        self._threshold = threshold
+        self.accept_encoding = accept_encoding()
+        self.stats: Dict[str, CompressionStats] = {}
+
+    def compress(self, body: bytes) -> Optional[Tuple[bytes, str]]:
+        """Compressed body and its ``Content-Encoding``, or ``None`` if it is too small or does not shrink."""
+        if len(body) < self._threshold:
+            return None
+        compressed = self._compress(body)
+        if len(compressed) >= len(body):
+            return None
+        return compressed, self.encoding
+
+    def record_request(self, endpoint: str, raw_bytes: int, wire_bytes: int) -> None:
+        stats = self._stats(endpoint)
+        stats.requests += 1
+        stats.request_bytes += raw_bytes
+        stats.request_wire_bytes += wire_bytes
+
+    def record_response(self, endpoint: str, decoded_bytes: int, wire_bytes: int) -> None:
+        stats = self._stats(endpoint)
+        stats.responses += 1
+        stats.response_bytes += decoded_bytes
+        stats.response_wire_bytes += wire_bytes
+
+    def _stats(self, endpoint: str) -> CompressionStats:
+        stats = self.stats.get(endpoint)
+        if stats is None:
+            stats = self.stats[endpoint] = CompressionStats()
+        return stats
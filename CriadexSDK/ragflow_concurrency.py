@@ -0,0 +1,145 @@
+"""
+Adaptive concurrency limiting with bounded queueing and load shedding.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConcurrencyStats:
+    admitted: int = 0
+    queued: int = 0
+    shed: int = 0
+    decreases: int = 0
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Cap in-flight requests with a limit that adapts to observed latency (AIMD, Vegas-style signal).
+
+    The baseline is the lowest latency among the last ``sample_size`` completions. While completions
+    stay within ``latency_tolerance`` times that baseline and the limit is being used, it grows by
+    about one slot per limit's worth of completions; a slower completion, a 5xx/429 or a network
+    error multiplies it by ``backoff_ratio``. Calls over the limit wait in a FIFO queue for at most
+    ``queue_timeout`` seconds (and at most ``max_queue`` may wait) before being shed.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        queue_timeout: float = 1.0,
+        max_queue: Optional[int] = None,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.9,
+        sample_size: int = 100,
+    ) -> None:
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._queue_timeout = queue_timeout
+        self._max_queue = max_queue
+        self._latency_tolerance = latency_tolerance
+        self._backoff_ratio = backoff_ratio
+        self._latencies: Deque[float] = deque(maxlen=sample_size)
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._in_flight = 0
+        self.stats = ConcurrencyStats()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take a slot, queueing for up to ``queue_timeout`` (or ``timeout`` if sooner).
+
+        :return: ``False`` when the call was shed and must not be sent
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self.stats.admitted += 1
+            return True
+        if self._max_queue is not None and len(self._waiters) >= self._max_queue:
+            self.stats.shed += 1
+            return False
+
+        wait = self._queue_timeout if timeout is None else min(self._queue_timeout, timeout)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), max(wait, 0.0))
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as the wait expired; use it rather than leaking it
+                self.stats.admitted += 1
+                return True
+            waiter.cancel()
+            self._remove(waiter)
+            self.stats.shed += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._in_flight -= 1
+                self._wake()
+            else:
+                waiter.cancel()
+                self._remove(waiter)
+            raise
+        self.stats.admitted += 1
+        return True
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        """
+        Return a slot and feed the outcome into the limit.
+
+        :param latency: Seconds the call took, or ``None`` when it produced no usable sample
+        :param overloaded: Whether the backend signalled overload (5xx, 429, network error)
+        """
+        if overloaded:
+            self._decrease()
+        elif latency is not None:
+            self._latencies.append(latency)
+            baseline = min(self._latencies)
+            if latency > baseline * self._latency_tolerance:
+                self._decrease()
+            elif self._in_flight >= self.limit:
+                # Only grow when the limit is actually the bottleneck
+                self._limit = min(float(self._max_limit), self._limit + 1.0 / self._limit)
+        self._in_flight -= 1
+        self._wake()
+
+    def _decrease(self) -> None:
+        self._limit = max(float(self._min_limit), self._limit * self._backoff_ratio)
+        self.stats.decreases += 1
+        logger.debug("Concurrency limit lowered to %d", self.limit)
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _remove(self, waiter: "asyncio.Future[None]") -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
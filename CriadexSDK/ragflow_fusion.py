@@ -0,0 +1,142 @@
+"""
+Client-side merging of search results from several requests.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+import heapq
+
+
+def _score(node: dict) -> float:
+    score = node.get("score")
+    return float(score) if score is not None else float("-inf")
+
+
+def merge_top_k(node_lists: Iterable[List[dict]], limit: Optional[int] = None) -> List[dict]:
+    """
+    Merge ``TextNodeWithScore`` dicts from several searches into one list ordered by score.
+
+    Uses a bounded heap when ``limit`` is set, so only ``limit`` nodes are kept regardless of
+    how many groups were searched.
+    """
+    nodes = (node for node_list in node_lists for node in node_list)
+    if limit is None:
+        return sorted(nodes, key=_score, reverse=True)
+    return heapq.nlargest(limit, nodes, key=_score)
+
+
+def dedupe_assets(asset_lists: Iterable[List[dict]]) -> List[dict]:
+    """
+    Concatenate ``Asset`` dicts, keeping the first occurrence of each ``uuid``.
+    """
+    seen: Set[Any] = set()
+    merged: List[dict] = []
+    for asset_list in asset_lists:
+        for asset in asset_list:
+            uuid = asset.get("uuid")
+            if uuid is not None:
+                if uuid in seen:
+                    continue
+                seen.add(uuid)
+            merged.append(asset)
+    return merged
+
+
+def merge_reranked(responses: Iterable[dict], top_n: Optional[int] = None) -> dict:
+    """
+    Merge rerank responses for chunks of one document list into a single ``AgentRerankResponse`` dict.
+
+    Ranked nodes from every chunk are merged into one global top ``top_n`` by score and
+    ``search_units`` are summed.
+    """
+    agent_responses = [response.get("agent_response") or {} for response in responses]
+    search_units = [agent.get("search_units") for agent in agent_responses if agent.get("search_units") is not None]
+    message = next((agent["message"] for agent in agent_responses if agent.get("message") is not None), None)
+    return {
+        "agent_response": {
+            "message": message,
+            "ranked_nodes": merge_top_k((agent.get("ranked_nodes") or [] for agent in agent_responses), top_n),
+            "search_units": sum(search_units) if search_units else 0,
+        }
+    }
+
+
+def node_identity(node: dict) -> Any:
+    """
+    Key identifying the same node across result lists: its ``id_`` when present, else its text.
+    """
+    inner = node.get("node") or {}
+    identity = inner.get("id_") or inner.get("id")
+    return identity if identity is not None else inner.get("text")
+
+
+def _fused(scores: Dict[Any, List[Any]], limit: Optional[int]) -> List[dict]:
+    # One shallow copy per kept node, with the fused score in place of the per-list one
+    entries = scores.values() if limit is None else heapq.nlargest(limit, scores.values(), key=lambda entry: entry[0])
+    fused = [{**node, "score": score} for score, node in entries]
+    if limit is None:
+        fused.sort(key=_score, reverse=True)
+    return fused
+
+
+def _weights(node_lists: Sequence[List[dict]], weights: Optional[Sequence[float]]) -> Sequence[float]:
+    if weights is None:
+        return [1.0] * len(node_lists)
+    if len(weights) != len(node_lists):
+        raise ValueError("Need one weight per result list")
+    return weights
+
+
+def reciprocal_rank_fusion(
+    node_lists: Sequence[List[dict]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+    limit: Optional[int] = None,
+) -> List[dict]:
+    """
+    Fuse ranked ``TextNodeWithScore`` lists by reciprocal rank: ``sum(weight / (k + rank))``.
+
+    Each list is taken in the order given (best first, as the server returns it). Only ranks are used, so lists with incomparable score scales can be combined. Nodes are
+    deduplicated by ``node_identity``, keeping the first occurrence, and returned with the fused score.
+    """
+    scores: Dict[Any, List[Any]] = {}
+    for node_list, weight in zip(node_lists, _weights(node_lists, weights)):
+        for rank, node in enumerate(node_list, start=1):
+            identity = node_identity(node)
+            entry = scores.get(identity)
+            if entry is None:
+                scores[identity] = [weight / (k + rank), node]
+            else:
+                entry[0] += weight / (k + rank)
+    return _fused(scores, limit)
+
+
+def weighted_score_fusion(
+    node_lists: Sequence[List[dict]],
+    weights: Optional[Sequence[float]] = None,
+    limit: Optional[int] = None,
+) -> List[dict]:
+    """
+    Fuse ``TextNodeWithScore`` lists by a weighted sum of min-max normalized scores.
+
+    Each list's scores are scaled to ``[0, 1]`` first so a list with larger raw scores does not
+    dominate. Nodes without a score count as 0. Deduplicated by ``node_identity`` like
+    ``reciprocal_rank_fusion``.
+    """
+    scores: Dict[Any, List[Any]] = {}
+    for node_list, weight in zip(node_lists, _weights(node_lists, weights)):
+        raw = [node.get("score") for node in node_list]
+        present = [score for score in raw if score is not None]
+        low, high = (min(present), max(present)) if present else (0.0, 0.0)
+        span = high - low
+        for node, score in zip(node_list, raw):
+            if score is None:
+                normalized = 0.0
+            else:
+                normalized = (score - low) / span if span else 1.0
+            identity = node_identity(node)
+            entry = scores.get(identity)
+            if entry is None:
+                scores[identity] = [weight * normalized, node]
+            else:
+                entry[0] += weight * normalized
+    return _fused(scores, limit)
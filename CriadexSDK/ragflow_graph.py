@@ -0,0 +1,231 @@
+"""
+Graph build polling: progress-adaptive backoff and a multi-group build scheduler.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import time
+
+from CriadexSDK.ragflow_bulk import BulkItemResult, BulkResult
+from CriadexSDK.ragflow_schemas import GraphStatusResponse
+
+# Job states that mean a build has not finished yet; anything else is terminal
+ACTIVE_JOB_STATES = frozenset({"QUEUED", "PENDING", "RUNNING", "BUILDING", "IN_PROGRESS"})
+FAILED_JOB_STATES = frozenset({"FAILED", "ERROR", "CANCELLED"})
+
+
+def _job_id(build_response: Any) -> Optional[str]:
+    """The job id from a ``build_graph`` response, typed or not."""
+    job = build_response.get("job") if isinstance(build_response, dict) else getattr(build_response, "job", None)
+    if isinstance(job, dict):
+        return job.get("job_id")
+    return getattr(job, "job_id", None)
+
+
+def is_building(status: GraphStatusResponse, job_id: Optional[str] = None) -> bool:
+    """
+    Whether the build is still running. A status that still reports an older job than ``job_id``
+    counts as running, since the new job has not been picked up yet.
+    """
+    job = status.job
+    if job is None:
+        return status.graph.status.upper() in ACTIVE_JOB_STATES
+    if job_id is not None and job.job_id is not None and job.job_id != job_id:
+        return True
+    return job.state.upper() in ACTIVE_JOB_STATES
+
+
+def build_failed(status: GraphStatusResponse) -> bool:
+    if status.job is not None:
+        return status.job.state.upper() in FAILED_JOB_STATES or status.job.error is not None
+    return status.graph.status.upper() in FAILED_JOB_STATES
+
+
+class GraphPollBackoff:
+    """
+    Poll interval for one build, adapted to how fast ``GraphBuildJob.progress`` moves.
+
+    While progress advances, the next poll is scheduled about halfway to the estimated finish.
+    While it stalls, the interval grows by ``multiplier``. Both are clamped to
+    ``[initial_interval, max_interval]``.
+    """
+
+    def __init__(self, initial_interval: float = 0.5, max_interval: float = 10.0, multiplier: float = 1.5) -> None:
+        if initial_interval <= 0 or max_interval < initial_interval:
+            raise ValueError("Need 0 < initial_interval <= max_interval")
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self._interval = initial_interval
+        # (progress, time) of the last observed change
+        self._last: Optional[Tuple[int, float]] = None
+
+    def next_interval(self, progress: int, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        if self._last is None:
+            interval = self.initial_interval
+            self._last = (progress, now)
+        elif progress > self._last[0] and now > self._last[1]:
+            rate = (progress - self._last[0]) / (now - self._last[1])
+            interval = max(100 - progress, 0) / rate / 2
+            self._last = (progress, now)
+        else:
+            interval = self._interval * self.multiplier
+        self._interval = min(max(interval, self.initial_interval), self.max_interval)
+        return self._interval
+
+
+@dataclass
+class GraphBuildProgress:
+    total: int = 0
+    queued: int = 0
+    building: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    # Per-group job progress (0-100); finished groups count as 100
+    progress: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def percent(self) -> float:
+        if not self.total:
+            return 100.0
+        return sum(self.progress.values()) / self.total
+
+
+@dataclass
+class _Build:
+    index: int
+    job_id: Optional[str]
+    backoff: GraphPollBackoff
+    deadline: Optional[float]
+    next_poll: float
+
+
+class GraphBuildScheduler:
+    """
+    Build graphs for many groups with at most ``concurrency`` builds running at once.
+
+    Every running build is polled from a single loop that sleeps until the earliest poll is due and
+    then checks all due groups together, each on its own ``GraphPollBackoff``. A group whose job
+    fails is recorded as not ok with its final status; a group whose build or status call raises one
+    of ``catch`` (or exceeds ``timeout`` seconds) is recorded with the error.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[str], Awaitable[Any]],
+        status: Callable[[str], Awaitable[GraphStatusResponse]],
+        concurrency: int = 4,
+        timeout: Optional[float] = None,
+        backoff: Callable[[], GraphPollBackoff] = GraphPollBackoff,
+        catch: Tuple[type, ...] = (Exception,),
+        on_progress: Optional[Callable[[GraphBuildProgress], Any]] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._build = build
+        self._status = status
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._backoff = backoff
+        self._catch = catch
+        self._on_progress = on_progress
+        self.progress = GraphBuildProgress()
+
+    async def _start(self, group_name: str, index: int) -> _Build:
+        job_id = _job_id(await self._build(group_name))
+        now = time.monotonic()
+        backoff = self._backoff()
+        return _Build(
+            index=index,
+            job_id=job_id,
+            backoff=backoff,
+            deadline=None if self._timeout is None else now + self._timeout,
+            next_poll=now + backoff.next_interval(0, now),
+        )
+
+    async def run(self, group_names: Iterable[str]) -> BulkResult:
+        """
+        :return: One item per group in input order, with the final ``GraphStatusResponse`` as its result
+        """
+        groups: List[str] = list(dict.fromkeys(group_names))
+        summary = BulkResult()
+        self.progress = progress = GraphBuildProgress(total=len(groups), queued=len(groups))
+        progress.progress = {group_name: 0 for group_name in groups}
+        pending = list(enumerate(groups))
+        pending.reverse()
+        running: Dict[str, _Build] = {}
+
+        def finish(group_name: str, index: int, ok: bool, result: Any = None, error: Optional[BaseException] = None) -> None:
+            summary.items.append(BulkItemResult(index=index, key=group_name, ok=ok, result=result, error=error))
+            if ok:
+                summary.succeeded += 1
+                progress.succeeded += 1
+            else:
+                summary.failed += 1
+                progress.failed += 1
+            progress.progress[group_name] = 100
+
+        while pending or running:
+            starting = []
+            while pending and len(running) + len(starting) < self._concurrency:
+                starting.append(pending.pop())
+            if starting:
+                progress.queued -= len(starting)
+                started = await asyncio.gather(
+                    *(self._start(group_name, index) for index, group_name in starting), return_exceptions=True
+                )
+                for (index, group_name), build in zip(starting, started):
+                    if isinstance(build, _Build):
+                        running[group_name] = build
+                    elif isinstance(build, self._catch):
+                        finish(group_name, index, False, error=build)
+                    else:
+                        raise build
+                progress.building = len(running)
+                if self._on_progress is not None:
+                    self._on_progress(progress)
+                continue
+
+            now = time.monotonic()
+            due = [group_name for group_name, build in running.items() if build.next_poll <= now]
+            if not due:
+                await asyncio.sleep(min(build.next_poll for build in running.values()) - now)
+                continue
+
+            statuses = await asyncio.gather(*(self._status(group_name) for group_name in due), return_exceptions=True)
+            now = time.monotonic()
+            for group_name, status in zip(due, statuses):
+                build = running[group_name]
+                if isinstance(status, BaseException):
+                    if not isinstance(status, self._catch):
+                        raise status
+                    del running[group_name]
+                    finish(group_name, build.index, False, error=status)
+                elif not is_building(status, build.job_id):
+                    del running[group_name]
+                    finish(group_name, build.index, not build_failed(status), result=status)
+                elif build.deadline is not None and now >= build.deadline:
+                    del running[group_name]
+                    finish(
+                        group_name,
+                        build.index,
+                        False,
+                        result=status,
+                        error=TimeoutError(f"Graph build for {group_name} did not finish within {self._timeout}s"),
+                    )
+                else:
+                    job = status.job
+                    current = job is not None and (build.job_id is None or job.job_id in (None, build.job_id))
+                    job_progress = job.progress if current else 0
+                    progress.progress[group_name] = job_progress
+                    build.next_poll = now + build.backoff.next_interval(job_progress, now)
+                    if build.deadline is not None:
+                        build.next_poll = min(build.next_poll, build.deadline)
+            progress.building = len(running)
+            if self._on_progress is not None:
+                self._on_progress(progress)
+
+        summary.items.sort(key=lambda item: item.index)
+        return summary
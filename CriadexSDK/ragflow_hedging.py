@@ -0,0 +1,170 @@
+"""
+Hedged requests: fire a backup attempt when the first one is slower than usual.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+import asyncio
+import time
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgingStats:
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    budget_rejections: int = 0
+
+
+# Path segments followed by an identifier (group name, model id, API key) in Criadex URLs
+_COLLECTIONS = frozenset({"groups", "group_auth", "auth", "models", "ragflow"})
+
+
+def route_key(method: str, url: str) -> str:
+    """
+    Latency key for a request: its method and URL path with identifiers replaced by ``{}``, so
+    ``content/list`` and ``query`` on every group are tracked separately from each other.
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    route = [
+        "{}" if index and parts[index - 1] in _COLLECTIONS and part not in _COLLECTIONS else part
+        for index, part in enumerate(parts)
+    ]
+    return f"{method.upper()} /{'/'.join(route)}"
+
+
+class HedgingPolicy:
+    """
+    Decide when to hedge and cap how much extra load hedging may add.
+
+    The hedge delay for an endpoint is the ``percentile`` of its recently observed latencies
+    (clamped to ``[min_delay, max_delay]``), or ``initial_delay`` until ``min_samples`` latencies
+    have been recorded. At most ``budget_ratio`` of the requests seen in the last ``window``
+    seconds may be hedged.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.01,
+        max_delay: float = 10.0,
+        min_samples: int = 20,
+        sample_size: int = 500,
+        budget_ratio: float = 0.1,
+        window: float = 10.0,
+    ) -> None:
+        self._percentile = percentile
+        self._initial_delay = initial_delay
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._min_samples = min_samples
+        self._sample_size = sample_size
+        self._budget_ratio = budget_ratio
+        self._window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._requests: Deque[float] = deque()
+        self._hedges: Deque[float] = deque()
+        self.stats = HedgingStats()
+
+    def delay(self, key: str) -> float:
+        samples = self._latencies.get(key)
+        if samples is None or len(samples) < self._min_samples:
+            return self._initial_delay
+        ordered = sorted(samples)
+        value = ordered[min(len(ordered) - 1, int(self._percentile * len(ordered)))]
+        return min(self._max_delay, max(self._min_delay, value))
+
+    def record_latency(self, key: str, latency: float) -> None:
+        samples = self._latencies.get(key)
+        if samples is None:
+            samples = self._latencies[key] = deque(maxlen=self._sample_size)
+        samples.append(latency)
+
+    def record_request(self) -> None:
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+        self.stats.requests += 1
+
+    def try_acquire_hedge(self) -> bool:
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._hedges) + 1 > self._budget_ratio * len(self._requests):
+            self.stats.budget_rejections += 1
+            return False
+        self._hedges.append(now)
+        self.stats.hedged += 1
+        return True
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self._window
+        for events in (self._requests, self._hedges):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+
+async def _cancel(task: "asyncio.Future[T]") -> None:
+    task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    policy: HedgingPolicy,
+    key: str,
+    is_failure: Optional[Callable[[T], bool]] = None,
+) -> T:
+    """
+    Run ``call``; if it has not finished after the policy's delay for ``key``, start a second
+    ``call`` and return whichever completes successfully first, cancelling the other.
+
+    A result for which ``is_failure`` returns true (e.g. a retryable 5xx response) does not win: the
+    other attempt is awaited, and the failed result is only returned if neither attempt succeeds.
+    """
+    policy.record_request()
+    started = time.perf_counter()
+    primary = asyncio.ensure_future(call())
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=policy.delay(key))
+    except BaseException:
+        await _cancel(primary)
+        raise
+    if done or not policy.try_acquire_hedge():
+        result = await primary
+        policy.record_latency(key, time.perf_counter() - started)
+        return result
+
+    backup = asyncio.ensure_future(call())
+    pending = {primary, backup}
+    first_error: Optional[BaseException] = None
+    failed: Optional["asyncio.Future[T]"] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    continue
+                error = task.exception()
+                if error is not None:
+                    first_error = first_error or error
+                elif is_failure is not None and is_failure(task.result()):
+                    failed = failed or task
+                else:
+                    if task is backup:
+                        policy.stats.hedge_wins += 1
+                    policy.record_latency(key, time.perf_counter() - started)
+                    return task.result()
+        if failed is not None:
+            return failed.result()
+        raise first_error if first_error is not None else asyncio.CancelledError()
+    finally:
+        for task in pending:
+            await _cancel(task)
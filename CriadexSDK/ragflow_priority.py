@@ -0,0 +1,121 @@
+"""
+Priority scheduling of requests in front of the connection pool.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar, Union
+import asyncio
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+@dataclass
+class SchedulerStats:
+    admitted: Dict[Priority, int] = field(default_factory=lambda: {priority: 0 for priority in Priority})
+    queued: Dict[Priority, int] = field(default_factory=lambda: {priority: 0 for priority in Priority})
+
+
+def as_priority(value: Union[None, str, int, Priority]) -> Priority:
+    """Accept ``Priority`` members, their names (``"high"``) or values; ``None`` means ``NORMAL``."""
+    if value is None:
+        return Priority.NORMAL
+    if isinstance(value, str):
+        return Priority[value.upper()]
+    return Priority(value)
+
+
+class PriorityScheduler:
+    """
+    Admit at most ``max_concurrency`` requests at a time, highest priority first.
+
+    Every admission decision gives each waiting lower-priority queue ``min_share`` credit; a queue
+    holding a whole credit is admitted instead of the higher one. A queue that is always behind
+    therefore still gets roughly ``min_share`` of the freed slots.
+    """
+
+    def __init__(self, max_concurrency: int = 100, min_share: float = 0.1) -> None:
+        self._max_concurrency = max_concurrency
+        self._min_share = min_share
+        self._queues: Dict[Priority, Deque["asyncio.Future[None]"]] = {priority: deque() for priority in Priority}
+        self._credit: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+        self._in_flight = 0
+        self.stats = SchedulerStats()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def queue_depth(self, priority: Optional[Priority] = None) -> int:
+        if priority is not None:
+            return len(self._queues[as_priority(priority)])
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def acquire(self, priority: Union[None, str, int, Priority] = None) -> None:
+        priority = as_priority(priority)
+        if self._in_flight < self._max_concurrency and not self.queue_depth():
+            self._in_flight += 1
+            self.stats.admitted[priority] += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[priority].append(waiter)
+        self.stats.queued[priority] += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                try:
+                    self._queues[priority].remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        self.stats.admitted[priority] += 1
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    async def run(self, priority: Union[None, str, int, Priority], call: Callable[[], Awaitable[T]]) -> T:
+        await self.acquire(priority)
+        try:
+            return await call()
+        finally:
+            self.release()
+
+    def _next(self) -> Optional[Priority]:
+        waiting = [priority for priority in Priority if self._queues[priority]]
+        if not waiting:
+            return None
+        head, passed_over = waiting[0], waiting[1:]
+        for priority in passed_over:
+            self._credit[priority] += self._min_share
+        starved = [priority for priority in passed_over if self._credit[priority] >= 1.0]
+        if starved:
+            chosen = max(starved, key=lambda priority: self._credit[priority])
+            self._credit[chosen] -= 1.0
+            return chosen
+        return head
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self._max_concurrency:
+            priority = self._next()
+            if priority is None:
+                return
+            queue = self._queues[priority]
+            waiter = queue.popleft()
+            if not queue:
+                self._credit[priority] = 0.0
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
@@ -0,0 +1,159 @@
+"""
+Client-side token-bucket rate limiting that adapts to server throttling.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+import asyncio
+import logging
+import time
+
+from CriadexSDK.ragflow_breaker import endpoint_family, route_parts
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitStats:
+    acquired: int = 0
+    delayed: int = 0
+    throttled: int = 0
+    rejected: int = 0
+    total_wait: float = 0.0
+
+
+class TokenBucket:
+    """
+    Token bucket with FIFO reservations: each ``acquire`` takes a token immediately, going into
+    debt if necessary, and sleeps until the debt would have been refilled.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it."""
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens -= 1
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return max(wait, self._paused_until - now)
+
+    def refund(self) -> None:
+        self._tokens = min(self.burst, self._tokens + 1)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for ``seconds`` (e.g. from a ``Retry-After`` header)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def _group_name(url: str) -> str:
+    parts = route_parts(url)
+    if len(parts) > 1 and parts[0] in ("groups", "group_auth"):
+        return parts[1]
+    return ""
+
+
+class AdaptiveRateLimiter:
+    """
+    Queue requests through a token bucket per API key (and optionally per group or endpoint family).
+
+    On a 429 the bucket's rate is multiplied by ``decrease_factor`` (never below ``min_rate``) and,
+    when the server sends ``Retry-After``, the bucket is paused for that long. After ``recovery_interval``
+    seconds without throttling each success adds ``increase_step`` requests/second back, up to the
+    configured ``rate``.
+
+    :param scope: ``"api_key"``, ``"group"`` or ``"endpoint"`` — what a bucket is keyed by in addition to the API key
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        scope: str = "api_key",
+        min_rate: float = 0.5,
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.5,
+        recovery_interval: float = 5.0,
+    ) -> None:
+        if scope not in ("api_key", "group", "endpoint"):
+            raise ValueError("scope must be one of 'api_key', 'group' or 'endpoint'")
+        self._rate = rate
+        self._burst = burst if burst is not None else max(1.0, rate)
+        self._scope = scope
+        self._min_rate = min_rate
+        self._decrease_factor = decrease_factor
+        self._increase_step = increase_step
+        self._recovery_interval = recovery_interval
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._last_throttled: Dict[Hashable, float] = {}
+        self.stats = RateLimitStats()
+
+    def _key(self, api_key: Optional[str], url: str) -> Hashable:
+        if self._scope == "group":
+            return api_key, _group_name(url)
+        if self._scope == "endpoint":
+            return api_key, endpoint_family(url)
+        return api_key
+
+    def _bucket(self, key: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self._rate, self._burst)
+        return bucket
+
+    def current_rate(self, api_key: Optional[str], url: str) -> float:
+        return self._bucket(self._key(api_key, url)).rate
+
+    async def acquire(self, api_key: Optional[str], url: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a token. Returns ``False`` without waiting (and gives the token back) when the wait
+        would exceed ``timeout`` seconds.
+        """
+        bucket = self._bucket(self._key(api_key, url))
+        wait = bucket.reserve()
+        if timeout is not None and wait > timeout:
+            bucket.refund()
+            self.stats.rejected += 1
+            return False
+        self.stats.acquired += 1
+        if wait <= 0:
+            return True
+        self.stats.delayed += 1
+        self.stats.total_wait += wait
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            bucket.refund()
+            raise
+        return True
+
+    def refund(self, api_key: Optional[str], url: str) -> None:
+        """Give back a token taken by ``acquire`` for a call that was rejected before it was sent."""
+        self._bucket(self._key(api_key, url)).refund()
+
+    def on_throttled(self, api_key: Optional[str], url: str, retry_after: Optional[float] = None) -> None:
+        key = self._key(api_key, url)
+        bucket = self._bucket(key)
+        bucket.rate = max(self._min_rate, bucket.rate * self._decrease_factor)
+        if retry_after:
+            bucket.pause(retry_after)
+        self._last_throttled[key] = time.monotonic()
+        self.stats.throttled += 1
+        logger.debug("Rate limiter %s throttled; rate now %.2f/s", key, bucket.rate)
+
+    def on_success(self, api_key: Optional[str], url: str) -> None:
+        key = self._key(api_key, url)
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.rate >= self._rate:
+            return
+        if time.monotonic() - self._last_throttled.get(key, 0.0) >= self._recovery_interval:
+            bucket.rate = min(self._rate, bucket.rate + self._increase_step)
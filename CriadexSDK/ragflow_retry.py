@@ -0,0 +1,106 @@
+"""
+Retry policy, Retry-After parsing and client-wide retry budgets.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Deque, FrozenSet, Mapping, Optional
+import datetime
+import random
+import time
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Full-jitter exponential backoff.
+
+    The sleep before retry ``n`` (0-based) is drawn uniformly from ``[0, min(max_delay, base_delay * 2 ** n)]``
+    so that clients hitting the same outage spread their retries out instead of retrying in lockstep.
+    A server ``Retry-After`` header raises the sleep to at least that value (capped at ``max_retry_after``).
+    """
+
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    retry_all_5xx: bool = True
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.retry_statuses or (self.retry_all_5xx and 500 <= status < 600)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def delay(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        delay = self.backoff(attempt)
+        if self.respect_retry_after and headers is not None:
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header given either as delay-seconds or an HTTP-date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Cap retries to a fraction of recent requests, client-wide.
+
+    Within a sliding ``window`` (seconds) at most ``min_retries + ratio * requests`` retries are
+    allowed, so a backend outage cannot multiply traffic by ``max_retries``.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 10.0) -> None:
+        self._ratio = ratio
+        self._min_retries = min_retries
+        self._window = window
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.rejected = 0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self._window
+        for events in (self._requests, self._retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_request(self) -> None:
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+
+    def try_acquire_retry(self) -> bool:
+        """Reserve one retry; returns ``False`` (and counts a rejection) when the budget is spent."""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) >= self._min_retries + self._ratio * len(self._requests):
+            self.rejected += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    @property
+    def retry_ratio(self) -> float:
+        self._trim(time.monotonic())
+        return len(self._retries) / len(self._requests) if self._requests else 0.0
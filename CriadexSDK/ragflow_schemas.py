@@ -42,6 +42,7 @@ class GroupCreateResponse(BaseModel):
 class GroupInfo(GroupCreateConfig):
     id: int
     created: str
+    name: Optional[str] = None
 
 class GroupAboutResponse(BaseModel):
     info: Optional[GroupInfo]
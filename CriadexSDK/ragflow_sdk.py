@@ -3,11 +3,81 @@ RAGFlowSDK: Drop-in replacement for CriadexSDK, targeting RAGFlow API endpoints.
 Scaffolded for migration. Implement methods to match CriadexSDK interface.
 """
 
-from typing import Optional, Any
+from typing import Optional, Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Tuple, Type, Union
 import asyncio
+import contextlib
+import copy
+import functools
+import json
 import logging
+import os
+import time
 
-from httpx import AsyncClient, Timeout, HTTPStatusError, RequestError
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    AsyncHTTPTransport,
+    HTTPStatusError,
+    Limits,
+    Request,
+    RequestError,
+    Response,
+    Timeout,
+)
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from CriadexSDK.ragflow_breaker import CircuitBreakerRegistry, endpoint_family
+from CriadexSDK.ragflow_bulk import BulkItemResult, BulkResult, run_bulk
+from CriadexSDK.ragflow_cache import AuthCache, SearchCache, ValidatorCache, canonicalize_config
+from CriadexSDK.ragflow_codec import JSONCodec, get_codec
+from CriadexSDK.ragflow_coalesce import RequestCoalescer, request_key
+from CriadexSDK.ragflow_compression import CompressionPolicy
+from CriadexSDK.ragflow_concurrency import AdaptiveConcurrencyLimiter
+from CriadexSDK.ragflow_fusion import (
+    dedupe_assets,
+    merge_reranked,
+    merge_top_k,
+    reciprocal_rank_fusion,
+    weighted_score_fusion,
+)
+from CriadexSDK.ragflow_graph import GraphBuildProgress, GraphBuildScheduler, GraphPollBackoff
+from CriadexSDK.ragflow_hedging import HedgingPolicy, hedged, route_key
+from CriadexSDK.ragflow_priority import Priority, PriorityScheduler
+from CriadexSDK.ragflow_ratelimit import AdaptiveRateLimiter
+from CriadexSDK.ragflow_retry import RetryBudget, RetryPolicy, parse_retry_after
+from CriadexSDK.ragflow_schemas import (
+    AgentChatResponse,
+    AgentRelatedPromptsResponse,
+    AgentRerankResponse,
+    AgentTransformResponse,
+    AuthCheckResponse,
+    AuthCreateResponse,
+    AuthDeleteResponse,
+    AuthResetResponse,
+    ChatAgentResponse,
+    CompletionUsage,
+    ContentDeleteResponse,
+    ContentListResponse,
+    ContentUpdateResponse,
+    ContentUploadResponse,
+    GraphSearchConfig,
+    GraphSearchResponse,
+    GraphStatusResponse,
+    GroupAboutResponse,
+    GroupAuthCheckResponse,
+    GroupAuthListResponse,
+    GroupCreateResponse,
+    GroupDeleteResponse,
+    GroupGraphBuildResponse,
+    GroupSearchResponse,
+    ModelAboutResponse,
+    ModelCreateResponse,
+    ModelDeleteResponse,
+    SearchGroupConfig,
+)
+from CriadexSDK.ragflow_stream import JSONArrayItems, decode_event, extract_delta, iter_ndjson_data, iter_sse_data
+from CriadexSDK.ragflow_sync import SyncManifest, SyncResult, plan_sync, scan_directory
+from CriadexSDK.ragflow_upload import DEFAULT_CHUNK_SIZE, MultipartUpload
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +91,14 @@ class CriadexNetworkError(CriadexSDKError):
     """Network/connection errors."""
 
 
+class CriadexCircuitOpenError(CriadexNetworkError):
+    """Raised without contacting the server while the endpoint's circuit breaker is open."""
+
+
+class CriadexOverloadedError(CriadexSDKError):
+    """Raised when the concurrency limiter sheds a call instead of queueing it any longer"""
+
+
 class CriadexAPIError(CriadexSDKError):
     """API errors (4xx, 5xx)."""
 
@@ -31,321 +109,1659 @@ class CriadexAPIError(CriadexSDKError):
         super().__init__(f"[{status_code}] {message}")
 
 
+def _json_body(config: Any) -> Any:
+    """
+    Prepare a config for the ``json=`` body of a request.
+
+    Pydantic models are passed through so ``_request_with_retry`` can serialize them once with
+    ``model_dump_json``; other objects exposing ``model_dump`` are dumped to a dict.
+    """
+    if isinstance(config, BaseModel):
+        return config
+    return config.model_dump() if hasattr(config, "model_dump") else config
+
+
+def _encode_body(kwargs: dict, codec: Optional[JSONCodec]) -> dict:
+    """
+    Serialize a ``json=`` body to bytes once, so retries resend the same payload without re-encoding.
+
+    Pydantic models always use ``model_dump_json``; plain objects are only pre-encoded when a
+    ``codec`` is configured, otherwise httpx's built-in encoder is left to handle them.
+    """
+    body = kwargs.get("json")
+    if isinstance(body, BaseModel):
+        content = body.model_dump_json().encode()
+    elif codec is not None and "json" in kwargs:
+        content = codec.dumps(body)
+    else:
+        return kwargs
+    kwargs = {name: value for name, value in kwargs.items() if name != "json"}
+    kwargs["content"] = content
+    kwargs["headers"] = {**(kwargs.get("headers") or {}), "content-type": "application/json"}
+    return kwargs
+
+
+def _compress_body(kwargs: dict, compression: CompressionPolicy, endpoint: str) -> dict:
+    """
+    Advertise the response encodings we can decode and compress a large request body once, before any attempt.
+    """
+    headers = {**(kwargs.get("headers") or {}), "accept-encoding": compression.accept_encoding}
+    if "json" in kwargs:
+        # Same compact encoding httpx applies to ``json=`` bodies
+        content = json.dumps(kwargs["json"], ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+        kwargs = {name: value for name, value in kwargs.items() if name != "json"}
+        headers["content-type"] = "application/json"
+    else:
+        content = kwargs.get("content")
+    if isinstance(content, bytes):
+        raw_size = len(content)
+        compressed = compression.compress(content)
+        if compressed is not None:
+            content, headers["content-encoding"] = compressed
+        compression.record_request(endpoint, raw_size, len(content))
+        kwargs = {**kwargs, "content": content}
+    return {**kwargs, "headers": headers}
+
+
+@functools.lru_cache(maxsize=None)
+def _type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def _validate_json(response_type: Any, content: bytes) -> Any:
+    if isinstance(response_type, type) and issubclass(response_type, BaseModel):
+        return response_type.model_validate_json(content)
+    return _type_adapter(response_type).validate_json(content)
+
+
+def _bounded_timeout(timeout: Timeout, remaining: float) -> Timeout:
+    """Shrink every phase of ``timeout`` so a single attempt cannot outlive the call deadline."""
+
+    def bound(value: Optional[float]) -> float:
+        return remaining if value is None else min(value, remaining)
+
+    return Timeout(connect=bound(timeout.connect), read=bound(timeout.read), write=bound(timeout.write), pool=bound(timeout.pool))
+
+
+_DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+async def _send_limited(limiter: AdaptiveConcurrencyLimiter, send: Callable[[], Awaitable[Response]]) -> Response:
+    """Run one attempt inside a slot already acquired from ``limiter`` and report its outcome."""
+    started = time.perf_counter()
+    try:
+        resp = await send()
+    except HTTPStatusError as exc:
+        status = exc.response.status_code
+        limiter.release(time.perf_counter() - started, overloaded=status >= 500 or status == 429)
+        raise
+    except RequestError:
+        limiter.release(overloaded=True)
+        raise
+    except BaseException:
+        limiter.release()
+        raise
+    limiter.release(time.perf_counter() - started)
+    return resp
+
+
 async def _request_with_retry(
     httpx_client: AsyncClient,
     method: str,
     url: str,
     *,
     max_retries: int,
+    coalescer: Optional[RequestCoalescer] = None,
+    idempotent: Optional[bool] = None,
+    response_model: Optional[Any] = None,
+    codec: Optional[JSONCodec] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    deadline: Optional[float] = None,
+    circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+    hedging: Optional[HedgingPolicy] = None,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    scheduler: Optional[PriorityScheduler] = None,
+    priority: Union[None, str, Priority] = None,
+    validator_cache: Optional[ValidatorCache] = None,
+    conditional: bool = False,
+    compression: Optional[CompressionPolicy] = None,
     **kwargs: Any,
-) -> dict:
+) -> Any:
+    """
+    Perform an HTTP request with retry logic and consistent error handling.
+
+    Retryable statuses (5xx and 429 by default) and network errors are retried with full-jitter
+    backoff that honours ``Retry-After``. A shared ``retry_budget`` caps the client-wide retry ratio,
+    and ``deadline`` bounds the whole call (every attempt plus the sleeps between them) in seconds.
+    With ``circuit_breakers`` configured, calls to an endpoint family whose breaker is open fail
+    fast with ``CriadexCircuitOpenError``. Idempotent attempts are hedged when a ``hedging`` policy
+    is given. A ``rate_limiter`` queues every attempt behind its token bucket and slows down when the
+    server answers 429. A ``concurrency_limiter`` bounds in-flight attempts; calls that wait too long
+    for a slot are shed with ``CriadexOverloadedError``. With a ``scheduler`` each attempt waits for a
+    connection slot according to its ``priority``.
+
+    ``conditional`` requests send the ``ETag``/``Last-Modified`` validators remembered in
+    ``validator_cache`` and decode the cached body on ``304 Not Modified``; in stale-while-revalidate
+    mode a cached body is returned at once and revalidated in the background.
+
+    With ``compression`` large request bodies are compressed once up front, br/zstd responses are
+    advertised when decodable, and raw vs on-the-wire byte counts are recorded per endpoint family.
+
+    Idempotent requests (GET/HEAD by default, or when ``idempotent=True``) are shared with
+    identical in-flight requests when a ``coalescer`` is configured.
+
+    When ``response_model`` is given the body is validated straight from bytes into that type
+    instead of being decoded to a dict first. A ``codec`` replaces httpx's stdlib JSON handling
+    for request bodies and untyped responses.
+    """
+    if idempotent is None:
+        idempotent = method.upper() in ("GET", "HEAD")
+    policy = retry_policy or _DEFAULT_RETRY_POLICY
+    validated = validator_cache if conditional else None
+    cache_key = request_key(method, url, httpx_client.headers.get("x-api-key"), **kwargs) if validated else None
+
+    def decode(content: bytes) -> Any:
+        if response_model is not None:
+            return _validate_json(response_model, content)
+        if codec is not None:
+            return codec.loads(content)
+        return json.loads(content)
+
+    async def attempts() -> Any:
+        request_kwargs = _encode_body(kwargs, codec)
+        if compression is not None:
+            request_kwargs = _compress_body(request_kwargs, compression, endpoint_family(url))
+        breaker = circuit_breakers.get(url) if circuit_breakers is not None else None
+        api_key = httpx_client.headers.get("x-api-key")
+        generation = validated.generation(cache_key) if validated is not None else None
+        started = time.monotonic()
+        if retry_budget is not None:
+            retry_budget.record_request()
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else deadline - (time.monotonic() - started)
+
+        def retry_delay(attempt: int, headers: Optional[Any] = None) -> Optional[float]:
+            """Seconds to sleep before the next attempt, or ``None`` to stop retrying."""
+            if attempt >= max_retries - 1:
+                return None
+            delay = policy.delay(attempt, headers)
+            time_left = remaining()
+            if time_left is not None and delay >= time_left:
+                return None
+            if retry_budget is not None and not retry_budget.try_acquire_retry():
+                logger.debug("RAGFlowSDK retry budget exhausted for %s %s", method, url)
+                return None
+            return delay
+
+        def reject(error: CriadexSDKError, refund: bool = True) -> CriadexSDKError:
+            """Give back the breaker slot (and rate token) of an attempt that will not be sent."""
+            if breaker is not None:
+                breaker.release()
+            if rate_limiter is not None and refund:
+                rate_limiter.refund(api_key, url)
+            return error
+
+        for attempt in range(max_retries):
+            # Checked first so an open breaker fails fast instead of waiting for a rate token
+            if breaker is not None and not breaker.allow():
+                family, host = breaker.key
+                raise CriadexCircuitOpenError(
+                    f"Circuit breaker open for {family} endpoints on {host}; retry in {breaker.retry_in:.1f}s"
+                )
+            try:
+                # Inside the ``try`` so a call cancelled while queued still gives back its breaker slot
+                if rate_limiter is not None and not await rate_limiter.acquire(api_key, url, remaining()):
+                    raise reject(
+                        CriadexNetworkError(
+                            f"Deadline of {deadline}s would be exceeded waiting for the rate limiter "
+                            f"after {attempt} attempts"
+                        ),
+                        refund=False,
+                    )
+                attempt_kwargs = request_kwargs
+                time_left = remaining()
+                if time_left is not None:
+                    if time_left <= 0:
+                        raise reject(CriadexNetworkError(f"Deadline of {deadline}s exceeded after {attempt} attempts"))
+                    attempt_kwargs = {**request_kwargs, "timeout": _bounded_timeout(httpx_client.timeout, time_left)}
+                validators = validated.get(cache_key) if validated is not None else None
+                if validators is not None and validators.conditional_headers():
+                    headers = {**(request_kwargs.get("headers") or {}), **validators.conditional_headers()}
+                    attempt_kwargs = {**attempt_kwargs, "headers": headers}
+                if concurrency_limiter is not None and not await concurrency_limiter.acquire(remaining()):
+                    raise reject(
+                        CriadexOverloadedError(
+                            f"Shed {method} {url}: {concurrency_limiter.in_flight} requests in flight, "
+                            f"{concurrency_limiter.queue_depth} queued"
+                        )
+                    )
+                logger.debug("RAGFlowSDK request %s %s (attempt %d)", method, url, attempt + 1)
+
+                async def send() -> Response:
+                    if hedging is not None and idempotent:
+                        resp = await hedged(
+                            lambda: httpx_client.request(method, url, **attempt_kwargs),
+                            hedging,
+                            route_key(method, url),
+                            is_failure=lambda resp: policy.is_retryable_status(resp.status_code),
+                        )
+                    else:
+                        resp = await httpx_client.request(method, url, **attempt_kwargs)
+                    if not (validators is not None and resp.status_code == 304):
+                        resp.raise_for_status()
+                    return resp
+
+                dispatched = False
+
+                async def dispatch() -> Response:
+                    nonlocal dispatched
+                    dispatched = True
+                    if concurrency_limiter is not None:
+                        return await _send_limited(concurrency_limiter, send)
+                    return await send()
+
+                if scheduler is not None:
+                    try:
+                        resp = await scheduler.run(priority, dispatch)
+                    except BaseException:
+                        # ``_send_limited`` only releases the limiter slot once the call is dispatched
+                        if concurrency_limiter is not None and not dispatched:
+                            concurrency_limiter.release()
+                        raise
+                else:
+                    resp = await dispatch()
+                if breaker is not None:
+                    breaker.record_success()
+                if rate_limiter is not None:
+                    rate_limiter.on_success(api_key, url)
+                logger.debug("RAGFlowSDK response %s %s -> %s", method, url, resp.status_code)
+                if compression is not None:
+                    decoded_size = len(resp.content)
+                    wire_size = resp.num_bytes_downloaded or decoded_size
+                    compression.record_response(endpoint_family(url), decoded_size, wire_size)
+                if validated is not None:
+                    if resp.status_code != 304:
+                        validated.store(cache_key, resp.content, resp.headers, generation)
+                        return decode(resp.content)
+                    cached_body = validated.not_modified(cache_key)
+                    if cached_body is not None:
+                        return decode(cached_body)
+                    # The entry was evicted while the request was in flight; ask again unconditionally
+                    continue
+                if response_model is not None:
+                    return _validate_json(response_model, resp.content)
+                if codec is not None:
+                    return codec.loads(resp.content)
+                return resp.json()
+            except HTTPStatusError as exc:
+                status = exc.response.status_code
+                if breaker is not None:
+                    # Only server-side failures count against the endpoint
+                    if status >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if rate_limiter is not None and status == 429:
+                    rate_limiter.on_throttled(api_key, url, parse_retry_after(exc.response.headers.get("retry-after")))
+
+                # Do not retry other 4xx client errors; surface them as API errors
+                if not policy.is_retryable_status(status):
+                    raise CriadexAPIError(status_code=status, message=exc.response.text) from exc
+
+                # Retry 5xx server errors and 429s with jittered backoff
+                delay = retry_delay(attempt, exc.response.headers)
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+
+                raise CriadexAPIError(
+                    status_code=status,
+                    message=f"Server error after {attempt + 1} attempts" if status >= 500 else exc.response.text,
+                ) from exc
+            except RequestError as exc:
+                if breaker is not None:
+                    breaker.record_failure()
+                delay = retry_delay(attempt)
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+                raise CriadexNetworkError(f"Network error after {attempt + 1} attempts: {exc}") from exc
+            except asyncio.CancelledError:
+                if breaker is not None:
+                    breaker.release()
+                raise
+
+        raise CriadexNetworkError(f"Request failed after {max_retries} attempts")
+
+    if validated is not None:
+        stale = validated.get_stale(cache_key)
+        if stale is not None:
+            validated.refresh_in_background(cache_key, attempts)
+            return decode(stale.body)
+
+    if coalescer is not None and idempotent:
+        key = (request_key(method, url, httpx_client.headers.get("x-api-key"), **kwargs), response_model)
+        return await coalescer.run(key, attempts)
+    return await attempts()
+
+
+def _file_name(file: Any) -> str:
+    if isinstance(file, BaseModel):
+        return getattr(file, "file_name", "")
+    return str(file.get("file_name", "")) if isinstance(file, dict) else str(file)
+
+
+def _standard_search_config(graph_config: dict) -> dict:
+    """A ``SearchGroupConfig`` dict for the same query as a ``GraphSearchConfig`` dict."""
+    config = {"prompt": graph_config["query"]}
+    for key in ("top_k", "min_k", "top_n", "min_n", "rerank_enabled", "search_filter", "extra_groups"):
+        if key in graph_config:
+            config[key] = graph_config[key]
+    return config
+
+
+async def _timed_search(
+    name: str, search: Awaitable[Any], timeout: Optional[float] = None
+) -> Tuple[str, Optional[dict], dict]:
+    """
+    Await one leg of a fan-out search.
+
+    :return: ``(name, result, breakdown)``; ``result`` is None when the search timed out or failed, and
+        ``breakdown`` holds its ``status``, ``latency_ms`` and any ``error``
+    """
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(search, timeout)
+        status, error = "ok", None
+    except asyncio.TimeoutError:
+        result, status, error = None, "timeout", None
+    except CriadexSDKError as exc:
+        result, status, error = None, "error", str(exc)
+    breakdown = {"status": status, "latency_ms": int((time.perf_counter() - started) * 1000)}
+    if error is not None:
+        breakdown["error"] = error
+    return name, result, breakdown
+
+
+def _merge_search_results(results: List[dict]) -> dict:
+    """The ``assets`` and ``search_units`` of several search results, combined."""
+    search_units = [result.get("search_units") for result in results if result.get("search_units") is not None]
+    return {
+        "assets": dedupe_assets(result.get("assets") or [] for result in results),
+        "search_units": sum(search_units) if search_units else None,
+    }
+
+
+def _graph_usable(result: dict) -> bool:
+    """Whether a ``graph_search`` result came from a built graph rather than the standard fallback."""
+    metadata = result.get("graph_metadata") or {}
+    return (
+        metadata.get("status", "NOT_BUILT") != "NOT_BUILT"
+        and metadata.get("source", "standard") != "standard"
+        and metadata.get("fallback_reason") is None
+    )
+
+
+async def _cached_search(
+    cache: SearchCache,
+    kind: str,
+    group_name: str,
+    search_config: Any,
+    config_model: Type[BaseModel],
+    fetch: Callable[[], Awaitable[Any]],
+    response_model: Optional[Type[BaseModel]] = None,
+    api_key: Optional[str] = None,
+) -> Any:
+    """
+    Serve a search from ``cache`` or run ``fetch`` and store its result.
+
+    Typed and untyped callers share entries; ``response_model`` only controls how a hit is decoded.
+    Entries are per ``api_key``, so a key the server would reject is never served another key's results.
     """
-    Perform an HTTP request with basic retry logic and consistent error handling.
+    extra_groups = (
+        getattr(search_config, "extra_groups", None)
+        if isinstance(search_config, BaseModel)
+        else (search_config or {}).get("extra_groups")
+    )
+    groups = (group_name, *(extra_groups or ()))
+    key = cache.make_key(kind, group_name, canonicalize_config(search_config, config_model), api_key)
+
+    cached = cache.get(key, response_model)
+    if cached is not None:
+        return cached
+
+    generation = cache.generation(groups)
+    result = await fetch()
+    cache.put(key, result, groups, generation)
+    return result
+
+
+async def _cached_auth_check(
+    cache: AuthCache,
+    api_key: str,
+    group_name: Optional[str],
+    fetch: Callable[[], Awaitable[Any]],
+    response_model: Optional[Type[BaseModel]] = None,
+) -> Any:
+    """
+    Serve an ``auth.check``/``group_auth.check`` from ``cache`` or run ``fetch`` and store its outcome.
+
+    Cached 401/403/404 responses are re-raised as ``CriadexAPIError`` without contacting the server.
     """
-    last_exception: Optional[BaseException] = None
+    entry = cache.get(api_key, group_name)
+    if entry is not None:
+        if entry.status_code is not None:
+            raise CriadexAPIError(status_code=entry.status_code, message=entry.message)
+        return entry.value(response_model)
+
+    generation = cache.generation(api_key)
+    try:
+        result = await fetch()
+    except CriadexAPIError as exc:
+        cache.put_error(api_key, group_name, exc.status_code, exc.message, generation)
+        raise
+    cache.put(api_key, group_name, result, generation)
+    return result
+
+
+class SharedTransport(AsyncBaseTransport):
+    """
+    Wrap a transport so several SDK clients can share one connection pool.
+
+    Closing a client that uses this wrapper leaves the underlying pool open;
+    the owner of the wrapped transport is responsible for closing it.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # Intentionally a no-op; see class docstring
+        return None
+
+    async def close_pool(self) -> None:
+        """Close the wrapped transport and every pooled connection it holds."""
+        await self._transport.aclose()
+
+
+class ChatStream:
+    """
+    Async iterator over the text deltas of a streamed agent chat.
+
+    Once iteration finishes, ``response`` holds the final ``ChatAgentResponse`` (when the server
+    sends one), ``usage`` the reported ``CompletionUsage`` entries and ``text`` the full reply.
+    ``time_to_first_token`` and ``duration`` are measured in seconds from sending the request.
+
+    The stream is sent outside ``_request_with_retry`` but takes the same slots a ``HIGH`` priority
+    request would from the client's ``request_options``: its circuit breaker, a rate limiter token,
+    a concurrency limiter slot and a scheduler slot, the latter two held until the stream is closed.
+    Network errors and retryable statuses are retried under ``retry_policy`` and ``retry_budget`` only
+    until the first delta arrives. Hedging, coalescing, ``deadline`` and compression do not apply.
+    """
+
+    def __init__(
+        self,
+        httpx_client: AsyncClient,
+        url: str,
+        payload: dict,
+        request_options: Optional[dict] = None,
+        max_retries: int = 1,
+    ) -> None:
+        self._httpx = httpx_client
+        self._url = url
+        self._payload = payload
+        self._options = request_options or {}
+        self._max_retries = max_retries
+        self._iterator: Optional[AsyncIterator[str]] = None
+        self._parts: List[str] = []
+        # Status and headers of the current attempt, for reporting its outcome to the slot holders
+        self._status: Optional[int] = None
+        self._headers: Optional[Any] = None
+        self.final_event: Optional[dict] = None
+        self.response: Optional[ChatAgentResponse] = None
+        self.usage: List[CompletionUsage] = []
+        self.time_to_first_token: Optional[float] = None
+        self.duration: Optional[float] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        if self._iterator is None:
+            self._iterator = self._iterate()
+        return self._iterator
+
+    async def __aenter__(self) -> "ChatStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop reading and release the connection, e.g. after breaking out of the loop early."""
+        if self._iterator is not None:
+            await self._iterator.aclose()
+
+    def _retry_delay(self, attempt: int, headers: Optional[Any] = None) -> Optional[float]:
+        """Seconds to sleep before the next attempt, or ``None`` once a delta was yielded or retries are spent."""
+        if self._parts or attempt >= self._max_retries - 1:
+            return None
+        retry_budget: Optional[RetryBudget] = self._options.get("retry_budget")
+        if retry_budget is not None and not retry_budget.try_acquire_retry():
+            return None
+        policy: RetryPolicy = self._options.get("retry_policy") or _DEFAULT_RETRY_POLICY
+        return policy.delay(attempt, headers)
 
-    for attempt in range(max_retries):
+    @contextlib.asynccontextmanager
+    async def _slots(self) -> AsyncIterator[None]:
+        """Hold the breaker, rate limiter, concurrency and scheduler slots for one attempt."""
+        circuit_breakers: Optional[CircuitBreakerRegistry] = self._options.get("circuit_breakers")
+        rate_limiter: Optional[AdaptiveRateLimiter] = self._options.get("rate_limiter")
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = self._options.get("concurrency_limiter")
+        scheduler: Optional[PriorityScheduler] = self._options.get("scheduler")
+        breaker = circuit_breakers.get(self._url) if circuit_breakers is not None else None
+        api_key = self._httpx.headers.get("x-api-key")
+        if breaker is not None and not breaker.allow():
+            family, host = breaker.key
+            raise CriadexCircuitOpenError(
+                f"Circuit breaker open for {family} endpoints on {host}; retry in {breaker.retry_in:.1f}s"
+            )
+        self._status = self._headers = None
+        limited = scheduled = network_error = False
         try:
-            logger.debug("RAGFlowSDK request %s %s (attempt %d)", method, url, attempt + 1)
-            resp = await httpx_client.request(method, url, **kwargs)
-            resp.raise_for_status()
-            logger.debug("RAGFlowSDK response %s %s -> %s", method, url, resp.status_code)
-            return resp.json()
-        except HTTPStatusError as exc:
-            status = exc.response.status_code
-            last_exception = exc
-
-            # Do not retry 4xx client errors; surface them as API errors
-            if 400 <= status < 500:
-                raise CriadexAPIError(status_code=status, message=exc.response.text) from exc
-
-            # Retry 5xx server errors with exponential backoff
-            if attempt < max_retries - 1:
-                await asyncio.sleep(2 ** attempt)
-                continue
+            if rate_limiter is not None:
+                await rate_limiter.acquire(api_key, self._url)
+            if concurrency_limiter is not None:
+                if not await concurrency_limiter.acquire():
+                    if rate_limiter is not None:
+                        rate_limiter.refund(api_key, self._url)
+                    raise CriadexOverloadedError(
+                        f"Shed POST {self._url}: {concurrency_limiter.in_flight} requests in flight, "
+                        f"{concurrency_limiter.queue_depth} queued"
+                    )
+                limited = True
+            if scheduler is not None:
+                await scheduler.acquire(Priority.HIGH)
+                scheduled = True
+            yield
+        except RequestError:
+            network_error = True
+            raise
+        finally:
+            status = self._status
+            overloaded = network_error or (status is not None and (status >= 500 or status == 429))
+            if scheduled:
+                scheduler.release()
+            if limited:
+                # A stream's duration says nothing about server latency, so no sample is recorded
+                concurrency_limiter.release(overloaded=overloaded)
+            if breaker is not None:
+                if network_error or (status is not None and status >= 500):
+                    breaker.record_failure()
+                elif status is not None:
+                    breaker.record_success()
+                else:
+                    breaker.release()
+            if rate_limiter is not None and status is not None:
+                if status == 429:
+                    retry_after = parse_retry_after(self._headers.get("retry-after"))
+                    rate_limiter.on_throttled(api_key, self._url, retry_after)
+                elif status < 400:
+                    rate_limiter.on_success(api_key, self._url)
 
-            raise CriadexAPIError(
-                status_code=status,
-                message=f"Server error after {max_retries} attempts",
-            ) from exc
+    async def _iterate(self) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        headers = {"accept": "text/event-stream, application/x-ndjson, application/json"}
+        retry_budget: Optional[RetryBudget] = self._options.get("retry_budget")
+        policy: RetryPolicy = self._options.get("retry_policy") or _DEFAULT_RETRY_POLICY
+        if retry_budget is not None:
+            retry_budget.record_request()
+        try:
+            for attempt in range(self._max_retries):
+                delay: Optional[float] = None
+                try:
+                    async with self._slots():
+                        async with self._httpx.stream("POST", self._url, json=self._payload, headers=headers) as resp:
+                            self._status, self._headers = resp.status_code, resp.headers
+                            if resp.status_code >= 400:
+                                body = await resp.aread()
+                                if policy.is_retryable_status(resp.status_code):
+                                    delay = self._retry_delay(attempt, resp.headers)
+                                if delay is None:
+                                    raise CriadexAPIError(
+                                        status_code=resp.status_code, message=body.decode(errors="replace")
+                                    )
+                            else:
+                                deltas = self._deltas(resp, started)
+                                try:
+                                    async for delta in deltas:
+                                        yield delta
+                                finally:
+                                    await deltas.aclose()
+                except RequestError:
+                    delay = self._retry_delay(attempt)
+                    if delay is None:
+                        raise
+                if delay is None:
+                    return
+                await asyncio.sleep(delay)
         except RequestError as exc:
-            last_exception = exc
-            if attempt < max_retries - 1:
-                await asyncio.sleep(2 ** attempt)
-                continue
-            raise CriadexNetworkError(f"Network error after {max_retries} attempts: {exc}") from exc
+            raise CriadexNetworkError(f"Network error while streaming: {exc}") from exc
+        finally:
+            self.duration = time.perf_counter() - started
+            logger.debug(
+                "RAGFlowSDK stream %s ttft=%s duration=%.3fs", self._url, self.time_to_first_token, self.duration
+            )
+
+    async def _deltas(self, resp: Response, started: float) -> AsyncIterator[str]:
+        content_type = resp.headers.get("content-type", "")
+        if "application/json" in content_type:
+            # Server does not stream; surface the whole reply as a single delta
+            self._handle_event(json.loads(await resp.aread()))
+            message = (self.final_event or {}).get("message")
+            events: AsyncIterator[str] = _empty_stream()
+            if message:
+                self._mark_first_token(started)
+                self._parts.append(message)
+                yield message
+        elif "text/event-stream" in content_type:
+            events = iter_sse_data(resp.aiter_lines())
+        else:
+            events = iter_ndjson_data(resp.aiter_lines())
 
-    raise CriadexNetworkError(f"Request failed after {max_retries} attempts: {last_exception}")
+        async for data in events:
+            event = decode_event(data)
+            if event is None:
+                break
+            self._handle_event(event)
+            delta = extract_delta(event)
+            if delta:
+                self._mark_first_token(started)
+                self._parts.append(delta)
+                yield delta
+
+    def _mark_first_token(self, started: float) -> None:
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.perf_counter() - started
+
+    def _handle_event(self, event: Any) -> None:
+        if not isinstance(event, dict):
+            return
+        final = event.get("agent_response", event if "chat_response" in event else None)
+        if isinstance(final, dict):
+            self.final_event = final
+            try:
+                self.response = ChatAgentResponse.model_validate(final)
+                self.usage = list(self.response.usage)
+            except ValidationError:
+                self.response = None
+        usage = event.get("usage")
+        if usage and not self.usage:
+            entries = usage if isinstance(usage, list) else [usage]
+            try:
+                self.usage = [CompletionUsage.model_validate(entry) for entry in entries]
+            except ValidationError:
+                pass
+
+
+async def _empty_stream() -> AsyncIterator[str]:
+    return
+    yield
 
 
 # --- Routers ---
-class ContentRouter:
-    def __init__(self, api_base: str, httpx_client: AsyncClient, max_retries: int) -> None:
+class _BaseRouter:
+    def __init__(
+        self,
+        api_base: str,
+        httpx_client: AsyncClient,
+        max_retries: int,
+        request_options: Optional[dict] = None,
+    ) -> None:
         self._api_base = api_base
         self._httpx = httpx_client
         self._max_retries = max_retries
-    
-    async def upload(self, group_name, file):
-        # POST /groups/{group_name}/content/upload
-        url = f"{self._api_base}/groups/{group_name}/content/upload"
+        # Shared with RAGFlowSDK so client-wide request policies apply to every router
+        self._request_options = request_options if request_options is not None else {}
+
+    def with_options(self, **options: Any) -> "_BaseRouter":
+        """
+        Return a copy of this router whose requests use ``options`` on top of the client-wide ones.
+
+        Example: ``await sdk.content.with_options(typed=True).search(group_name, config)``
+        """
+        router = copy.copy(self)
+        router._request_options = {**self._request_options, **options}
+        return router
+
+    def _invalidate_validators(self, group_name) -> None:
+        """Drop conditional-request entries (``about``, ``graph_status``, ``content/list``) for ``group_name``."""
+        validator_cache = self._request_options.get("validator_cache")
+        if validator_cache is not None:
+            validator_cache.invalidate_group(group_name)
+
+    def _response_model(self, model: Any) -> Optional[Any]:
+        """``model`` when typed responses are enabled for this router, else ``None``."""
+        return model if self._request_options.get("typed") else None
+
+    async def _request(self, method: str, url: str, priority: Optional[Priority] = None, **kwargs: Any) -> Any:
+        options = {**self._request_options, **kwargs}
+        options.pop("typed", None)
+        # ``priority`` is the endpoint's default; a router/call ``with_options(priority=...)`` wins
+        options.setdefault("priority", priority)
         return await _request_with_retry(
             self._httpx,
-            "POST",
+            method,
             url,
-            max_retries=self._max_retries,
-            json=file,
+            max_retries=options.pop("max_retries", self._max_retries),
+            **options,
         )
+
+class ContentRouter(_BaseRouter):
+    def __init__(
+        self,
+        api_base: str,
+        httpx_client: AsyncClient,
+        max_retries: int,
+        search_cache: Optional[SearchCache] = None,
+        request_options: Optional[dict] = None,
+    ) -> None:
+        super().__init__(api_base, httpx_client, max_retries, request_options)
+        self._search_cache = search_cache
+
+    def _invalidate(self, group_name) -> None:
+        if self._search_cache is not None:
+            self._search_cache.invalidate_group(group_name)
+        self._invalidate_validators(group_name)
     
-    async def search(self, group_name, search_config):
+    async def upload(self, group_name, file):
+        # POST /groups/{group_name}/content/upload
+        url = f"{self._api_base}/groups/{group_name}/content/upload"
+        dump = _json_body(file)
+        try:
+            return await self._request(
+                "POST",
+                url,
+                json=dump,
+                response_model=self._response_model(ContentUploadResponse),
+                priority=Priority.LOW,
+            )
+        finally:
+            self._invalidate(group_name)
+    
+    async def search(self, group_name, search_config, use_cache: bool = True):
         # POST /groups/{group_name}/query
         url = f"{self._api_base}/groups/{group_name}/query"
-        return await _request_with_retry(
-            self._httpx,
-            "POST",
-            url,
-            max_retries=self._max_retries,
-            json=search_config,
+
+        response_model = self._response_model(GroupSearchResponse)
+
+        async def fetch() -> Any:
+            return await self._request(
+                "POST",
+                url,
+                json=search_config,
+                idempotent=True,
+                response_model=response_model,
+                priority=Priority.HIGH,
+            )
+
+        if self._search_cache is None or not use_cache:
+            return await fetch()
+        return await _cached_search(
+            self._search_cache, "query", group_name, search_config, SearchGroupConfig, fetch, response_model,
+            self._httpx.headers.get("x-api-key"),
         )
     
+    async def search_groups(
+        self,
+        group_names: Iterable[str],
+        search_config,
+        per_group_timeout: Optional[float] = None,
+        top_k: Optional[int] = None,
+    ) -> dict:
+        """
+        Search several groups concurrently and merge the results client-side.
+
+        Each group is searched on its own (``extra_groups`` in the config is ignored). Groups that
+        time out or fail are reported in ``metadata["groups"]`` and the remaining results are
+        still returned, with ``metadata["partial"]`` set.
+
+        :param group_names: Groups to search
+        :param search_config: ``SearchGroupConfig`` model or dict applied to every group
+        :param per_group_timeout: Seconds to wait for each group before dropping it
+        :param top_k: Number of merged nodes to keep; defaults to the config's ``top_n``/``top_k``
+        :return: ``GroupSearchResponse``-shaped dict with a per-group latency breakdown in ``metadata``
+        """
+        config = search_config.model_dump() if hasattr(search_config, "model_dump") else dict(search_config)
+        config.pop("extra_groups", None)
+        if top_k is None:
+            top_k = config.get("top_n") or config.get("top_k")
+        # Merge on plain dicts; the combined result is typed once at the end if requested
+        untyped = self.with_options(typed=False)
+        response_model = self._response_model(GroupSearchResponse)
+
+        outcomes = await asyncio.gather(*(
+            _timed_search(group_name, untyped.search(group_name, config), per_group_timeout)
+            for group_name in dict.fromkeys(group_names)
+        ))
+        results = [result for _, result, _ in outcomes if result is not None]
+        merged = {
+            "nodes": merge_top_k((result.get("nodes") or [] for result in results), top_k),
+            **_merge_search_results(results),
+            "metadata": {
+                "groups": {group_name: breakdown for group_name, _, breakdown in outcomes},
+                "partial": len(results) < len(outcomes),
+            },
+        }
+        return response_model.model_validate(merged) if response_model is not None else merged
+
     async def update(self, group_name, file):
         # PATCH /groups/{group_name}/content/update
         url = f"{self._api_base}/groups/{group_name}/content/update"
-        return await _request_with_retry(
-            self._httpx,
-            "PATCH",
-            url,
-            max_retries=self._max_retries,
-            json=file,
-        )
+        dump = _json_body(file)
+        try:
+            return await self._request(
+                "PATCH",
+                url,
+                json=dump,
+                response_model=self._response_model(ContentUpdateResponse),
+                priority=Priority.LOW,
+            )
+        finally:
+            self._invalidate(group_name)
     
     async def delete(self, group_name, document_name):
         # DELETE /groups/{group_name}/content/delete?document_name={document_name}
         url = f"{self._api_base}/groups/{group_name}/content/delete"
-        return await _request_with_retry(
-            self._httpx,
-            "DELETE",
-            url,
-            max_retries=self._max_retries,
-            params={"document_name": document_name},
-        )
+        try:
+            return await self._request(
+                "DELETE",
+                url,
+                params={"document_name": document_name},
+                response_model=self._response_model(ContentDeleteResponse),
+            )
+        finally:
+            self._invalidate(group_name)
     
     async def list(self, group_name):
         # GET /groups/{group_name}/content/list
         url = f"{self._api_base}/groups/{group_name}/content/list"
-        return await _request_with_retry(
-            self._httpx,
+        return await self._request(
             "GET",
             url,
-            max_retries=self._max_retries,
+            response_model=self._response_model(ContentListResponse),
+            conditional=True,
         )
 
-class GroupsRouter:
-    def __init__(self, api_base: str, httpx_client: AsyncClient, max_retries: int) -> None:
-        self._api_base = api_base
-        self._httpx = httpx_client
-        self._max_retries = max_retries
+    async def iter_list(self, group_name, page_size: int = 1000) -> AsyncIterator[str]:
+        """
+        Yield the group's document names page by page, decoding each page as it streams in.
+
+        Pages are requested with ``limit``/``offset``, or with ``cursor`` once the server returns a
+        ``next_cursor``. A server that ignores paging returns every document in one response, which is
+        streamed the same way and ends the iteration.
+
+        Each page is retried on network errors and retryable statuses following the client's
+        ``retry_policy``, ``retry_budget`` and ``max_retries``; names already yielded from a page that
+        failed midway are skipped on the retry. Pages are streamed outside ``_request_with_retry``, so
+        the circuit breakers, rate and concurrency limiters, priority scheduler, hedging, coalescing,
+        ``deadline``, compression and validator cache do not apply.
+
+        Usage::
+
+            async for document_name in sdk.content.iter_list(group_name):
+                ...
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        # GET /groups/{group_name}/content/list?limit={page_size}&offset={offset}
+        url = f"{self._api_base}/groups/{group_name}/content/list"
+        policy: RetryPolicy = self._request_options.get("retry_policy") or _DEFAULT_RETRY_POLICY
+        retry_budget: Optional[RetryBudget] = self._request_options.get("retry_budget")
+        max_retries = self._request_options.get("max_retries", self._max_retries)
+
+        def retry_delay(attempt: int, headers: Optional[Any] = None) -> Optional[float]:
+            if attempt >= max_retries - 1:
+                return None
+            if retry_budget is not None and not retry_budget.try_acquire_retry():
+                return None
+            return policy.delay(attempt, headers)
+
+        offset = 0
+        cursor: Optional[str] = None
+        previous_first: Optional[str] = None
+        while True:
+            params: dict = {"limit": page_size}
+            if cursor is not None:
+                params["cursor"] = cursor
+            else:
+                params["offset"] = offset
+            count = 0
+            if retry_budget is not None:
+                retry_budget.record_request()
+            for attempt in range(max_retries):
+                # Names of this page yielded by an earlier, interrupted attempt
+                skip, seen = count, 0
+                try:
+                    async with self._httpx.stream("GET", url, params=params) as resp:
+                        if resp.status_code >= 400:
+                            body = await resp.aread()
+                            delay = retry_delay(attempt, resp.headers) if policy.is_retryable_status(
+                                resp.status_code
+                            ) else None
+                            if delay is not None:
+                                await asyncio.sleep(delay)
+                                continue
+                            raise CriadexAPIError(status_code=resp.status_code, message=body.decode(errors="replace"))
+                        items = JSONArrayItems(resp.aiter_text(), "files")
+                        async for document_name in items:
+                            seen += 1
+                            if seen <= skip:
+                                continue
+                            if count == 0:
+                                if document_name == previous_first:
+                                    # The server ignored the offset and sent the first page again
+                                    return
+                                previous_first = document_name
+                            count += 1
+                            yield document_name
+                    break
+                except RequestError as exc:
+                    delay = retry_delay(attempt)
+                    if delay is None:
+                        raise CriadexNetworkError(
+                            f"Network error while listing {group_name} after {attempt + 1} attempts: {exc}"
+                        ) from exc
+                    await asyncio.sleep(delay)
+            else:
+                raise CriadexNetworkError(f"Listing {group_name} failed after {max_retries} attempts")
+
+            next_cursor = items.rest.get("next_cursor")
+            if next_cursor:
+                cursor = next_cursor
+                continue
+            if cursor is not None or count != page_size or items.rest.get("has_more") is False:
+                return
+            offset += count
+
+    async def _send_file(
+        self,
+        method: str,
+        action: str,
+        group_name,
+        source: Union[str, "os.PathLike[str]", AsyncIterable[bytes]],
+        file_name: Optional[str],
+        file_metadata: Optional[dict],
+        content_type: str,
+        chunk_size: int,
+        response_model: Type[BaseModel],
+    ) -> Any:
+        url = f"{self._api_base}/groups/{group_name}/content/{action}"
+        if file_name is None:
+            if not isinstance(source, (str, os.PathLike)):
+                raise ValueError("file_name is required when uploading from a stream")
+            file_name = os.path.basename(source)
+        body = MultipartUpload(
+            source,
+            file_name,
+            fields={"file_name": file_name, "file_metadata": json.dumps(file_metadata or {})},
+            content_type=content_type,
+            chunk_size=chunk_size,
+        )
+        options = {} if body.replayable else {"max_retries": 1}
+        try:
+            return await self._request(
+                method,
+                url,
+                content=body,
+                headers=body.headers(),
+                response_model=self._response_model(response_model),
+                priority=Priority.LOW,
+                **options,
+            )
+        finally:
+            self._invalidate(group_name)
+
+    async def upload_file(
+        self,
+        group_name,
+        source: Union[str, "os.PathLike[str]", AsyncIterable[bytes]],
+        file_name: Optional[str] = None,
+        file_metadata: Optional[dict] = None,
+        content_type: str = "application/octet-stream",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Upload a document from a file path or an async byte stream as a streamed multipart body.
+
+        Only ``chunk_size`` bytes of the document are held in memory at a time. File paths are
+        re-read on retry; async streams cannot be replayed, so they are sent exactly once.
+
+        :param source: Path to the document, or an async iterable of its bytes
+        :param file_name: Document name; defaults to the file's base name
+        :param file_metadata: Metadata stored with the document
+        """
+        # POST /groups/{group_name}/content/upload (multipart/form-data)
+        return await self._send_file(
+            "POST", "upload", group_name, source, file_name, file_metadata, content_type, chunk_size,
+            ContentUploadResponse,
+        )
+
+    async def update_file(
+        self,
+        group_name,
+        source: Union[str, "os.PathLike[str]", AsyncIterable[bytes]],
+        file_name: Optional[str] = None,
+        file_metadata: Optional[dict] = None,
+        content_type: str = "application/octet-stream",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Replace a document from a file path or an async byte stream. See ``upload_file``.
+        """
+        # PATCH /groups/{group_name}/content/update (multipart/form-data)
+        return await self._send_file(
+            "PATCH", "update", group_name, source, file_name, file_metadata, content_type, chunk_size,
+            ContentUpdateResponse,
+        )
+
+    async def sync(
+        self,
+        group_name,
+        directory: Union[str, "os.PathLike[str]"],
+        manifest: Optional[SyncManifest] = None,
+        pattern: str = "**/*",
+        delete_missing: bool = False,
+        dry_run: bool = False,
+        concurrency: int = 8,
+        on_progress: Optional[Callable[[BulkItemResult, BulkResult], Any]] = None,
+    ) -> SyncResult:
+        """
+        Make a group's documents match the files under ``directory``.
+
+        Files are named by their POSIX path relative to ``directory``. Local files are hashed (or their
+        hash reused from ``manifest`` when mtime and size are unchanged) and diffed against ``list``;
+        only new files are uploaded, changed files updated and, with ``delete_missing``, documents
+        without a local file deleted. Uploads, updates and deletes share one pool of ``concurrency``.
+
+        :param manifest: Persisted ``SyncManifest`` (e.g. ``SyncManifest("sync.sqlite")``); without one,
+                         every document that already exists remotely is treated as changed
+        :param delete_missing: Also delete remote documents that have no local file (off by default)
+        :param dry_run: Only compute and return the plan
+        :return: The plan and, unless ``dry_run``, per-document results keyed by document name
+        :raises FileNotFoundError: If ``directory`` does not exist
+        :raises NotADirectoryError: If ``directory`` is not a directory
+        """
+        manifest = manifest if manifest is not None else SyncManifest()
+        local = await scan_directory(directory, group_name, manifest, pattern)
+        listing = await self.with_options(typed=False).list(group_name)
+        remote = listing.get("files", []) if isinstance(listing, dict) else listing
+        plan = plan_sync(
+            {document: sha256 for document, (_, sha256) in local.items()},
+            remote or [],
+            {document: manifest.synced_hash(group_name, document) for document in local},
+            delete_missing=delete_missing,
+        )
+        if dry_run or not plan.changes:
+            return SyncResult(plan=plan, dry_run=dry_run)
+
+        async def apply(change: Tuple[str, str]) -> Any:
+            action, document = change
+            if action == "delete":
+                result = await self.delete(group_name, document)
+                manifest.remove(group_name, document)
+                return result
+            path, sha256 = local[document]
+            send = self.upload_file if action == "upload" else self.update_file
+            result = await send(group_name, path, file_name=document)
+            manifest.mark_synced(group_name, document, sha256)
+            return result
+
+        changes = [
+            *(("upload", document) for document in plan.upload),
+            *(("update", document) for document in plan.update),
+            *(("delete", document) for document in plan.delete),
+        ]
+        result = await run_bulk(
+            changes,
+            apply,
+            key=lambda change: change[1],
+            concurrency=concurrency,
+            catch=(CriadexSDKError,),
+            on_progress=on_progress,
+        )
+        return SyncResult(plan=plan, result=result)
+
+    async def upload_many(
+        self,
+        group_name,
+        files: Union[Iterable[Any], AsyncIterable[Any]],
+        concurrency: int = 8,
+        on_progress: Optional[Callable[[BulkItemResult, BulkResult], Any]] = None,
+    ) -> BulkResult:
+        """
+        Upload many documents with bounded concurrency.
+
+        :param group_name: Group to upload into
+        :param files: Iterable or async iterable of ``ContentUploadConfig`` models or dicts
+        :param concurrency: Maximum number of uploads in flight
+        :param on_progress: Called with each item result and the running totals
+        :return: Per-item success/failure with aggregated ``token_usage``
+        """
+        return await run_bulk(
+            files,
+            lambda file: self.upload(group_name, file),
+            key=_file_name,
+            concurrency=concurrency,
+            catch=(CriadexSDKError,),
+            on_progress=on_progress,
+        )
+
+    async def update_many(
+        self,
+        group_name,
+        files: Union[Iterable[Any], AsyncIterable[Any]],
+        concurrency: int = 8,
+        on_progress: Optional[Callable[[BulkItemResult, BulkResult], Any]] = None,
+    ) -> BulkResult:
+        """
+        Update many documents with bounded concurrency. See ``upload_many``.
+        """
+        return await run_bulk(
+            files,
+            lambda file: self.update(group_name, file),
+            key=_file_name,
+            concurrency=concurrency,
+            catch=(CriadexSDKError,),
+            on_progress=on_progress,
+        )
+
+    async def delete_many(
+        self,
+        group_name,
+        document_names: Union[Iterable[str], AsyncIterable[str]],
+        concurrency: int = 8,
+        on_progress: Optional[Callable[[BulkItemResult, BulkResult], Any]] = None,
+    ) -> BulkResult:
+        """
+        Delete many documents with bounded concurrency. See ``upload_many``.
+        """
+        return await run_bulk(
+            document_names,
+            lambda document_name: self.delete(group_name, document_name),
+            key=str,
+            concurrency=concurrency,
+            catch=(CriadexSDKError,),
+            on_progress=on_progress,
+        )
+
+class GroupsRouter(_BaseRouter):
+    def __init__(
+        self,
+        api_base: str,
+        httpx_client: AsyncClient,
+        max_retries: int,
+        search_cache: Optional[SearchCache] = None,
+        request_options: Optional[dict] = None,
+    ) -> None:
+        super().__init__(api_base, httpx_client, max_retries, request_options)
+        self._search_cache = search_cache
+
+    def _invalidate(self, group_name) -> None:
+        if self._search_cache is not None:
+            self._search_cache.invalidate_group(group_name)
+        self._invalidate_validators(group_name)
     
     async def create(self, group_name, group_config):
         # POST /groups/{group_name}/create
         url = f"{self._api_base}/groups/{group_name}/create"
-        dump = group_config.model_dump() if hasattr(group_config, 'model_dump') else group_config
-        return await _request_with_retry(
-            self._httpx,
+        dump = _json_body(group_config)
+        return await self._request(
             "POST",
             url,
-            max_retries=self._max_retries,
             json=dump,
+            response_model=self._response_model(GroupCreateResponse),
         )
     
     async def delete(self, group_name):
         # DELETE /groups/{group_name}/delete
         url = f"{self._api_base}/groups/{group_name}/delete"
-        return await _request_with_retry(
-            self._httpx,
-            "DELETE",
-            url,
-            max_retries=self._max_retries,
-        )
+        try:
+            return await self._request(
+                "DELETE",
+                url,
+                response_model=self._response_model(GroupDeleteResponse),
+            )
+        finally:
+            self._invalidate(group_name)
     
     async def about(self, group_name):
         # GET /groups/{group_name}/about
         url = f"{self._api_base}/groups/{group_name}/about"
-        return await _request_with_retry(
-            self._httpx,
+        return await self._request(
             "GET",
             url,
-            max_retries=self._max_retries,
+            response_model=self._response_model(GroupAboutResponse),
+            conditional=True,
         )
 
     async def build_graph(self, group_name):
         # POST /groups/{group_name}/build_graph
         url = f"{self._api_base}/groups/{group_name}/build_graph"
-        return await _request_with_retry(
-            self._httpx,
-            "POST",
-            url,
-            max_retries=self._max_retries,
-        )
+        try:
+            return await self._request(
+                "POST",
+                url,
+                response_model=self._response_model(GroupGraphBuildResponse),
+                priority=Priority.LOW,
+            )
+        finally:
+            self._invalidate(group_name)
 
     async def graph_status(self, group_name):
         # GET /groups/{group_name}/graph_status
         url = f"{self._api_base}/groups/{group_name}/graph_status"
-        return await _request_with_retry(
-            self._httpx,
+        return await self._request(
             "GET",
             url,
-            max_retries=self._max_retries,
+            response_model=self._response_model(GraphStatusResponse),
+            conditional=True,
+        )
+
+    async def build_graph_and_wait(
+        self,
+        group_name,
+        timeout: Optional[float] = None,
+        initial_interval: float = 0.5,
+        max_interval: float = 10.0,
+    ) -> GraphStatusResponse:
+        """
+        Start a graph build and poll ``graph_status`` until the job finishes.
+
+        Polls back off adaptively (see ``GraphPollBackoff``): often while ``job.progress`` moves, less
+        often while it stalls. The final status is returned whether the job succeeded or failed;
+        check ``status.job.state``.
+
+        :raises TimeoutError: If the build has not finished within ``timeout`` seconds
+        """
+        result = await self.build_graphs(
+            [group_name],
+            concurrency=1,
+            timeout=timeout,
+            initial_interval=initial_interval,
+            max_interval=max_interval,
         )
+        item = result.items[0]
+        if item.error is not None:
+            raise item.error
+        return item.result
 
-    async def graph_search(self, group_name, search_config):
+    async def build_graphs(
+        self,
+        group_names: Iterable[str],
+        concurrency: int = 4,
+        timeout: Optional[float] = None,
+        initial_interval: float = 0.5,
+        max_interval: float = 10.0,
+        on_progress: Optional[Callable[[GraphBuildProgress], Any]] = None,
+    ) -> BulkResult:
+        """
+        Build graphs for many groups with at most ``concurrency`` builds running at once.
+
+        All running builds are polled from one loop. ``on_progress`` receives a ``GraphBuildProgress``
+        with per-state counts and the aggregate ``percent`` after every poll. Each ``BulkItemResult`` holds
+        the group's final ``GraphStatusResponse``; failed jobs, request errors and builds exceeding
+        ``timeout`` seconds are recorded as not ok instead of aborting the batch.
+        """
+        # Polls must see the live job, never a cached or stale-while-revalidate body
+        poller = self.with_options(typed=True, validator_cache=None)
+        scheduler = GraphBuildScheduler(
+            self.build_graph,
+            poller.graph_status,
+            concurrency=concurrency,
+            timeout=timeout,
+            backoff=lambda: GraphPollBackoff(initial_interval, max_interval),
+            catch=(CriadexSDKError,),
+            on_progress=on_progress,
+        )
+        return await scheduler.run(group_names)
+
+    async def graph_search(self, group_name, search_config, use_cache: bool = True):
         # POST /groups/{group_name}/graph_search
         url = f"{self._api_base}/groups/{group_name}/graph_search"
-        dump = search_config.model_dump() if hasattr(search_config, "model_dump") else search_config
-        return await _request_with_retry(
-            self._httpx,
-            "POST",
-            url,
-            max_retries=self._max_retries,
-            json=dump,
+        dump = _json_body(search_config)
+
+        response_model = self._response_model(GraphSearchResponse)
+
+        async def fetch() -> Any:
+            return await self._request(
+                "POST",
+                url,
+                json=dump,
+                idempotent=True,
+                response_model=response_model,
+                priority=Priority.HIGH,
+            )
+
+        if self._search_cache is None or not use_cache:
+            return await fetch()
+        return await _cached_search(
+            self._search_cache, "graph_search", group_name, dump, GraphSearchConfig, fetch, response_model,
+            self._httpx.headers.get("x-api-key"),
         )
 
-class AuthRouter:
-    def __init__(self, api_base: str, httpx_client: AsyncClient, max_retries: int) -> None:
-        self._api_base = api_base
-        self._httpx = httpx_client
-        self._max_retries = max_retries
+    def _content(self) -> "ContentRouter":
+        # Standard search through the same client, caches and request options as this router
+        return ContentRouter(self._api_base, self._httpx, self._max_retries, self._search_cache, self._request_options)
+
+    async def race_search(self, group_name, search_config, latency_budget: float = 1.0) -> Any:
+        """
+        Send ``graph_search`` and the standard ``content.search`` concurrently and keep one.
+
+        Graph results win if they arrive within ``latency_budget`` seconds and are usable (the graph is
+        built and the server did not fall back). Otherwise the standard results are returned, or the
+        graph's fallback results if the standard search failed. The losing request is cancelled.
+        ``metadata["race"]`` records the ``winner`` and each path's ``status`` and ``latency_ms``.
+
+        :param search_config: ``GraphSearchConfig`` model or dict; the standard search uses its
+            ``query`` as the prompt along with the shared top-k/top-n, filter and group settings
+        """
+        config = search_config.model_dump() if hasattr(search_config, "model_dump") else dict(search_config)
+        untyped = self.with_options(typed=False)
+        started = time.perf_counter()
+        paths = {
+            "graph": asyncio.ensure_future(untyped.graph_search(group_name, config)),
+            "standard": asyncio.ensure_future(untyped._content().search(group_name, _standard_search_config(config))),
+        }
+        timings = {name: {"status": "pending", "latency_ms": None} for name in paths}
+
+        def timed(name: str) -> Callable[["asyncio.Future[Any]"], None]:
+            def record(task: "asyncio.Future[Any]") -> None:
+                timings[name]["latency_ms"] = int((time.perf_counter() - started) * 1000)
+                if task.cancelled():
+                    timings[name]["status"] = "cancelled"
+                elif task.exception() is not None:
+                    timings[name]["status"] = "error"
+                    timings[name]["error"] = str(task.exception())
+                else:
+                    timings[name]["status"] = "ok"
+            return record
+
+        for name, task in paths.items():
+            task.add_done_callback(timed(name))
+
+        graph, timed_out = None, False
+        try:
+            try:
+                graph = await asyncio.wait_for(asyncio.shield(paths["graph"]), latency_budget)
+            except asyncio.TimeoutError:
+                timed_out = True
+                paths["graph"].cancel()
+            except CriadexSDKError:
+                pass
+            if graph is not None and _graph_usable(graph):
+                winner, result = "graph", graph
+            else:
+                try:
+                    winner, result = "standard", await paths["standard"]
+                except CriadexSDKError:
+                    if graph is None:
+                        raise
+                    winner, result = "graph", graph
+        finally:
+            for task in paths.values():
+                task.cancel()
+            # Let cancelled requests unwind so their timings are recorded
+            await asyncio.gather(*paths.values(), return_exceptions=True)
 
+        if timed_out:
+            timings["graph"]["status"] = "timeout"
+        elif graph is not None and not _graph_usable(graph):
+            timings["graph"]["status"] = "unusable"
+        merged = {
+            **result,
+            "metadata": {**(result.get("metadata") or {}), "race": {"winner": winner, **timings}},
+        }
+        response_model = self._response_model(GraphSearchResponse if winner == "graph" else GroupSearchResponse)
+        return response_model.model_validate(merged) if response_model is not None else merged
+
+    async def hybrid_search(
+        self,
+        group_name,
+        search_config,
+        fusion: str = "rrf",
+        weights: Tuple[float, float] = (1.0, 1.0),
+        rrf_k: int = 60,
+        top_k: Optional[int] = None,
+    ) -> Any:
+        """
+        Run the standard ``content.search`` and ``graph_search`` concurrently and fuse their nodes.
+
+        ``fusion="rrf"`` ranks by reciprocal rank (``rrf_k`` smooths the rank weights) and
+        ``fusion="weighted"`` by a weighted sum of per-list normalized scores; ``weights`` are
+        ``(vector, graph)``. Nodes are deduplicated by identity and carry the fused score. A path that
+        fails is reported in ``metadata["paths"]`` and the other's results are still returned, with
+        ``metadata["partial"]`` set.
+
+        :param search_config: ``GraphSearchConfig`` model or dict; the standard search uses its
+            ``query`` as the prompt along with the shared top-k/top-n, filter and group settings
+        :param top_k: Number of fused nodes to keep; defaults to the config's ``top_n``/``top_k``
+        :return: ``GroupSearchResponse``-shaped dict (typed when typed responses are enabled)
+        """
+        if fusion not in ("rrf", "weighted"):
+            raise ValueError("fusion must be 'rrf' or 'weighted'")
+        config = search_config.model_dump() if hasattr(search_config, "model_dump") else dict(search_config)
+        if top_k is None:
+            top_k = config.get("top_n") or config.get("top_k")
+        # Fuse plain dicts; the combined result is typed once at the end if requested
+        untyped = self.with_options(typed=False)
+
+        outcomes = await asyncio.gather(
+            _timed_search("vector", untyped._content().search(group_name, _standard_search_config(config))),
+            _timed_search("graph", untyped.graph_search(group_name, config)),
+        )
+        node_lists = [(result or {}).get("nodes") or [] for _, result, _ in outcomes]
+        if fusion == "rrf":
+            nodes = reciprocal_rank_fusion(node_lists, k=rrf_k, weights=weights, limit=top_k)
+        else:
+            nodes = weighted_score_fusion(node_lists, weights=weights, limit=top_k)
+        results = [result for _, result, _ in outcomes if result is not None]
+        graph = outcomes[1][1]
+        merged = {
+            "nodes": nodes,
+            **_merge_search_results(results),
+            "metadata": {
+                "fusion": fusion,
+                "paths": {name: breakdown for name, _, breakdown in outcomes},
+                "partial": len(results) < len(outcomes),
+                "graph_metadata": (graph or {}).get("graph_metadata"),
+            },
+        }
+        response_model = self._response_model(GroupSearchResponse)
+        return response_model.model_validate(merged) if response_model is not None else merged
+
+class _AuthCachingRouter(_BaseRouter):
+    def __init__(
+        self,
+        api_base: str,
+        httpx_client: AsyncClient,
+        max_retries: int,
+        auth_cache: Optional[AuthCache] = None,
+        request_options: Optional[dict] = None,
+    ) -> None:
+        super().__init__(api_base, httpx_client, max_retries, request_options)
+        self._auth_cache = auth_cache
+
+    def _invalidate(self, *api_keys) -> None:
+        if self._auth_cache is not None:
+            for api_key in api_keys:
+                self._auth_cache.invalidate_key(api_key)
+
+
+class AuthRouter(_AuthCachingRouter):
     async def create(self, api_key, create_config):
         # POST /auth/{api_key}/create
         url = f"{self._api_base}/auth/{api_key}/create"
-        dump = create_config.model_dump() if hasattr(create_config, 'model_dump') else create_config
-        return await _request_with_retry(
-            self._httpx,
-            "POST",
-            url,
-            max_retries=self._max_retries,
-            json=dump,
-        )
+        dump = _json_body(create_config)
+        try:
+            return await self._request(
+                "POST",
+                url,
+                json=dump,
+                response_model=self._response_model(AuthCreateResponse),
+            )
+        finally:
+            # A negatively cached 404 for the new key must not outlive its creation
+            self._invalidate(api_key)
 
     async def delete(self, api_key):
         # DELETE /auth/{api_key}/delete
         url = f"{self._api_base}/auth/{api_key}/delete"
-        return await _request_with_retry(
-            self._httpx,
-            "DELETE",
-            url,
-            max_retries=self._max_retries,
-        )
+        try:
+            return await self._request(
+                "DELETE",
+                url,
+                response_model=self._response_model(AuthDeleteResponse),
+            )
+        finally:
+            self._invalidate(api_key)
 
     async def check(self, api_key):
         # GET /auth/{api_key}/check
         url = f"{self._api_base}/auth/{api_key}/check"
-        return await _request_with_retry(
-            self._httpx,
-            "GET",
-            url,
-            max_retries=self._max_retries,
-        )
+        response_model = self._response_model(AuthCheckResponse)
+
+        async def fetch() -> Any:
+            return await self._request(
+                "GET",
+                url,
+                response_model=response_model,
+            )
+
+        if self._auth_cache is None:
+            return await fetch()
+        return await _cached_auth_check(self._auth_cache, api_key, None, fetch, response_model)
 
     async def reset(self, api_key, new_key):
         # PATCH /auth/{api_key}/reset
         url = f"{self._api_base}/auth/{api_key}/reset"
         data = {"new_key": new_key}
-        return await _request_with_retry(
-            self._httpx,
-            "PATCH",
-            url,
-            max_retries=self._max_retries,
-            json=data,
-        )
+        try:
+            return await self._request(
+                "PATCH",
+                url,
+                json=data,
+                response_model=self._response_model(AuthResetResponse),
+            )
+        finally:
+            self._invalidate(api_key, new_key)
 
-class GroupAuthRouter:
-    def __init__(self, api_base: str, httpx_client: AsyncClient, max_retries: int) -> None:
-        self._api_base = api_base
-        self._httpx = httpx_client
-        self._max_retries = max_retries
-    
+class GroupAuthRouter(_AuthCachingRouter):
     async def create(self, group_name, api_key):
         # POST /group_auth/{group_name}/create
         url = f"{self._api_base}/group_auth/{group_name}/create"
         params = {"api_key": api_key}
-        return await _request_with_retry(
-            self._httpx,
-            "POST",
-            url,
-            max_retries=self._max_retries,
-            params=params,
-        )
+        try:
+            return await self._request(
+                "POST",
+                url,
+                params=params,
+            )
+        finally:
+            self._invalidate(api_key)
     
     async def check(self, group_name, api_key):
         # GET /group_auth/{group_name}/check?api_key={api_key}
         url = f"{self._api_base}/group_auth/{group_name}/check"
-        return await _request_with_retry(
-            self._httpx,
-            "GET",
-            url,
-            max_retries=self._max_retries,
-            params={"api_key": api_key},
-        )
+        response_model = self._response_model(GroupAuthCheckResponse)
+
+        async def fetch() -> Any:
+            return await self._request(
+                "GET",
+                url,
+                params={"api_key": api_key},
+                response_model=response_model,
+            )
+
+        if self._auth_cache is None:
+            return await fetch()
+        return await _cached_auth_check(self._auth_cache, api_key, group_name, fetch, response_model)
     
     async def delete(self, group_name, api_key):
         # DELETE /group_auth/{group_name}/delete?api_key={api_key}
         url = f"{self._api_base}/group_auth/{group_name}/delete"
-        return await _request_with_retry(
-            self._httpx,
-            "DELETE",
-            url,
-            max_retries=self._max_retries,
-            params={"api_key": api_key},
-        )
+        try:
+            return await self._request(
+                "DELETE",
+                url,
+                params={"api_key": api_key},
+            )
+        finally:
+            self._invalidate(api_key)
     
     async def list(self, api_key):
         # GET /auth/keys/{api_key}/groups
         url = f"{self._api_base}/auth/keys/{api_key}/groups"
-        return await _request_with_retry(
-            self._httpx,
+        generation = self._auth_cache.generation(api_key) if self._auth_cache is not None else 0
+        result = await self._request(
             "GET",
             url,
-            max_retries=self._max_retries,
+            response_model=self._response_model(GroupAuthListResponse),
         )
+        if self._auth_cache is not None:
+            # Lets group_auth.check answer known groups for this key without a round trip
+            self._auth_cache.index_groups(api_key, result, generation)
+        return result
 
-class ModelsRouter:
-    def __init__(self, api_base: str, httpx_client: AsyncClient, max_retries: int) -> None:
-        self._api_base = api_base
-        self._httpx = httpx_client
-        self._max_retries = max_retries
+class ModelsRouter(_BaseRouter):
+    def _invalidate(self) -> None:
+        """Drop conditional-request entries (``about``, ``list``) for every model."""
+        validator_cache = self._request_options.get("validator_cache")
+        if validator_cache is not None:
+            validator_cache.invalidate_prefix(f"{self._api_base}/models/")
 
     async def create(self, model_id, model_config, provider_type: str = "azure"):
         # POST /models/{provider_type}/create
         url = f"{self._api_base}/models/{provider_type}/create"
         dump = model_config.model_dump(mode='json') if hasattr(model_config, 'model_dump') else dict(model_config)
         data = {"model_id": model_id, **dump}
-        return await _request_with_retry(
-            self._httpx,
-            "POST",
-            url,
-            max_retries=self._max_retries,
-            json=data,
-        )
+        try:
+            return await self._request(
+                "POST",
+                url,
+                json=data,
+                response_model=self._response_model(ModelCreateResponse),
+            )
+        finally:
+            self._invalidate()
 
     async def delete(self, model_id, provider_type: str = "azure"):
         # DELETE /models/{provider_type}/{model_id}/delete
         url = f"{self._api_base}/models/{provider_type}/{model_id}/delete"
-        return await _request_with_retry(
-            self._httpx,
-            "DELETE",
-            url,
-            max_retries=self._max_retries,
-        )
+        try:
+            return await self._request(
+                "DELETE",
+                url,
+                response_model=self._response_model(ModelDeleteResponse),
+            )
+        finally:
+            self._invalidate()
 
     async def about(self, model_id, provider_type: str = "azure"):
         # GET /models/{provider_type}/{model_id}/about
         url = f"{self._api_base}/models/{provider_type}/{model_id}/about"
-        return await _request_with_retry(
-            self._httpx,
+        return await self._request(
             "GET",
             url,
-            max_retries=self._max_retries,
+            response_model=self._response_model(ModelAboutResponse),
+            conditional=True,
         )
 
     async def list(self, provider_type: str = ""):
@@ -354,84 +1770,95 @@ class ModelsRouter:
             url = f"{self._api_base}/models/{provider_type}/list"
         else:
             url = f"{self._api_base}/models/list"
-        return await _request_with_retry(
-            self._httpx,
+        return await self._request(
             "GET",
             url,
-            max_retries=self._max_retries,
+            conditional=True,
         )
 
     async def update(self, model_id, model_config, provider_type: str = "azure"):
         # PATCH /models/{provider_type}/{model_id}/update
         url = f"{self._api_base}/models/{provider_type}/{model_id}/update"
         dump = model_config.model_dump(mode='json') if hasattr(model_config, 'model_dump') else dict(model_config)
-        return await _request_with_retry(
-            self._httpx,
-            "PATCH",
-            url,
-            max_retries=self._max_retries,
-            json=dump,
-        )
+        try:
+            return await self._request(
+                "PATCH",
+                url,
+                json=dump,
+            )
+        finally:
+            self._invalidate()
 
 class AgentsRouter:
-    class Azure:
-        def __init__(self, api_base: str, httpx_client: AsyncClient, max_retries: int) -> None:
-            self._api_base = api_base
-            self._httpx = httpx_client
-            self._max_retries = max_retries
-
+    class Azure(_BaseRouter):
         async def chat(self, model_id, agent_config):
             # POST /models/{model_id}/chat
             url = f"{self._api_base}/models/ragflow/{model_id}/agents/chat"
-            return await _request_with_retry(
-                self._httpx,
+            return await self._request(
                 "POST",
                 url,
-                max_retries=self._max_retries,
                 json=agent_config,
+                response_model=self._response_model(AgentChatResponse),
+                priority=Priority.HIGH,
+            )
+
+        def chat_stream(self, model_id, agent_config) -> ChatStream:
+            """
+            Stream a chat completion as text deltas.
+
+            Usage::
+
+                async with sdk.agents.azure.chat_stream(model_id, config) as stream:
+                    async for delta in stream:
+                        print(delta, end="")
+                print(stream.response, stream.time_to_first_token)
+            """
+            # POST /models/ragflow/{model_id}/agents/chat
+            url = f"{self._api_base}/models/ragflow/{model_id}/agents/chat"
+            dump = agent_config.model_dump(mode='json') if hasattr(agent_config, 'model_dump') else dict(agent_config)
+            return ChatStream(
+                self._httpx,
+                url,
+                {**dump, "stream": True},
+                self._request_options,
+                self._request_options.get("max_retries", self._max_retries),
             )
 
         async def related_prompts(self, model_id, agent_config):
             # POST /models/{model_id}/related_prompts
             url = f"{self._api_base}/models/{model_id}/related_prompts"
-            return await _request_with_retry(
-                self._httpx,
+            return await self._request(
                 "POST",
                 url,
-                max_retries=self._max_retries,
                 json=agent_config,
+                response_model=self._response_model(AgentRelatedPromptsResponse),
             )
 
         async def transform(self, model_id, agent_config):
             # POST /models/ragflow/{model_id}/agents/transform
             url = f"{self._api_base}/models/ragflow/{model_id}/agents/transform"
-            return await _request_with_retry(
-                self._httpx,
+            return await self._request(
                 "POST",
                 url,
-                max_retries=self._max_retries,
                 json=agent_config,
+                response_model=self._response_model(AgentTransformResponse),
             )
 
         async def intents(self, model_id, agent_config):
             # POST /models/ragflow/{model_id}/agents/intents
             url = f"{self._api_base}/models/ragflow/{model_id}/agents/intents"
-            return await _request_with_retry(
-                self._httpx,
+            return await self._request(
                 "POST",
                 url,
-                max_retries=self._max_retries,
                 json=agent_config,
             )
 
         async def language(self, model_id, agent_config):
             # POST /models/ragflow/{model_id}/agents/language
             url = f"{self._api_base}/models/ragflow/{model_id}/agents/language"
-            return await _request_with_retry(
-                self._httpx,
+            return await self._request(
                 "POST",
                 url,
-                max_retries=self._max_retries,
                 json=agent_config,
             )
 
@@ -450,21 +1877,24 @@ class AgentsRouter:
                 payload["llm_id"] = model_id
             if tenant_id:
                 payload["tenant_id"] = tenant_id
-            return await _request_with_retry(
-                self._httpx,
+            return await self._request(
                 "POST",
                 url,
-                max_retries=self._max_retries,
                 json=payload,
             )
 
-    class Cohere:
-        def __init__(self, api_base: str, httpx_client: AsyncClient, max_retries: int) -> None:
-            self._api_base = api_base
-            self._httpx = httpx_client
-            self._max_retries = max_retries
+    class Cohere(_BaseRouter):
+        async def rerank(self, model_id, agent_config, chunk_size: Optional[int] = None, concurrency: int = 4):
+            """
+            Rerank documents against a query.
 
-        async def rerank(self, model_id, agent_config):
+            With ``chunk_size`` set, a document list longer than that is split into chunks that are
+            reranked concurrently (at most ``concurrency`` requests in flight), each asked for up to
+            ``top_n`` nodes. The chunk results are merged into one global top ``top_n`` by score, which
+            matches a single request whenever the model's scores are absolute (independent of the
+            other documents in the request). If any chunk fails the others are cancelled and the error
+            is raised.
+            """
             # POST /models/{model_id}/rerank
             url = f"{self._api_base}/models/{model_id}/rerank"
             cfg = agent_config.model_dump(mode='json') if hasattr(agent_config, 'model_dump') else dict(agent_config)
@@ -483,14 +1913,42 @@ class AgentsRouter:
                     payload[key] = cfg[key]
 
             headers = {"x-api-key": self._httpx.headers.get("x-api-key")}
-            return await _request_with_retry(
-                self._httpx,
-                "POST",
-                url,
-                max_retries=self._max_retries,
-                json=payload,
-                headers=headers,
-            )
+            documents = payload["documents"]
+            if chunk_size is None or len(documents) <= chunk_size:
+                return await self._request(
+                    "POST",
+                    url,
+                    json=payload,
+                    headers=headers,
+                    response_model=self._response_model(AgentRerankResponse),
+                    priority=Priority.HIGH,
+                )
+            if chunk_size < 1 or concurrency < 1:
+                raise ValueError("chunk_size and concurrency must be at least 1")
+
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def rerank_chunk(start: int) -> dict:
+                chunk = documents[start:start + chunk_size]
+                chunk_payload = {**payload, "documents": chunk}
+                if payload.get("top_n") is not None:
+                    chunk_payload["top_n"] = min(payload["top_n"], len(chunk))
+                async with semaphore:
+                    return await self._request(
+                        "POST", url, json=chunk_payload, headers=headers, priority=Priority.HIGH
+                    )
+
+            tasks = [asyncio.ensure_future(rerank_chunk(start)) for start in range(0, len(documents), chunk_size)]
+            try:
+                responses = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            merged = merge_reranked(responses, payload.get("top_n"))
+            response_model = self._response_model(AgentRerankResponse)
+            return response_model.model_validate(merged) if response_model is not None else merged
 
     def __init__(self, api_base, httpx_client):
         # max_retries is owned by RAGFlowSDK; router is wired up there
@@ -498,24 +1956,135 @@ class AgentsRouter:
 
 
 class RAGFlowSDK:
-    def __init__(self, api_base: str, error_stacktrace: bool = True, timeout: float = 30.0, max_retries: int = 3):
+    def __init__(
+        self,
+        api_base: str,
+        error_stacktrace: bool = True,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        transport: Optional[AsyncBaseTransport] = None,
+        search_cache: Optional[SearchCache] = None,
+        coalescer: Optional[RequestCoalescer] = None,
+        typed_responses: bool = False,
+        json_codec: Union[None, str, JSONCodec] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        deadline: Optional[float] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        auth_cache: Optional[AuthCache] = None,
+        validator_cache: Optional[ValidatorCache] = None,
+        compression: Optional[CompressionPolicy] = None,
+    ):
         self._api_base = api_base[:-1] if api_base.endswith("/") else api_base
         self._error_stacktrace = error_stacktrace
         self._timeout = Timeout(timeout)
         self._max_retries = max_retries
-        # Use a bounded timeout to avoid hanging requests
-        self._httpx = AsyncClient(timeout=self._timeout)
+        self._limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2
+        self._search_cache = search_cache
+        self._auth_cache = auth_cache
+        self._coalescer = coalescer
+        # Client-wide options forwarded to every request made by the routers
+        self._request_options: dict = {}
+        if coalescer is not None:
+            self._request_options["coalescer"] = coalescer
+        if typed_responses:
+            self._request_options["typed"] = True
+        self._codec = get_codec(json_codec) if json_codec is not None else None
+        if self._codec is not None:
+            self._request_options["codec"] = self._codec
+        self._retry_policy = retry_policy
+        self._retry_budget = retry_budget
+        if retry_policy is not None:
+            self._request_options["retry_policy"] = retry_policy
+        if retry_budget is not None:
+            self._request_options["retry_budget"] = retry_budget
+        if deadline is not None:
+            self._request_options["deadline"] = deadline
+        self._circuit_breakers = circuit_breakers
+        if circuit_breakers is not None:
+            self._request_options["circuit_breakers"] = circuit_breakers
+        self._hedging = hedging
+        if hedging is not None:
+            self._request_options["hedging"] = hedging
+        self._rate_limiter = rate_limiter
+        if rate_limiter is not None:
+            self._request_options["rate_limiter"] = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        if concurrency_limiter is not None:
+            self._request_options["concurrency_limiter"] = concurrency_limiter
+        self._scheduler = scheduler
+        if scheduler is not None:
+            self._request_options["scheduler"] = scheduler
+        self._validator_cache = validator_cache
+        if validator_cache is not None:
+            self._request_options["validator_cache"] = validator_cache
+        self._compression = compression
+        if compression is not None:
+            self._request_options["compression"] = compression
+        # Use a bounded timeout to avoid hanging requests. When a transport is
+        # injected it owns the pool, so limits/http2 are configured on it instead.
+        if transport is not None:
+            self._httpx = AsyncClient(timeout=self._timeout, transport=transport)
+        else:
+            self._httpx = AsyncClient(timeout=self._timeout, limits=self._limits, http2=self._http2)
         # Explicitly remove Authorization header from default headers
         if "Authorization" in self._httpx.headers:
             del self._httpx.headers["Authorization"]
-        self.content = ContentRouter(self._api_base, self._httpx, self._max_retries)
-        self.manage = GroupsRouter(self._api_base, self._httpx, self._max_retries)
-        self.auth = AuthRouter(self._api_base, self._httpx, self._max_retries)
-        self.group_auth = GroupAuthRouter(self._api_base, self._httpx, self._max_retries)
-        self.models = ModelsRouter(self._api_base, self._httpx, self._max_retries)
+        self._keepalive_task: Optional["asyncio.Task[None]"] = None
+        self.content = ContentRouter(
+            self._api_base, self._httpx, self._max_retries, self._search_cache, self._request_options
+        )
+        self.manage = GroupsRouter(
+            self._api_base, self._httpx, self._max_retries, self._search_cache, self._request_options
+        )
+        self.auth = AuthRouter(
+            self._api_base, self._httpx, self._max_retries, self._auth_cache, self._request_options
+        )
+        self.group_auth = GroupAuthRouter(
+            self._api_base, self._httpx, self._max_retries, self._auth_cache, self._request_options
+        )
+        self.models = ModelsRouter(self._api_base, self._httpx, self._max_retries, self._request_options)
         self.agents = type("Agents", (), {})()
-        self.agents.azure = AgentsRouter.Azure(self._api_base, self._httpx, self._max_retries)
-        self.agents.cohere = AgentsRouter.Cohere(self._api_base, self._httpx, self._max_retries)
+        self.agents.azure = AgentsRouter.Azure(self._api_base, self._httpx, self._max_retries, self._request_options)
+        self.agents.cohere = AgentsRouter.Cohere(self._api_base, self._httpx, self._max_retries, self._request_options)
+
+    @staticmethod
+    def create_shared_transport(
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        **transport_kwargs: Any,
+    ) -> SharedTransport:
+        """
+        Build a tuned connection pool that can be passed as ``transport=`` to
+        several RAGFlowSDK instances in the same process.
+
+        Call ``await transport.close_pool()`` once every client using it is done.
+        """
+        inner = AsyncHTTPTransport(
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            **transport_kwargs,
+        )
+        return SharedTransport(inner)
 
     def authenticate(self, api_key: str) -> None:
         # Set the API key header for all requests
@@ -525,4 +2094,74 @@ class RAGFlowSDK:
             del self._httpx.headers["Authorization"]
         # Also remove the Authorization header from the default headers of the httpx client
         if "Authorization" in self._httpx.headers:
-            del self._httpx.headers["Authorization"]
\ No newline at end of file
+            del self._httpx.headers["Authorization"]
+
+    async def warmup(self, connections: int = 1, path: str = "/") -> int:
+        """
+        Open pooled connections ahead of time so the first real request does not pay for TCP/TLS setup.
+
+        Issues ``connections`` concurrent HEAD requests against ``path``; any HTTP response
+        (including 404/405) counts, since only the connection itself matters.
+
+        :param connections: Number of connections to open (capped by the pool size)
+        :param path: Path relative to the API base to send the HEAD requests to
+        :return: Number of connections that were successfully established
+        """
+        url = f"{self._api_base}/{path.lstrip('/')}"
+
+        async def _open() -> bool:
+            try:
+                resp = await self._httpx.request("HEAD", url)
+                await resp.aclose()
+                return True
+            except RequestError as exc:
+                logger.debug("RAGFlowSDK warmup %s failed: %s", url, exc)
+                return False
+
+        results = await asyncio.gather(*(_open() for _ in range(max(connections, 0))))
+        return sum(results)
+
+    def start_keepalive(self, interval: Optional[float] = None, connections: int = 1, path: str = "/") -> None:
+        """
+        Start a background task that periodically re-warms idle pooled connections.
+
+        :param interval: Seconds between pings; defaults to 80% of ``keepalive_expiry`` so
+                         connections are touched before the pool expires them
+        :param connections: Number of connections to keep warm
+        :param path: Path relative to the API base to ping
+        """
+        if self._keepalive_task is not None and not self._keepalive_task.done():
+            return
+
+        if interval is None:
+            expiry = self._limits.keepalive_expiry
+            interval = expiry * 0.8 if expiry else 4.0
+
+        async def _loop() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await self.warmup(connections=connections, path=path)
+
+        self._keepalive_task = asyncio.get_running_loop().create_task(_loop())
+
+    async def stop_keepalive(self) -> None:
+        """Stop the background keepalive task, if running."""
+        task, self._keepalive_task = self._keepalive_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def aclose(self) -> None:
+        """Stop background tasks and close the HTTP client and its connection pool."""
+        await self.stop_keepalive()
+        await self._httpx.aclose()
+
+    async def __aenter__(self) -> "RAGFlowSDK":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,141 @@
+"""
+Parsers for streamed (SSE / NDJSON) agent responses and incrementally decoded JSON bodies.
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional
+import json
+import re
+
+
+async def iter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Yield the ``data`` payload of each Server-Sent Event from an iterator of lines.
+    """
+    data: List[str] = []
+    async for line in lines:
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield "\n".join(data)
+
+
+async def iter_ndjson_data(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Yield each non-empty line of a newline-delimited JSON stream.
+    """
+    async for line in lines:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def extract_delta(event: Any) -> Optional[str]:
+    """
+    Pull the text delta out of a stream event.
+
+    Supports ``{"delta": "..."}`` events and OpenAI-style
+    ``{"choices": [{"delta": {"content": "..."}}]}`` chunks.
+    """
+    if not isinstance(event, dict):
+        return None
+    delta = event.get("delta")
+    if isinstance(delta, str):
+        return delta
+    if isinstance(delta, dict) and isinstance(delta.get("content"), str):
+        return delta["content"]
+    choices = event.get("choices")
+    if isinstance(choices, list) and choices:
+        choice_delta = (choices[0] or {}).get("delta") or {}
+        if isinstance(choice_delta.get("content"), str):
+            return choice_delta["content"]
+    return None
+
+
+def decode_event(data: str) -> Any:
+    """Decode one event payload; returns ``None`` for the ``[DONE]`` sentinel."""
+    if data.strip() == "[DONE]":
+        return None
+    return json.loads(data)
+
+
+class JSONArrayItems:
+    """
+    Yield the items of a streamed JSON body's ``key`` array (or of a bare top-level array) as they arrive,
+    without holding the whole body in memory.
+
+    After iteration, ``rest`` holds the object's other keys, e.g. a pagination cursor sent after the array.
+    """
+
+    def __init__(self, chunks: AsyncIterable[str], key: str) -> None:
+        self._chunks = chunks
+        self._key = key
+        self.rest: dict = {}
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        decoder = json.JSONDecoder()
+        chunks = self._chunks.__aiter__()
+        key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(self._key))
+        buffer = ""
+        ended = False
+
+        async def more() -> bool:
+            nonlocal buffer, ended
+            try:
+                buffer += await chunks.__anext__()
+                return True
+            except StopAsyncIteration:
+                ended = True
+                return False
+
+        # Find the start of the array
+        prefix: Optional[str] = None
+        while True:
+            stripped = buffer.lstrip()
+            if stripped.startswith("["):
+                buffer = stripped[1:]
+                break
+            match = key_pattern.search(buffer)
+            if match:
+                prefix, buffer = buffer[:match.start()], buffer[match.end():]
+                break
+            if not await more():
+                self.rest = json.loads(buffer) if buffer.strip() else {}
+                return
+
+        # Decode one item at a time; a value is only trusted once something follows it
+        while True:
+            buffer = buffer.lstrip(" \t\r\n,")
+            if buffer.startswith("]"):
+                buffer = buffer[1:]
+                break
+            if buffer:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    if ended:
+                        raise
+                else:
+                    if end < len(buffer) or ended:
+                        buffer = buffer[end:]
+                        yield item
+                        continue
+            if not await more() and not buffer:
+                raise ValueError("JSON body ended inside an array")
+
+        if prefix is not None:
+            while await more():
+                pass
+            rest = json.loads(f'{prefix}"{self._key}":[]{buffer}')
+            rest.pop(self._key, None)
+            self.rest = rest
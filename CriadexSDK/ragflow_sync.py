@@ -0,0 +1,160 @@
+"""
+Incremental directory sync: local content hashing, a persisted manifest and diff planning.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import os
+import sqlite3
+
+from CriadexSDK.ragflow_bulk import BulkResult
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SyncPlan:
+    upload: List[str] = field(default_factory=list)
+    update: List[str] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def changes(self) -> int:
+        return len(self.upload) + len(self.update) + len(self.delete)
+
+
+@dataclass
+class SyncResult:
+    plan: SyncPlan
+    # Per-document outcomes keyed by document name; empty for a dry run
+    result: BulkResult = field(default_factory=BulkResult)
+    dry_run: bool = False
+
+
+class SyncManifest:
+    """
+    SQLite record of every synced file: ``(group, document) -> (mtime, size, sha256, synced sha256)``.
+
+    Files whose mtime and size are unchanged reuse the stored hash instead of being re-read, and the
+    synced hash tells whether the copy in Criadex is already current. Pass ``":memory:"`` (the default)
+    for a manifest that only lives as long as the object.
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"] = ":memory:") -> None:
+        self._db = sqlite3.connect(str(path))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " group_name TEXT NOT NULL, document TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, sha256 TEXT NOT NULL, synced_sha256 TEXT,"
+            " PRIMARY KEY (group_name, document))"
+        )
+        self._db.commit()
+
+    def cached_hash(self, group_name: str, document: str, mtime_ns: int, size: int) -> Optional[str]:
+        row = self._db.execute(
+            "SELECT sha256 FROM files WHERE group_name = ? AND document = ? AND mtime_ns = ? AND size = ?",
+            (group_name, document, mtime_ns, size),
+        ).fetchone()
+        return row[0] if row else None
+
+    def record_hash(self, group_name: str, document: str, mtime_ns: int, size: int, sha256: str) -> None:
+        self._db.execute(
+            "INSERT INTO files (group_name, document, mtime_ns, size, sha256) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (group_name, document) DO UPDATE SET"
+            " mtime_ns = excluded.mtime_ns, size = excluded.size, sha256 = excluded.sha256",
+            (group_name, document, mtime_ns, size, sha256),
+        )
+        self._db.commit()
+
+    def synced_hash(self, group_name: str, document: str) -> Optional[str]:
+        row = self._db.execute(
+            "SELECT synced_sha256 FROM files WHERE group_name = ? AND document = ?", (group_name, document)
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, group_name: str, document: str, sha256: str) -> None:
+        self._db.execute(
+            "UPDATE files SET synced_sha256 = ? WHERE group_name = ? AND document = ?", (sha256, group_name, document)
+        )
+        self._db.commit()
+
+    def remove(self, group_name: str, document: str) -> None:
+        self._db.execute("DELETE FROM files WHERE group_name = ? AND document = ?", (group_name, document))
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def scan_directory(
+    directory: Union[str, "os.PathLike[str]"],
+    group_name: str,
+    manifest: SyncManifest,
+    pattern: str = "**/*",
+) -> Dict[str, Tuple[Path, str]]:
+    """
+    Map each file under ``directory`` to ``(path, sha256)``, keyed by its POSIX path relative to ``directory``.
+
+    Hashing runs off the event loop and is skipped for files the manifest has seen with the same mtime and size.
+
+    :raises FileNotFoundError: If ``directory`` does not exist
+    :raises NotADirectoryError: If ``directory`` is not a directory
+    """
+    root = Path(directory)
+    # An empty scan of a mistyped path would otherwise plan every remote document for deletion
+    if not root.exists():
+        raise FileNotFoundError(f"Sync directory {str(root)!r} does not exist")
+    if not root.is_dir():
+        raise NotADirectoryError(f"Sync directory {str(root)!r} is not a directory")
+    loop = asyncio.get_running_loop()
+    files: Dict[str, Tuple[Path, str]] = {}
+    for path in sorted(root.glob(pattern)):
+        if not path.is_file():
+            continue
+        document = path.relative_to(root).as_posix()
+        stat = path.stat()
+        sha256 = manifest.cached_hash(group_name, document, stat.st_mtime_ns, stat.st_size)
+        if sha256 is None:
+            sha256 = await loop.run_in_executor(None, _hash_file, path)
+            manifest.record_hash(group_name, document, stat.st_mtime_ns, stat.st_size, sha256)
+        files[document] = (path, sha256)
+    return files
+
+
+def plan_sync(
+    local: Dict[str, str],
+    remote: Iterable[str],
+    synced: Dict[str, Optional[str]],
+    delete_missing: bool = False,
+) -> SyncPlan:
+    """
+    Diff local documents (name -> sha256) against the documents Criadex lists.
+
+    A document present on both sides is only updated when its hash differs from the one last synced
+    (or was never recorded as synced). Remote-only documents are only planned for deletion with
+    ``delete_missing``.
+    """
+    remote_names = set(remote)
+    plan = SyncPlan()
+    for document, sha256 in sorted(local.items()):
+        if document not in remote_names:
+            plan.upload.append(document)
+        elif synced.get(document) == sha256:
+            plan.unchanged.append(document)
+        else:
+            plan.update.append(document)
+    if delete_missing:
+        plan.delete = sorted(remote_names - set(local))
+    return plan
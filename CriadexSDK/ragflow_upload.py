@@ -0,0 +1,101 @@
+"""
+Streamed multipart upload bodies with bounded memory.
+"""
+
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Union
+import asyncio
+import os
+import secrets
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", " ").replace("\n", " ")
+
+
+class MultipartUpload:
+    """
+    A ``multipart/form-data`` body whose file part is read ``chunk_size`` bytes at a time.
+
+    A file path source is re-opened on every iteration, so the body can be resent on retry and its
+    ``Content-Length`` is known up front. An async byte stream can only be sent once.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, "os.PathLike[str]", AsyncIterable[bytes]],
+        file_name: str,
+        fields: Optional[Dict[str, str]] = None,
+        content_type: str = "application/octet-stream",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self._source = source
+        self._chunk_size = chunk_size
+        self.boundary = secrets.token_hex(16)
+        self.replayable = isinstance(source, (str, os.PathLike))
+        self._consumed = False
+        self._preamble = self._encode_fields(fields or {}) + (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{_quote(file_name)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._epilogue = f"\r\n--{self.boundary}--\r\n".encode()
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def content_length(self) -> Optional[int]:
+        """Total body size when the source is a file, else ``None`` (sent chunked)."""
+        if not self.replayable:
+            return None
+        return len(self._preamble) + os.path.getsize(self._source) + len(self._epilogue)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"content-type": self.content_type}
+        length = self.content_length
+        if length is not None:
+            headers["content-length"] = str(length)
+        return headers
+
+    def _encode_fields(self, fields: Dict[str, str]) -> bytes:
+        parts: List[bytes] = []
+        for name, value in fields.items():
+            parts.append(
+                (
+                    f"--{self.boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'
+                    f"{value}\r\n"
+                ).encode()
+            )
+        return b"".join(parts)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if not self.replayable:
+            if self._consumed:
+                raise RuntimeError("An async byte stream upload can only be sent once")
+            self._consumed = True
+        yield self._preamble
+        if self.replayable:
+            async for chunk in _read_file(self._source, self._chunk_size):
+                yield chunk
+        else:
+            async for chunk in self._source:
+                yield chunk
+        yield self._epilogue
+
+
+async def _read_file(path: Union[str, "os.PathLike[str]"], chunk_size: int) -> AsyncIterator[bytes]:
+    """Read ``path`` in ``chunk_size`` pieces off the event loop; at most one chunk is held at a time."""
+    loop = asyncio.get_running_loop()
+    handle = await loop.run_in_executor(None, open, path, "rb")
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, handle.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        handle.close()
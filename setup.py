@@ -15,6 +15,15 @@ setuptools.setup(
         "pydantic>=2.5.1"  # Connecting to websocket server
     ],
     extras_require={
+        "http2": [
+            "httpx[http2]",  # HTTP/2 multiplexing on the connection pool
+        ],
+        "compression": [
+            "httpx[brotli,zstd]>=0.27.1",  # br/zstd response decoding (zstd needs httpx 0.27.1+) and zstd request compression
+        ],
+        "fastjson": [
+            "orjson",  # Faster request encoding / response decoding
+        ],
         "tests": [
             "pytest",
             "pytest-cov",
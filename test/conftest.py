@@ -1,3 +1,50 @@
 # conftest.py
 
 import pytest
+from unittest.mock import MagicMock, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK
+import httpx
+
+
+@pytest.fixture
+def ok_response():
+    """Build a mocked ``httpx.Response`` whose JSON body is ``payload``."""
+
+    def build(payload):
+        mock_response = AsyncMock()
+        mock_response.status_code = 200
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json = MagicMock(return_value=payload)
+        return mock_response
+
+    return build
+
+
+@pytest.fixture
+def error_response():
+    """Build a mocked ``httpx.Response`` whose ``raise_for_status`` fails with ``status_code``."""
+
+    def build(status_code, headers=None):
+        mock_response = AsyncMock()
+        mock_response.status_code = status_code
+        mock_response.raise_for_status = MagicMock(
+            side_effect=httpx.HTTPStatusError(
+                message="error", request=MagicMock(), response=httpx.Response(status_code, headers=headers)
+            )
+        )
+        return mock_response
+
+    return build
+
+
+@pytest.fixture
+def mock_sdk():
+    """Build a RAGFlowSDK whose requests are answered by the ``httpx.MockTransport`` handler ``handler``."""
+
+    def build(handler, api_key=None, **options):
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", transport=httpx.MockTransport(handler), **options)
+        if api_key is not None:
+            sdk.authenticate(api_key)
+        return sdk
+
+    return build
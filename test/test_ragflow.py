@@ -812,4 +812,128 @@ class TestNegativeCases:
         """Test SDK initialization with custom max retries."""
         sdk = RAGFlowSDK(api_base="http://localhost:8000", max_retries=5)
         assert sdk._max_retries == 5
-        assert sdk.content._max_retries == 5
\ No newline at end of file
+        assert sdk.content._max_retries == 5
+
+class TestConnectionPool:
+    """Tests for connection pool and transport configuration."""
+
+    def test_pool_limits_applied(self):
+        sdk = RAGFlowSDK(
+            api_base="http://localhost:8000",
+            max_connections=250,
+            max_keepalive_connections=50,
+            keepalive_expiry=30.0,
+        )
+        pool = sdk._httpx._transport._pool
+        assert pool._max_connections == 250
+        assert pool._max_keepalive_connections == 50
+        assert pool._keepalive_expiry == 30.0
+
+    @pytest.mark.asyncio
+    async def test_shared_transport_survives_client_close(self):
+        inner = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+        inner.aclose = AsyncMock()
+        from CriadexSDK.ragflow_sdk import SharedTransport
+        transport = SharedTransport(inner)
+        sdk1 = RAGFlowSDK(api_base="http://localhost:8000", transport=transport)
+        sdk2 = RAGFlowSDK(api_base="http://localhost:8000", transport=transport)
+
+        assert await sdk1.manage.about("test_group") == {"ok": True}
+        await sdk1._httpx.aclose()
+        assert await sdk2.manage.about("test_group") == {"ok": True}
+        inner.aclose.assert_not_called()
+
+        await transport.close_pool()
+        inner.aclose.assert_called_once()
+
+
+class TestLifecycle:
+    """Tests for connection warm-up, keepalive and client shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_warmup_opens_connections(self):
+        seen = []
+
+        def handler(request):
+            seen.append((request.method, str(request.url)))
+            return httpx.Response(405)
+
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", transport=httpx.MockTransport(handler))
+        opened = await sdk.warmup(connections=3)
+        assert opened == 3
+        assert seen == [("HEAD", "http://localhost:8000/")] * 3
+
+    @pytest.mark.asyncio
+    async def test_warmup_counts_failures(self):
+        def handler(request):
+            raise httpx.ConnectError("Connection failed")
+
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", transport=httpx.MockTransport(handler))
+        assert await sdk.warmup(connections=2) == 0
+
+    @pytest.mark.asyncio
+    async def test_context_manager_stops_keepalive_and_closes(self):
+        async with RAGFlowSDK(api_base="http://localhost:8000") as sdk:
+            sdk.start_keepalive(interval=60)
+            task = sdk._keepalive_task
+            assert task is not None and not task.done()
+        assert task.cancelled()
+        assert sdk._keepalive_task is None
+        assert sdk._httpx.is_closed
+
+
+class TestTypedResponses:
+    """Tests for typed responses parsed directly from bytes."""
+
+    SEARCH_RESPONSE = {
+        "nodes": [
+            {
+                "node": {"metadata": {}, "class_name": "TextNode", "text": "Due Friday", "text_template": "", "metadata_template": ""},
+                "score": 0.9,
+            }
+        ],
+        "assets": [],
+        "search_units": 1,
+    }
+
+    @staticmethod
+    def _sdk(payload, **kwargs):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+        return RAGFlowSDK(api_base="http://localhost:8000", transport=transport, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_client_wide_typed_responses(self):
+        from CriadexSDK.ragflow_schemas import GroupSearchResponse
+        sdk = self._sdk(self.SEARCH_RESPONSE, typed_responses=True)
+        result = await sdk.content.search("test_group", {"prompt": "when is it due"})
+        assert isinstance(result, GroupSearchResponse)
+        assert result.nodes[0].node.text == "Due Friday"
+
+    @pytest.mark.asyncio
+    async def test_per_call_typed_responses(self):
+        from CriadexSDK.ragflow_schemas import AuthCheckResponse
+        sdk = self._sdk({"api_key": "abc", "master": False, "authorized": True})
+        assert await sdk.auth.check("abc") == {"api_key": "abc", "master": False, "authorized": True}
+        typed = await sdk.auth.with_options(typed=True).check("abc")
+        assert isinstance(typed, AuthCheckResponse)
+        assert typed.authorized is True
+
+    @pytest.mark.asyncio
+    async def test_typed_opt_out_per_call(self):
+        sdk = self._sdk({"files": ["a.txt"]}, typed_responses=True)
+        assert await sdk.content.with_options(typed=False).list("test_group") == {"files": ["a.txt"]}
+
+    @pytest.mark.asyncio
+    async def test_untyped_endpoints_return_dicts(self):
+        sdk = self._sdk({"models": []}, typed_responses=True)
+        assert await sdk.models.list() == {"models": []}
+
+    @pytest.mark.asyncio
+    async def test_typed_search_through_cache(self):
+        from CriadexSDK.ragflow_cache import SearchCache
+        from CriadexSDK.ragflow_schemas import GroupSearchResponse
+        sdk = self._sdk(self.SEARCH_RESPONSE, typed_responses=True, search_cache=SearchCache())
+        first = await sdk.content.search("test_group", {"prompt": "due"})
+        second = await sdk.content.search("test_group", {"prompt": "due"})
+        assert isinstance(second, GroupSearchResponse)
+        assert second == first
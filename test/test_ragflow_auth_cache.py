@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexAPIError
+from CriadexSDK.ragflow_cache import AuthCache
+from CriadexSDK.ragflow_schemas import AuthCheckResponse, GroupAuthCheckResponse
+import httpx
+
+
+@pytest.fixture
+def cache():
+    return AuthCache(ttl=30.0, negative_ttl=5.0)
+
+
+@pytest.fixture
+def sdk(cache):
+    return RAGFlowSDK(api_base="http://localhost:8000", auth_cache=cache)
+
+
+class TestAuthCache:
+    """Tests for the AuthCache itself."""
+
+    def test_negative_results_use_shorter_ttl(self, cache):
+        with patch("CriadexSDK.ragflow_cache.time.monotonic", return_value=100.0):
+            cache.put("good", None, {"authorized": True, "master": False}, cache.generation("good"))
+            cache.put("bad", "group", {"authorized": False, "master": False}, cache.generation("bad"))
+        with patch("CriadexSDK.ragflow_cache.time.monotonic", return_value=110.0):
+            assert cache.get("good").value() == {"authorized": True, "master": False}
+            assert cache.get("bad", "group") is None
+
+    def test_put_after_invalidation_is_dropped(self, cache):
+        generation = cache.generation("key")
+        cache.invalidate_key("key")
+        cache.put("key", None, {"authorized": True}, generation)
+        assert cache.get("key") is None
+
+    def test_group_index_answers_known_groups(self, cache):
+        cache.index_groups("key", ["group1", "group2"], cache.generation("key"))
+        assert cache.get("key", "group1").value(GroupAuthCheckResponse).authorized is True
+        assert cache.get("key", "other") is None
+
+    def test_index_from_typed_listing_without_names_is_ignored(self, cache):
+        cache.index_groups("key", {"indexes": [{"id": 1}]}, cache.generation("key"))
+        assert cache.get("key", "group1") is None
+
+
+class TestCachedAuthChecks:
+    """Tests for auth checks served through RAGFlowSDK."""
+
+    @pytest.mark.asyncio
+    async def test_auth_check_cached(self, ok_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"api_key": "key", "master": True, "authorized": True})
+            first = await sdk.auth.check("key")
+            second = await sdk.auth.with_options(typed=True).check("key")
+            assert mock_request.call_count == 1
+        assert first == {"api_key": "key", "master": True, "authorized": True}
+        assert isinstance(second, AuthCheckResponse)
+
+    @pytest.mark.asyncio
+    async def test_404_is_negatively_cached(self, error_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = error_response(404)
+            for _ in range(2):
+                with pytest.raises(CriadexAPIError) as excinfo:
+                    await sdk.auth.check("missing")
+                assert excinfo.value.status_code == 404
+            assert mock_request.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_create_clears_negative_entry(self, error_response, ok_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = error_response(404)
+            with pytest.raises(CriadexAPIError):
+                await sdk.auth.check("new")
+            mock_request.return_value = ok_response({"api_key": "new", "master": False, "authorized": True})
+            await sdk.auth.create("new", {"master": False})
+            assert (await sdk.auth.check("new"))["authorized"] is True
+            assert mock_request.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_not_cached(self, error_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = error_response(400)
+            for _ in range(2):
+                with pytest.raises(CriadexAPIError):
+                    await sdk.auth.check("key")
+            assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mutate", [
+        lambda sdk: sdk.auth.delete("key"),
+        lambda sdk: sdk.auth.reset("key", "new"),
+        lambda sdk: sdk.group_auth.create("group", "key"),
+        lambda sdk: sdk.group_auth.delete("group", "key"),
+    ])
+    async def test_mutations_invalidate(self, ok_response, sdk, mutate):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"authorized": True, "master": False})
+            await sdk.group_auth.check("group", "key")
+            await mutate(sdk)
+            await sdk.group_auth.check("group", "key")
+            assert mock_request.call_count == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("typed", [False, True])
+    async def test_list_builds_index(self, mock_sdk, cache, typed):
+        requests = []
+
+        def group(group_id, name):
+            return {
+                "id": group_id, "name": name, "created": "2024-01-01", "type": "DOCUMENT",
+                "llm_model_id": 1, "embedding_model_id": 2, "rerank_model_id": 3,
+            }
+
+        def handler(request):
+            requests.append(request.url.path)
+            return httpx.Response(200, json={"indexes": [group(1, "group1"), group(2, "group2")]})
+
+        sdk = mock_sdk(handler, auth_cache=cache, typed_responses=typed)
+        await sdk.group_auth.list("key")
+        result = await sdk.group_auth.check("group2", "key")
+        assert requests == ["/auth/keys/key/groups"]
+        assert (result.authorized if typed else result["authorized"]) is True
@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexAPIError, CriadexCircuitOpenError, CriadexNetworkError
+from CriadexSDK.ragflow_breaker import BreakerState, CircuitBreaker, CircuitBreakerRegistry, endpoint_family
+
+
+class TestEndpointFamily:
+    """Tests for endpoint family classification."""
+
+    @pytest.mark.parametrize(
+        "path, family",
+        [
+            ("/groups/g/query", "content"),
+            ("/groups/g/content/upload", "content"),
+            ("/groups/g/graph_search", "graph"),
+            ("/groups/g/about", "groups"),
+            ("/models/ragflow/m/agents/chat", "agents"),
+            ("/models/m/rerank", "agents"),
+            ("/ragflow/chats/c/ensure", "agents"),
+            ("/models/azure/m/about", "models"),
+            ("/auth/key/check", "auth"),
+            ("/group_auth/g/check", "auth"),
+        ],
+    )
+    def test_families(self, path, family):
+        assert endpoint_family(f"http://localhost:8000{path}") == family
+
+    def test_api_base_path_prefix_is_ignored(self):
+        assert endpoint_family("http://host/api/v1/groups/g/query") == "content"
+        assert endpoint_family("http://host/api/v1/models/ragflow/m/rerank") == "agents"
+        assert endpoint_family("http://host/api/v1/auth/key/check") == "auth"
+        registry = CircuitBreakerRegistry()
+        assert registry.get("http://host/api/groups/g/query") is not registry.get("http://host/api/models/azure/m/about")
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_half_opens_and_closes(self):
+        events = []
+        breaker = CircuitBreaker(("content", "h"), failure_threshold=2, recovery_timeout=10.0, on_transition=events.append)
+        with patch("CriadexSDK.ragflow_breaker.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+            assert breaker.state is BreakerState.CLOSED
+            breaker.record_failure()
+            assert breaker.state is BreakerState.OPEN
+            assert not breaker.allow()
+        with patch("CriadexSDK.ragflow_breaker.time.monotonic", return_value=11.0):
+            assert breaker.allow()
+            assert breaker.state is BreakerState.HALF_OPEN
+            assert not breaker.allow()  # only one probe at a time
+            breaker.record_success()
+            assert breaker.state is BreakerState.CLOSED
+        assert [event.new_state for event in events] == [BreakerState.OPEN, BreakerState.HALF_OPEN, BreakerState.CLOSED]
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(("content", "h"), failure_threshold=1, recovery_timeout=10.0)
+        with patch("CriadexSDK.ragflow_breaker.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+        with patch("CriadexSDK.ragflow_breaker.time.monotonic", return_value=11.0):
+            assert breaker.allow()
+            breaker.record_failure()
+            assert breaker.state is BreakerState.OPEN
+
+
+class TestBreakerIntegration:
+    """Tests for fast-failing through the SDK."""
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast_per_family(self, error_response, ok_response):
+        registry = CircuitBreakerRegistry(failure_threshold=3, recovery_timeout=60.0)
+        events = []
+        registry.subscribe(events.append)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", circuit_breakers=registry)
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = error_response(503)
+            with patch('asyncio.sleep', new_callable=AsyncMock):
+                with pytest.raises(CriadexAPIError):
+                    await sdk.content.search("test_group", {"prompt": "hello"})
+                assert mock_request.call_count == 3
+
+                with pytest.raises(CriadexCircuitOpenError) as excinfo:
+                    await sdk.content.search("test_group", {"prompt": "hello"})
+                assert isinstance(excinfo.value, CriadexNetworkError)
+                assert mock_request.call_count == 3
+
+            # Other endpoint families are unaffected
+            mock_request.return_value = ok_response({"authorized": True})
+            assert await sdk.auth.check("key") == {"authorized": True}
+
+        assert registry.states()[("content", "localhost:8000")] is BreakerState.OPEN
+        assert events[0].new_state is BreakerState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip_breaker(self, error_response):
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", circuit_breakers=registry)
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = error_response(404)
+            for _ in range(3):
+                with pytest.raises(CriadexAPIError):
+                    await sdk.manage.about("missing")
+            assert mock_request.call_count == 3
+        assert registry.states()[("groups", "localhost:8000")] is BreakerState.CLOSED
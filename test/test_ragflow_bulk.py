@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexAPIError
+from CriadexSDK.ragflow_schemas import ContentUploadConfig
+from CriadexSDK.ragflow_bulk import run_bulk
+import httpx
+
+
+@pytest.fixture
+def sdk():
+    return RAGFlowSDK(api_base="http://localhost:8000")
+
+
+def _response(payload=None, status_code=None):
+    mock_response = AsyncMock()
+    if status_code is not None:
+        mock_response.raise_for_status = MagicMock(
+            side_effect=httpx.HTTPStatusError(
+                message="error", request=MagicMock(), response=httpx.Response(status_code)
+            )
+        )
+    else:
+        mock_response.raise_for_status = MagicMock()
+    mock_response.json = MagicMock(return_value=payload)
+    return mock_response
+
+
+class TestBulkContent:
+    """Tests for bulk content operations."""
+
+    @pytest.mark.asyncio
+    async def test_upload_many_aggregates_token_usage(self, sdk):
+        files = [
+            ContentUploadConfig(file_name=f"doc{i}.txt", file_contents={}, file_metadata={})
+            for i in range(5)
+        ]
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = _response({"token_usage": 10})
+            result = await sdk.content.upload_many("test_group", files, concurrency=2)
+            assert mock_request.call_count == 5
+            assert result.succeeded == 5
+            assert result.failed == 0
+            assert result.token_usage == 50
+            assert [item.key for item in result.items] == [f"doc{i}.txt" for i in range(5)]
+            # Pydantic configs are serialized once to bytes
+            assert mock_request.call_args_list[0].kwargs["content"] == files[0].model_dump_json().encode()
+
+    @pytest.mark.asyncio
+    async def test_typed_results_aggregate_token_usage(self):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"token_usage": 7}))
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", transport=transport, typed_responses=True)
+        files = [{"file_name": f"doc{i}.txt", "file_contents": {}, "file_metadata": {}} for i in range(3)]
+        result = await sdk.content.upload_many("test_group", files)
+        assert result.succeeded == 3
+        assert result.token_usage == 21
+
+    @pytest.mark.asyncio
+    async def test_uncaught_error_unwinds_workers_first(self):
+        unwound = []
+
+        async def operation(item):
+            if item == 0:
+                await asyncio.sleep(0)
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(10)
+            finally:
+                unwound.append(item)
+
+        with pytest.raises(RuntimeError):
+            await run_bulk(range(3), operation, key=str, concurrency=3, catch=(ValueError,))
+        assert sorted(unwound) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_failures_reported_per_item(self, sdk):
+        async def request(method, url, **kwargs):
+            if kwargs["json"]["file_name"] == "bad.txt":
+                return _response(status_code=400)
+            return _response({"token_usage": 1})
+
+        files = [{"file_name": name} for name in ("a.txt", "bad.txt", "c.txt")]
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)):
+            result = await sdk.content.update_many("test_group", files)
+            assert result.succeeded == 2
+            assert result.failed == 1
+            assert result.token_usage == 2
+            assert [item.key for item in result.errors] == ["bad.txt"]
+            assert isinstance(result.errors[0].error, CriadexAPIError)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, sdk):
+        in_flight = 0
+        peak = 0
+
+        async def request(method, url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return _response({})
+
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)):
+            result = await sdk.content.delete_many("test_group", (f"doc{i}" for i in range(20)), concurrency=3)
+            assert result.succeeded == 20
+            assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_async_iterable_and_progress(self, sdk):
+        async def names():
+            for i in range(4):
+                yield f"doc{i}"
+
+        progress = []
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = _response({})
+            result = await sdk.content.delete_many(
+                "test_group",
+                names(),
+                on_progress=lambda item, summary: progress.append(summary.completed),
+            )
+            assert result.succeeded == 4
+            assert progress == [1, 2, 3, 4]
+            assert mock_request.call_args_list[0].kwargs["params"] == {"document_name": "doc0"}
@@ -0,0 +1,146 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexAPIError
+from CriadexSDK.ragflow_cache import SearchCache
+from CriadexSDK.ragflow_schemas import SearchGroupConfig
+import httpx
+
+
+@pytest.fixture
+def cache():
+    return SearchCache(ttl=60.0, max_entries=8)
+
+
+@pytest.fixture
+def sdk(cache):
+    return RAGFlowSDK(api_base="http://localhost:8000", search_cache=cache)
+
+
+class TestSearchCache:
+    """Tests for the search result cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_served_from_cache(self, ok_response, sdk, cache):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"nodes": [], "assets": []})
+            first = await sdk.content.search("test_group", {"prompt": "when is assignment 3 due"})
+            second = await sdk.content.search("test_group", {"prompt": "when is assignment 3 due"})
+            assert first == second == {"nodes": [], "assets": []}
+            assert mock_request.call_count == 1
+            assert cache.stats.hits == 1
+            assert cache.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_dict_and_model_configs_share_key(self, ok_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"nodes": []})
+            await sdk.content.search("test_group", {"prompt": "hello"})
+            await sdk.content.search("test_group", SearchGroupConfig(prompt="hello").model_dump())
+            assert mock_request.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_hits_return_independent_copies(self, ok_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"nodes": []})
+            first = await sdk.content.search("test_group", {"prompt": "hello"})
+            first["nodes"].append("mutated")
+            second = await sdk.content.search("test_group", {"prompt": "hello"})
+            assert second == {"nodes": []}
+
+    @pytest.mark.parametrize(
+        "sdk_method, args",
+        [
+            ("upload", [{"file_name": "test.txt"}]),
+            ("update", [{"file_name": "test.txt"}]),
+            ("delete", ["test.txt"]),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_group(self, ok_response, sdk, cache, sdk_method, args):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"nodes": []})
+            await sdk.content.search("test_group", {"prompt": "hello"})
+            await sdk.content.search("other_group", {"prompt": "hello"})
+            await getattr(sdk.content, sdk_method)("test_group", *args)
+            await sdk.content.search("test_group", {"prompt": "hello"})
+            await sdk.content.search("other_group", {"prompt": "hello"})
+            # 2 initial searches + write + re-fetch for test_group only
+            assert mock_request.call_count == 4
+            assert cache.stats.invalidations == 1
+
+    @pytest.mark.asyncio
+    async def test_write_to_extra_group_invalidates(self, ok_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"nodes": []})
+            config = {"prompt": "hello", "extra_groups": ["section_b"]}
+            await sdk.content.search("section_a", config)
+            await sdk.content.upload("section_b", {"file_name": "test.txt"})
+            await sdk.content.search("section_a", config)
+            assert mock_request.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_graph_search_cached_separately(self, ok_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"nodes": [], "assets": []})
+            await sdk.manage.graph_search("test_group", {"query": "midterm"})
+            await sdk.manage.graph_search("test_group", {"query": "midterm"})
+            await sdk.content.search("test_group", {"prompt": "midterm"})
+            assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_other_api_key_misses(self, cache, mock_sdk):
+        def handler(request):
+            if request.headers.get("x-api-key") != "good":
+                return httpx.Response(403, text="forbidden")
+            return httpx.Response(200, json={"nodes": [], "assets": []})
+
+        good = mock_sdk(handler, api_key="good", search_cache=cache, max_retries=1)
+        bad = mock_sdk(handler, api_key="bad", search_cache=cache, max_retries=1)
+        assert await good.content.search("test_group", {"prompt": "hello"}) == {"nodes": [], "assets": []}
+        with pytest.raises(CriadexAPIError) as excinfo:
+            await bad.content.search("test_group", {"prompt": "hello"})
+        assert excinfo.value.status_code == 403
+        # The same client switching keys does not see the previous key's entries either
+        good.authenticate("bad")
+        with pytest.raises(CriadexAPIError):
+            await good.content.search("test_group", {"prompt": "hello"})
+        assert cache.stats.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses(self, ok_response, sdk):
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"nodes": []})
+            await sdk.content.search("test_group", {"prompt": "hello"})
+            await sdk.content.search("test_group", {"prompt": "hello"}, use_cache=False)
+            assert mock_request.call_count == 2
+
+    def test_ttl_expiry(self):
+        cache = SearchCache(ttl=10.0)
+        key = cache.make_key("query", "g", "{}")
+        with patch("CriadexSDK.ragflow_cache.time.monotonic", return_value=100.0):
+            cache.put(key, {"nodes": []}, ("g",), cache.generation(("g",)))
+            assert cache.get(key) == {"nodes": []}
+        with patch("CriadexSDK.ragflow_cache.time.monotonic", return_value=111.0):
+            assert cache.get(key) is None
+        assert cache.stats.entries == 0
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        cache = SearchCache(max_entries=2)
+        for i in range(3):
+            cache.put(cache.make_key("query", "g", str(i)), {"i": i}, ("g",), cache.generation(("g",)))
+        assert cache.get(cache.make_key("query", "g", "0")) is None
+        assert cache.stats.evictions == 1
+
+        cache = SearchCache(max_bytes=20)
+        cache.put(cache.make_key("query", "g", "a"), {"v": "x" * 5}, ("g",), (0,))
+        cache.put(cache.make_key("query", "g", "b"), {"v": "y" * 5}, ("g",), (0,))
+        assert cache.stats.bytes <= 20
+        assert cache.get(cache.make_key("query", "g", "b")) == {"v": "yyyyy"}
+
+    def test_stale_put_after_invalidation_is_dropped(self):
+        cache = SearchCache()
+        key = cache.make_key("query", "g", "{}")
+        generation = cache.generation(("g",))
+        cache.invalidate_group("g")
+        cache.put(key, {"nodes": []}, ("g",), generation)
+        assert cache.get(key) is None
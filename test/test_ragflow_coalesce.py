@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexAPIError
+from CriadexSDK.ragflow_coalesce import RequestCoalescer
+import httpx
+
+
+@pytest.fixture
+def coalescer():
+    return RequestCoalescer()
+
+
+@pytest.fixture
+def sdk(coalescer):
+    return RAGFlowSDK(api_base="http://localhost:8000", coalescer=coalescer)
+
+
+def _slow_request(payload, delay=0.01):
+    async def request(*args, **kwargs):
+        await asyncio.sleep(delay)
+        mock_response = AsyncMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json = MagicMock(return_value=payload)
+        return mock_response
+    return request
+
+
+class TestRequestCoalescing:
+    """Tests for single-flight request coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_identical_searches_share_one_call(self, sdk, coalescer):
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=_slow_request({"nodes": []}))) as mock_request:
+            results = await asyncio.gather(
+                *(sdk.content.search("test_group", {"prompt": "hello"}) for _ in range(10))
+            )
+            assert results == [{"nodes": []}] * 10
+            assert mock_request.call_count == 1
+            assert coalescer.stats.calls == 10
+            assert coalescer.stats.executed == 1
+            assert coalescer.stats.coalesced == 9
+            assert coalescer.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_get_requests_coalesced(self, sdk):
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=_slow_request({"models": []}))) as mock_request:
+            await asyncio.gather(sdk.models.list(), sdk.models.list(), sdk.manage.about("g"), sdk.manage.about("g"))
+            assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_different_requests_not_coalesced(self, sdk):
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=_slow_request({"nodes": []}))) as mock_request:
+            await asyncio.gather(
+                sdk.content.search("test_group", {"prompt": "hello"}),
+                sdk.content.search("test_group", {"prompt": "goodbye"}),
+                sdk.content.search("other_group", {"prompt": "hello"}),
+            )
+            assert mock_request.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_never_coalesced(self, sdk):
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=_slow_request({"status": "ok"}))) as mock_request:
+            await asyncio.gather(
+                sdk.content.upload("test_group", {"file_name": "a.txt"}),
+                sdk.content.upload("test_group", {"file_name": "a.txt"}),
+            )
+            assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_shared_with_waiters(self, sdk):
+        async def request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            mock_response = AsyncMock()
+            mock_response.raise_for_status = MagicMock(
+                side_effect=httpx.HTTPStatusError(message="Not Found", request=MagicMock(), response=httpx.Response(404))
+            )
+            return mock_response
+
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)) as mock_request:
+            results = await asyncio.gather(
+                sdk.manage.about("missing"), sdk.manage.about("missing"), return_exceptions=True
+            )
+            assert all(isinstance(result, CriadexAPIError) for result in results)
+            assert mock_request.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self, coalescer):
+        started = asyncio.Event()
+
+        async def call():
+            started.set()
+            await asyncio.sleep(0.01)
+            return "done"
+
+        first = asyncio.ensure_future(coalescer.run("key", call))
+        await started.wait()
+        second = asyncio.ensure_future(coalescer.run("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
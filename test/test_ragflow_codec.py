@@ -0,0 +1,97 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK
+from CriadexSDK.ragflow_codec import JSONCodec, StdlibCodec, get_codec
+from CriadexSDK.ragflow_schemas import GraphSearchConfig, GroupCreateConfig
+import httpx
+
+
+class RecordingCodec(StdlibCodec):
+    name = "recording"
+
+    def __init__(self):
+        self.dumped = 0
+        self.loaded = 0
+
+    def dumps(self, obj):
+        self.dumped += 1
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+
+class TestCodecSelection:
+    """Tests for JSON codec resolution."""
+
+    def test_auto_prefers_installed_fast_codec(self):
+        codec = get_codec("auto")
+        assert isinstance(codec, JSONCodec)
+        assert codec.loads(codec.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+
+    def test_auto_falls_back_to_stdlib(self):
+        with patch.dict("sys.modules", {"orjson": None, "msgspec": None}):
+            assert get_codec("auto").name == "stdlib"
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            get_codec("simdjson")
+
+    def test_codec_instance_passed_through(self):
+        codec = RecordingCodec()
+        assert get_codec(codec) is codec
+
+
+class TestCodecRequests:
+    """Tests for request encoding and response decoding through a codec."""
+
+    @pytest.mark.asyncio
+    async def test_dict_body_encoded_once_across_retries(self):
+        codec = RecordingCodec()
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", json_codec=codec)
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_response = AsyncMock()
+            mock_response.raise_for_status = MagicMock(
+                side_effect=httpx.HTTPStatusError(message="error", request=MagicMock(), response=httpx.Response(500))
+            )
+            mock_request.return_value = mock_response
+            with patch('asyncio.sleep', new_callable=AsyncMock):
+                with pytest.raises(Exception):
+                    await sdk.content.upload("test_group", {"file_name": "test.txt"})
+            assert mock_request.call_count == 3
+            assert codec.dumped == 1
+            for call in mock_request.call_args_list:
+                assert json.loads(call.kwargs["content"]) == {"file_name": "test.txt"}
+                assert call.kwargs["headers"]["content-type"] == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_response_decoded_with_codec(self):
+        codec = RecordingCodec()
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"files": ["a.txt"]}))
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", json_codec=codec, transport=transport)
+        assert await sdk.content.list("test_group") == {"files": ["a.txt"]}
+        assert codec.loaded == 1
+
+    @pytest.mark.parametrize(
+        "router, method, config",
+        [
+            ("manage", "create", GroupCreateConfig(type="vector", llm_model_id=1, embedding_model_id=2, rerank_model_id=3)),
+            ("manage", "graph_search", GraphSearchConfig(query="midterm", max_hops=2)),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_pydantic_configs_use_model_dump_json(self, mock_sdk, router, method, config):
+        seen = {}
+
+        def handler(request):
+            seen["content"] = request.content
+            seen["content_type"] = request.headers["content-type"]
+            return httpx.Response(200, json={"nodes": [], "assets": []})
+
+        sdk = mock_sdk(handler)
+        with patch.object(type(config), "model_dump", side_effect=AssertionError("model_dump should not be used")):
+            await getattr(getattr(sdk, router), method)("test_group", config)
+        assert seen["content"] == config.model_dump_json().encode()
+        assert seen["content_type"] == "application/json"
@@ -0,0 +1,88 @@
+import gzip
+import json
+import pytest
+from unittest.mock import patch
+from CriadexSDK.ragflow_compression import CompressionPolicy, accept_encoding
+import httpx
+
+
+class _Server:
+    """MockTransport handler that decodes gzip request bodies and gzips its responses."""
+
+    def __init__(self, response_payload):
+        self.response_payload = response_payload
+        self.requests = []
+        self.bodies = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        body = request.content
+        if request.headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.bodies.append(json.loads(body) if body else None)
+        payload = gzip.compress(json.dumps(self.response_payload).encode())
+        return httpx.Response(200, stream=httpx.ByteStream(payload), headers={"content-encoding": "gzip"})
+
+
+class TestCompressionPolicy:
+    """Tests for the compression policy itself."""
+
+    def test_threshold_and_incompressible_bodies(self):
+        policy = CompressionPolicy(threshold=100)
+        assert policy.compress(b"x" * 99) is None
+        body, encoding = policy.compress(b"x" * 1000)
+        assert encoding == "gzip"
+        assert gzip.decompress(body) == b"x" * 1000
+        assert policy.compress(bytes(range(256))) is None
+
+    def test_unknown_encoding(self):
+        with pytest.raises(ValueError):
+            CompressionPolicy(encoding="lz4")
+
+    def test_accept_encoding_lists_gzip(self):
+        assert accept_encoding().startswith("gzip, deflate")
+
+    def test_accept_encoding_follows_httpx_decoders(self):
+        with patch("httpx._decoders.SUPPORTED_DECODERS", {"identity": None, "gzip": None, "deflate": None}):
+            assert accept_encoding() == "gzip, deflate"
+        with patch("httpx._decoders.SUPPORTED_DECODERS", {"gzip": None, "deflate": None, "zstd": None}):
+            assert accept_encoding() == "gzip, deflate, zstd"
+
+
+class TestCompressedRequests:
+    """Tests for compression wired through RAGFlowSDK."""
+
+    @pytest.mark.asyncio
+    async def test_large_upload_is_gzipped(self, mock_sdk):
+        server = _Server({"document_name": "notes.txt"})
+        policy = CompressionPolicy(threshold=512)
+        sdk = mock_sdk(server, compression=policy)
+        upload = {"file_name": "notes.txt", "file_contents": {"nodes": [{"text": "lecture notes " * 200}]}}
+        result = await sdk.content.upload("group", upload)
+        assert result == {"document_name": "notes.txt"}
+        request = server.requests[0]
+        assert request.headers["content-encoding"] == "gzip"
+        assert request.headers["accept-encoding"] == policy.accept_encoding
+        assert server.bodies[0] == upload
+        stats = policy.stats["content"]
+        assert stats.request_wire_bytes < stats.request_bytes
+        assert stats.responses == 1
+
+    @pytest.mark.asyncio
+    async def test_small_body_sent_uncompressed(self, mock_sdk):
+        server = _Server({"nodes": []})
+        policy = CompressionPolicy(threshold=4096)
+        sdk = mock_sdk(server, compression=policy)
+        await sdk.content.search("group", {"prompt": "when is the midterm"})
+        assert "content-encoding" not in server.requests[0].headers
+        assert server.bodies[0] == {"prompt": "when is the midterm"}
+
+    @pytest.mark.asyncio
+    async def test_response_savings_recorded(self, mock_sdk):
+        server = _Server({"nodes": [{"text": "a long passage " * 500}]})
+        policy = CompressionPolicy()
+        sdk = mock_sdk(server, compression=policy)
+        await sdk.content.search("group", {"prompt": "x"})
+        stats = policy.stats["content"]
+        assert stats.response_wire_bytes < stats.response_bytes
+        assert stats.bytes_saved > 0
@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexOverloadedError, CriadexSDKError
+from CriadexSDK.ragflow_concurrency import AdaptiveConcurrencyLimiter
+from CriadexSDK.ragflow_breaker import BreakerState, CircuitBreakerRegistry
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Tests for limit adaptation, queueing and shedding."""
+
+    @pytest.mark.asyncio
+    async def test_queue_then_shed(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=0.01)
+        assert await limiter.acquire()
+        assert limiter.in_flight == 1
+        assert not await limiter.acquire()
+        assert limiter.stats.shed == 1
+        assert limiter.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_release_hands_slot_to_waiter(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=5.0)
+        assert await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        limiter.release(0.1)
+        assert await waiter
+        assert limiter.in_flight == 1
+        assert limiter.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_max_queue_sheds_immediately(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_queue=0, queue_timeout=5.0)
+        assert await limiter.acquire()
+        assert not await limiter.acquire()
+
+    @pytest.mark.asyncio
+    async def test_overload_and_slow_latency_decrease_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5, latency_tolerance=2.0)
+        await limiter.acquire()
+        limiter.release(overloaded=True)
+        assert limiter.limit == 5
+        for latency in (0.1, 0.5):
+            await limiter.acquire()
+            limiter.release(latency)
+        assert limiter.limit == 2
+        assert limiter.stats.decreases == 2
+
+    @pytest.mark.asyncio
+    async def test_limit_grows_only_when_saturated(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+        await limiter.acquire()
+        limiter.release(0.1)
+        assert limiter.limit == 2
+        for _ in range(10):
+            await limiter.acquire()
+            await limiter.acquire()
+            limiter.release(0.1)
+            limiter.release(0.1)
+        assert limiter.limit == 3
+
+
+class TestConcurrencyLimitedRequests:
+    """Tests for the concurrency limiter wired through RAGFlowSDK."""
+
+    @pytest.mark.asyncio
+    async def test_shed_call_raises_overloaded(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=0.01)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", concurrency_limiter=limiter)
+        assert await limiter.acquire()
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            with pytest.raises(CriadexOverloadedError):
+                await sdk.models.list()
+            mock_request.assert_not_called()
+        assert issubclass(CriadexOverloadedError, CriadexSDKError)
+
+    @pytest.mark.asyncio
+    async def test_slots_released_after_retries(self, error_response, ok_response):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", concurrency_limiter=limiter)
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [error_response(503), ok_response({"status": "ok"})]
+            with patch('asyncio.sleep', new_callable=AsyncMock):
+                assert await sdk.models.list() == {"status": "ok"}
+        assert limiter.in_flight == 0
+        assert limiter.stats.admitted == 2
+        assert limiter.stats.decreases == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_while_queued_releases_breaker_probe(self, ok_response):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=5.0)
+        breakers = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=0.0)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", concurrency_limiter=limiter, circuit_breakers=breakers)
+        breaker = breakers.get("http://localhost:8000/models/list")
+        breaker.record_failure()
+        assert breaker.state is BreakerState.HALF_OPEN
+        assert await limiter.acquire()
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            probe = asyncio.ensure_future(sdk.models.list())
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            limiter.release()
+            mock_request.return_value = ok_response({"status": "ok"})
+            assert await sdk.models.list() == {"status": "ok"}
+        assert breaker.state is BreakerState.CLOSED
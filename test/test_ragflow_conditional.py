@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from CriadexSDK.ragflow_cache import ValidatorCache
+from CriadexSDK.ragflow_schemas import GraphStatusResponse
+import httpx
+
+
+class _Server:
+    """MockTransport handler that serves a versioned body with an ETag and honours If-None-Match."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.version = 1
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        etag = f'"v{self.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"etag": etag})
+        return httpx.Response(200, json={**self.payload, "version": self.version}, headers={"etag": etag})
+
+
+class TestConditionalRequests:
+    """Tests for ETag revalidation of metadata endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_304_serves_cached_body(self, mock_sdk):
+        server = _Server({"models": []})
+        cache = ValidatorCache()
+        sdk = mock_sdk(server, validator_cache=cache)
+        first = await sdk.models.list()
+        second = await sdk.models.list()
+        assert first == second == {"models": [], "version": 1}
+        assert "if-none-match" not in server.requests[0].headers
+        assert server.requests[1].headers["if-none-match"] == '"v1"'
+        assert cache.stats.not_modified == 1
+        assert cache.stats.bytes_saved > 0
+
+    @pytest.mark.asyncio
+    async def test_changed_resource_is_refetched(self, mock_sdk):
+        server = _Server({"models": []})
+        sdk = mock_sdk(server, validator_cache=ValidatorCache())
+        await sdk.models.list()
+        server.version = 2
+        assert (await sdk.models.list())["version"] == 2
+
+    @pytest.mark.asyncio
+    async def test_typed_response_from_cached_body(self, mock_sdk):
+        def handler(request):
+            if request.headers.get("if-none-match") == '"a"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"group_name": "group"}, headers={"etag": '"a"'})
+
+        sdk = mock_sdk(handler, validator_cache=ValidatorCache(), typed_responses=True)
+        await sdk.manage.graph_status("group")
+        result = await sdk.manage.graph_status("group")
+        assert isinstance(result, GraphStatusResponse)
+        assert result.group_name == "group"
+
+    @pytest.mark.asyncio
+    async def test_non_metadata_endpoints_are_unconditional(self, mock_sdk):
+        server = _Server({"info": None})
+        cache = ValidatorCache()
+        sdk = mock_sdk(server, validator_cache=cache)
+        await sdk.auth.check("key")
+        await sdk.auth.check("key")
+        assert all("if-none-match" not in request.headers for request in server.requests)
+        assert cache.stats.refetched == 0
+
+
+class TestStaleWhileRevalidate:
+    """Tests for serving cached metadata while refreshing it in the background."""
+
+    @pytest.mark.asyncio
+    async def test_stale_body_returned_then_refreshed(self, mock_sdk):
+        server = _Server({"items": []})
+        cache = ValidatorCache(stale_while_revalidate=True)
+        sdk = mock_sdk(server, validator_cache=cache)
+        assert (await sdk.content.list("group"))["version"] == 1
+        server.version = 2
+        # Served from cache immediately; the refresh picks up version 2 in the background
+        assert (await sdk.content.list("group"))["version"] == 1
+        await asyncio.sleep(0.01)
+        assert len(server.requests) == 2
+        assert cache.stats.background_refreshes == 1
+        assert (await sdk.content.list("group"))["version"] == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_group_entries(self, mock_sdk):
+        server = _Server({"files": []})
+        cache = ValidatorCache(stale_while_revalidate=True)
+        sdk = mock_sdk(server, validator_cache=cache)
+        await sdk.content.list("group")
+        await sdk.content.list("other")
+        await sdk.manage.graph_status("group")
+        server.version = 2
+        await sdk.content.upload("group", {"file_name": "a.txt"})
+        # The write dropped this group's cached bodies, so these go to the server
+        assert (await sdk.content.list("group"))["version"] == 2
+        assert (await sdk.manage.graph_status("group"))["version"] == 2
+        assert (await sdk.content.list("other"))["version"] == 1
+
+    @pytest.mark.asyncio
+    async def test_model_writes_invalidate_model_entries(self, mock_sdk):
+        server = _Server({"models": []})
+        cache = ValidatorCache(stale_while_revalidate=True)
+        sdk = mock_sdk(server, validator_cache=cache)
+        await sdk.models.about("m")
+        await sdk.models.list()
+        await sdk.content.list("group")
+        server.version = 2
+        await sdk.models.update("m", {"api_version": "2024-06-01"})
+        assert (await sdk.models.about("m"))["version"] == 2
+        assert (await sdk.models.list())["version"] == 2
+        # Group entries are untouched by a model write
+        assert (await sdk.content.list("group"))["version"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_in_flight_during_write_is_not_stored(self):
+        cache = ValidatorCache()
+        key = ("GET", "http://localhost:8000/groups/group/content/list", None, "{}")
+        generation = cache.generation(key)
+        assert cache.invalidate_group("group") == 0
+        cache.store(key, b"{}", {"etag": '"v1"'}, generation)
+        assert cache.get(key) is None
+        cache.store(key, b"{}", {"etag": '"v1"'}, cache.generation(key))
+        assert cache.get(key) is not None
+        key = ("GET", "http://localhost:8000/models/azure/m/about", None, "{}")
+        generation = cache.generation(key)
+        assert cache.invalidate_prefix("http://localhost:8000/models/") == 0
+        cache.store(key, b"{}", {"etag": '"v1"'}, generation)
+        assert cache.get(key) is None
@@ -0,0 +1,184 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK
+from CriadexSDK.ragflow_fusion import (
+    dedupe_assets,
+    merge_top_k,
+    node_identity,
+    reciprocal_rank_fusion,
+    weighted_score_fusion,
+)
+import httpx
+
+
+@pytest.fixture
+def sdk():
+    return RAGFlowSDK(api_base="http://localhost:8000")
+
+
+def _node(text, score):
+    return {"node": {"text": text}, "score": score}
+
+
+def _asset(uuid):
+    return {"uuid": uuid, "data": ""}
+
+
+def _response(payload=None, status_code=None):
+    mock_response = AsyncMock()
+    if status_code is not None:
+        mock_response.raise_for_status = MagicMock(
+            side_effect=httpx.HTTPStatusError(
+                message="error", request=MagicMock(), response=httpx.Response(status_code)
+            )
+        )
+    else:
+        mock_response.raise_for_status = MagicMock()
+    mock_response.json = MagicMock(return_value=payload)
+    return mock_response
+
+
+class TestMergeHelpers:
+    """Tests for client-side result merging."""
+
+    def test_merge_top_k_orders_by_score(self):
+        merged = merge_top_k([[_node("a", 0.2), _node("b", 0.9)], [_node("c", 0.5)]], limit=2)
+        assert [node["node"]["text"] for node in merged] == ["b", "c"]
+
+    def test_merge_without_limit_keeps_all(self):
+        merged = merge_top_k([[_node("a", 0.2)], [_node("b", 0.9), _node("c", None)]])
+        assert [node["node"]["text"] for node in merged] == ["b", "a", "c"]
+
+    def test_dedupe_assets_by_uuid(self):
+        merged = dedupe_assets([[_asset("1"), _asset("2")], [_asset("2"), _asset("3")]])
+        assert [asset["uuid"] for asset in merged] == ["1", "2", "3"]
+
+
+class TestSearchGroups:
+    """Tests for multi-group fan-out search."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_merges_results(self, sdk):
+        payloads = {
+            "section_a": {"nodes": [_node("a1", 0.4), _node("a2", 0.8)], "assets": [_asset("x")], "search_units": 1},
+            "section_b": {"nodes": [_node("b1", 0.9)], "assets": [_asset("x"), _asset("y")], "search_units": 2},
+        }
+
+        async def request(method, url, **kwargs):
+            assert "extra_groups" not in kwargs["json"]
+            return _response(payloads[url.split("/")[-2]])
+
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)) as mock_request:
+            result = await sdk.content.search_groups(
+                ["section_a", "section_b"], {"prompt": "hello", "top_k": 2, "extra_groups": ["ignored"]}
+            )
+            assert mock_request.call_count == 2
+            assert [node["node"]["text"] for node in result["nodes"]] == ["b1", "a2"]
+            assert [asset["uuid"] for asset in result["assets"]] == ["x", "y"]
+            assert result["search_units"] == 3
+            assert result["metadata"]["partial"] is False
+            assert result["metadata"]["groups"]["section_a"]["status"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_slow_and_failing_groups_return_partial(self, sdk):
+        async def request(method, url, **kwargs):
+            group = url.split("/")[-2]
+            if group == "slow":
+                await asyncio.sleep(1)
+            if group == "broken":
+                return _response(status_code=404)
+            return _response({"nodes": [_node("fast", 0.5)], "assets": []})
+
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)):
+            result = await sdk.content.search_groups(
+                ["fast", "slow", "broken"], {"prompt": "hello"}, per_group_timeout=0.05
+            )
+            groups = result["metadata"]["groups"]
+            assert [node["node"]["text"] for node in result["nodes"]] == ["fast"]
+            assert result["metadata"]["partial"] is True
+            assert groups["slow"]["status"] == "timeout"
+            assert groups["broken"]["status"] == "error"
+            assert "latency_ms" in groups["fast"]
+
+
+def _texts(nodes):
+    return [node["node"]["text"] for node in nodes]
+
+
+class TestFusion:
+    """Tests for rank and score fusion of result lists."""
+
+    def test_node_identity_prefers_id(self):
+        assert node_identity({"node": {"id_": "n1", "text": "a"}}) == "n1"
+        assert node_identity(_node("a", 0.1)) == "a"
+
+    def test_rrf_rewards_nodes_in_both_lists(self):
+        vector = [_node("a", 0.9), _node("b", 0.8), _node("c", 0.7)]
+        graph = [_node("c", 12.0), _node("d", 11.0)]
+        fused = reciprocal_rank_fusion([vector, graph], k=60)
+        assert _texts(fused) == ["c", "a", "b", "d"]
+        assert fused[0]["score"] == pytest.approx(1 / 63 + 1 / 61)
+        # Inputs are left untouched
+        assert graph[0]["score"] == 12.0
+
+    def test_rrf_weights_and_limit(self):
+        fused = reciprocal_rank_fusion([[_node("a", 1)], [_node("b", 1)]], weights=[1.0, 2.0], limit=1)
+        assert _texts(fused) == ["b"]
+
+    def test_weighted_fusion_normalizes_each_list(self):
+        vector = [_node("a", 0.9), _node("b", 0.5)]
+        graph = [_node("b", 40.0), _node("c", 20.0)]
+        fused = weighted_score_fusion([vector, graph], weights=[1.0, 0.5])
+        assert _texts(fused) == ["a", "b", "c"]
+        assert [node["score"] for node in fused] == [1.0, 0.5, 0.0]
+
+    def test_weights_must_match_lists(self):
+        with pytest.raises(ValueError):
+            reciprocal_rank_fusion([[], []], weights=[1.0])
+
+
+class TestHybridSearch:
+    """Tests for vector + graph hybrid search."""
+
+    @pytest.mark.asyncio
+    async def test_both_paths_are_fused(self, sdk):
+        payloads = {
+            "query": {"nodes": [_node("a", 0.9), _node("b", 0.8)], "assets": [_asset("x")], "search_units": 1},
+            "graph_search": {
+                "nodes": [_node("b", 3.0), _node("c", 2.0)],
+                "assets": [_asset("x"), _asset("y")],
+                "graph_metadata": {"status": "BUILT", "source": "graph"},
+            },
+        }
+        bodies = {}
+
+        async def request(method, url, **kwargs):
+            action = url.split("/")[-1]
+            bodies[action] = kwargs["json"]
+            return _response(payloads[action])
+
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)) as mock_request:
+            result = await sdk.manage.hybrid_search("group", {"query": "hello", "top_k": 2})
+            assert mock_request.call_count == 2
+            assert bodies["query"] == {"prompt": "hello", "top_k": 2}
+            assert bodies["graph_search"] == {"query": "hello", "top_k": 2}
+            assert [node["node"]["text"] for node in result["nodes"]] == ["b", "a"]
+            assert [asset["uuid"] for asset in result["assets"]] == ["x", "y"]
+            assert result["metadata"]["fusion"] == "rrf"
+            assert result["metadata"]["partial"] is False
+            assert result["metadata"]["graph_metadata"]["status"] == "BUILT"
+
+    @pytest.mark.asyncio
+    async def test_failed_path_returns_partial(self, sdk):
+        async def request(method, url, **kwargs):
+            if url.endswith("/graph_search"):
+                return _response(status_code=404)
+            return _response({"nodes": [_node("a", 0.9)], "assets": []})
+
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)):
+            result = await sdk.manage.hybrid_search("group", {"query": "hello"}, fusion="weighted")
+            assert [node["node"]["text"] for node in result["nodes"]] == ["a"]
+            assert result["metadata"]["partial"] is True
+            assert result["metadata"]["paths"]["graph"]["status"] == "error"
+            assert result["metadata"]["paths"]["vector"]["status"] == "ok"
@@ -0,0 +1,124 @@
+import pytest
+from CriadexSDK.ragflow_cache import ValidatorCache
+from CriadexSDK.ragflow_graph import GraphPollBackoff
+from CriadexSDK.ragflow_schemas import GraphStatusResponse
+import httpx
+
+
+class _Server:
+    """MockTransport handler whose graph jobs advance ``step`` percent per status poll."""
+
+    def __init__(self, step=50, failing=()):
+        self.step = step
+        self.failing = set(failing)
+        self.jobs = {}
+        self.max_building = 0
+
+    def __call__(self, request):
+        group_name, action = request.url.path.split("/")[2:4]
+        if action == "build_graph":
+            self.jobs[group_name] = 0
+            building = sum(1 for progress in self.jobs.values() if progress < 100)
+            self.max_building = max(self.max_building, building)
+            return httpx.Response(200, json={"job": {"job_id": f"job-{group_name}", "state": "QUEUED"}})
+        progress = self.jobs[group_name] = min(self.jobs[group_name] + self.step, 100)
+        if progress < 100:
+            state = "RUNNING"
+        else:
+            state = "FAILED" if group_name in self.failing else "COMPLETED"
+        return httpx.Response(200, json={
+            "group_name": group_name,
+            "graph": {"status": "BUILT" if state == "COMPLETED" else "NOT_BUILT"},
+            "job": {"job_id": f"job-{group_name}", "state": state, "progress": progress},
+        })
+
+
+class TestGraphPollBackoff:
+    """Tests for the progress-adaptive poll interval."""
+
+    def test_stalled_progress_backs_off(self):
+        backoff = GraphPollBackoff(initial_interval=1.0, max_interval=8.0, multiplier=2.0)
+        assert backoff.next_interval(0, now=0.0) == 1.0
+        assert backoff.next_interval(0, now=1.0) == 2.0
+        assert backoff.next_interval(0, now=3.0) == 4.0
+        assert backoff.next_interval(0, now=7.0) == 8.0
+        assert backoff.next_interval(0, now=15.0) == 8.0
+
+    def test_moving_progress_polls_toward_estimated_finish(self):
+        backoff = GraphPollBackoff(initial_interval=0.5, max_interval=30.0)
+        backoff.next_interval(0, now=0.0)
+        # 10%/s at 50%: about 5s left, so the next poll is halfway there
+        assert backoff.next_interval(50, now=5.0) == 2.5
+        assert backoff.next_interval(99, now=10.0) == 0.5
+
+
+class TestBuildGraphAndWait:
+    """Tests for GroupsRouter.build_graph_and_wait."""
+
+    @pytest.mark.asyncio
+    async def test_returns_final_typed_status(self, mock_sdk):
+        sdk = mock_sdk(_Server(step=50))
+        status = await sdk.manage.build_graph_and_wait("group", initial_interval=0.001, max_interval=0.01)
+        assert isinstance(status, GraphStatusResponse)
+        assert status.job.state == "COMPLETED"
+        assert status.job.progress == 100
+        assert status.graph.status == "BUILT"
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, mock_sdk):
+        sdk = mock_sdk(_Server(step=0))
+        with pytest.raises(TimeoutError):
+            await sdk.manage.build_graph_and_wait("group", timeout=0.05, initial_interval=0.001, max_interval=0.01)
+
+
+class TestBuildGraphs:
+    """Tests for the multi-group build scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_and_progress(self, mock_sdk):
+        server = _Server(step=25, failing={"g3"})
+        snapshots = []
+        groups = [f"g{i}" for i in range(6)]
+        result = await mock_sdk(server).manage.build_graphs(
+            groups,
+            concurrency=2,
+            initial_interval=0.001,
+            max_interval=0.01,
+            on_progress=lambda progress: snapshots.append(progress.percent),
+        )
+        assert server.max_building <= 2
+        assert [item.key for item in result.items] == groups
+        assert result.succeeded == 5
+        assert [item.key for item in result.errors] == ["g3"]
+        assert result.errors[0].result.job.state == "FAILED"
+        assert snapshots == sorted(snapshots)
+        assert snapshots[-1] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_request_errors_are_recorded(self, mock_sdk):
+        server = _Server()
+
+        def handler(request):
+            if request.url.path.startswith("/groups/missing/"):
+                return httpx.Response(404, json={"detail": "no such group"})
+            return server(request)
+
+        sdk = mock_sdk(handler)
+        result = await sdk.manage.build_graphs(["missing", "group"], initial_interval=0.001, max_interval=0.01)
+        assert [item.ok for item in result.items] == [False, True]
+        assert result.items[0].error.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_polls_bypass_validator_cache(self, mock_sdk):
+        server = _Server(step=50)
+        cache = ValidatorCache(stale_while_revalidate=True)
+        sdk = mock_sdk(server, validator_cache=cache)
+        server.jobs["group"] = 100
+        # Seed a cached "already built" status from before the build
+        assert (await sdk.manage.graph_status("group"))["job"]["state"] == "COMPLETED"
+        refetched = cache.stats.refetched
+        status = await sdk.manage.build_graph_and_wait("group", initial_interval=0.001, max_interval=0.01)
+        assert status.job.progress == 100
+        assert server.jobs["group"] == 100
+        assert cache.stats.refetched == refetched
+        assert cache.stats.stale_served == 0
@@ -0,0 +1,176 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK
+from CriadexSDK.ragflow_hedging import HedgingPolicy, hedged, route_key
+import httpx
+
+
+def _policy(**kwargs):
+    # Generous budget so tests are not limited by the small request count
+    settings = dict(initial_delay=0.01, budget_ratio=1.0)
+    settings.update(kwargs)
+    return HedgingPolicy(**settings)
+
+
+class TestHedgingPolicy:
+    """Tests for hedge delay and budget."""
+
+    def test_delay_uses_percentile_after_min_samples(self):
+        policy = HedgingPolicy(percentile=0.9, initial_delay=2.0, min_samples=10)
+        assert policy.delay("content") == 2.0
+        for latency in range(1, 11):
+            policy.record_latency("content", latency / 10)
+        assert policy.delay("content") == 1.0
+        assert policy.delay("auth") == 2.0
+
+    def test_budget_limits_hedges(self):
+        policy = HedgingPolicy(budget_ratio=0.1)
+        for _ in range(10):
+            policy.record_request()
+        assert policy.try_acquire_hedge() is True
+        assert policy.try_acquire_hedge() is False
+        assert policy.stats.budget_rejections == 1
+
+
+class TestRouteKey:
+    """Tests for per-route latency keys."""
+
+    def test_identifiers_are_collapsed(self):
+        assert route_key("get", "http://h/groups/a/content/list") == "GET /groups/{}/content/list"
+        assert route_key("POST", "http://h/groups/b/query") == "POST /groups/{}/query"
+        assert route_key("POST", "http://h/models/ragflow/7/agents/chat") == "POST /models/ragflow/{}/agents/chat"
+
+
+class TestHedged:
+    """Tests for the hedged call helper."""
+
+    @pytest.mark.asyncio
+    async def test_fast_call_not_hedged(self):
+        policy = _policy(initial_delay=1.0)
+        call = AsyncMock(return_value="ok")
+        assert await hedged(call, policy, "content") == "ok"
+        assert call.call_count == 1
+        assert policy.stats.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_backup_wins_and_loser_cancelled(self):
+        policy = _policy()
+        cancelled = asyncio.Event()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return "backup"
+
+        assert await hedged(call, policy, "content") == "backup"
+        assert cancelled.is_set()
+        assert policy.stats.hedged == 1
+        assert policy.stats.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_backup_falls_back_to_primary(self):
+        policy = _policy()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+                return "primary"
+            raise ValueError("backup failed")
+
+        assert await hedged(call, policy, "content") == "primary"
+
+
+    @pytest.mark.asyncio
+    async def test_failed_result_does_not_win(self):
+        policy = _policy()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+                return 200
+            return 503
+
+        assert await hedged(call, policy, "content", is_failure=lambda status: status >= 500) == 200
+        assert policy.stats.hedge_wins == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_result_returned_when_nothing_succeeds(self):
+        policy = _policy()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+                raise ValueError("primary failed")
+            return 503
+
+        assert await hedged(call, policy, "content", is_failure=lambda status: status >= 500) == 503
+
+
+class TestHedgingIntegration:
+    """Tests for hedging through the SDK."""
+
+    @pytest.mark.asyncio
+    async def test_idempotent_reads_are_hedged(self, ok_response):
+        policy = _policy()
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", hedging=policy)
+        calls = 0
+
+        async def request(method, url, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+            return ok_response({"nodes": []})
+
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)):
+            assert await sdk.content.search("test_group", {"prompt": "hello"}) == {"nodes": []}
+        assert policy.stats.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_are_never_hedged(self, ok_response):
+        policy = _policy()
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", hedging=policy)
+
+        async def request(method, url, **kwargs):
+            await asyncio.sleep(0.05)
+            return ok_response({"token_usage": 1})
+
+        with patch.object(sdk._httpx, 'request', new=AsyncMock(side_effect=request)) as mock_request:
+            await sdk.content.upload("test_group", {"file_name": "a.txt"})
+            assert mock_request.call_count == 1
+        assert policy.stats.requests == 0
+
+    @pytest.mark.asyncio
+    async def test_backup_5xx_waits_for_primary(self, mock_sdk):
+        policy = _policy()
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.1)
+                return httpx.Response(200, json={"nodes": []})
+            return httpx.Response(503)
+
+        sdk = mock_sdk(handler, hedging=policy)
+        assert await sdk.content.search("test_group", {"prompt": "hello"}) == {"nodes": []}
+        assert calls == 2
+        assert policy.stats.hedge_wins == 0
@@ -0,0 +1,123 @@
+import pytest
+from CriadexSDK.ragflow_sdk import CriadexAPIError
+from CriadexSDK.ragflow_retry import RetryPolicy
+from CriadexSDK.ragflow_stream import JSONArrayItems
+import httpx
+
+
+async def _chunks(text, size=7):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestJSONArrayItems:
+    """Tests for incremental decoding of a JSON array."""
+
+    @pytest.mark.asyncio
+    async def test_items_and_rest(self):
+        items = JSONArrayItems(_chunks('{"files": ["a.txt", "b, \\"c\\".txt"], "next_cursor": "p2"}'), "files")
+        assert await _collect(items) == ["a.txt", 'b, "c".txt']
+        assert items.rest == {"next_cursor": "p2"}
+
+    @pytest.mark.asyncio
+    async def test_bare_array_and_numbers_split_across_chunks(self):
+        items = JSONArrayItems(_chunks("[12345, 6789, {\"x\": [1]}]", size=3), "files")
+        assert await _collect(items) == [12345, 6789, {"x": [1]}]
+
+    @pytest.mark.asyncio
+    async def test_truncated_body(self):
+        with pytest.raises(ValueError):
+            await _collect(JSONArrayItems(_chunks('{"files": ["a", "b"'), "files"))
+
+
+class TestIterList:
+    """Tests for ContentRouter.iter_list."""
+
+    @pytest.mark.asyncio
+    async def test_offset_paging(self, mock_sdk):
+        documents = [f"doc{i}.txt" for i in range(5)]
+        requests = []
+
+        def handler(request):
+            requests.append(dict(request.url.params))
+            offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+            return httpx.Response(200, json={"files": documents[offset:offset + limit]})
+
+        assert await _collect(mock_sdk(handler).content.iter_list("group", page_size=2)) == documents
+        assert [params["offset"] for params in requests] == ["0", "2", "4"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_paging(self, mock_sdk):
+        pages = {None: (["a", "b"], "c1"), "c1": (["c", "d"], "c2"), "c2": (["e"], None)}
+
+        def handler(request):
+            names, next_cursor = pages[request.url.params.get("cursor")]
+            return httpx.Response(200, json={"files": names, "next_cursor": next_cursor})
+
+        assert await _collect(mock_sdk(handler).content.iter_list("group", page_size=2)) == ["a", "b", "c", "d", "e"]
+
+    @pytest.mark.asyncio
+    async def test_server_without_paging(self, mock_sdk):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"files": ["a", "b"]})
+
+        # Exactly one page's worth: the repeated first page is detected and dropped
+        assert await _collect(mock_sdk(handler).content.iter_list("group", page_size=2)) == ["a", "b"]
+        assert len(calls) == 2
+        calls.clear()
+        assert await _collect(mock_sdk(handler).content.iter_list("group", page_size=1)) == ["a", "b"]
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_error_status(self, mock_sdk):
+        sdk = mock_sdk(lambda request: httpx.Response(404, text="no such group"))
+        with pytest.raises(CriadexAPIError) as excinfo:
+            await _collect(sdk.content.iter_list("missing"))
+        assert excinfo.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_failed_page_is_retried(self, mock_sdk):
+        documents = [f"doc{i}.txt" for i in range(4)]
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.params["offset"])
+            if requests.count("2") == 1 and request.url.params["offset"] == "2":
+                return httpx.Response(503, text="busy")
+            offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+            return httpx.Response(200, json={"files": documents[offset:offset + limit]})
+
+        sdk = mock_sdk(handler, retry_policy=RetryPolicy(base_delay=0))
+        assert await _collect(sdk.content.iter_list("group", page_size=2)) == documents
+        assert requests == ["0", "2", "2", "4"]
+
+    @pytest.mark.asyncio
+    async def test_page_interrupted_midway_resumes_without_duplicates(self, mock_sdk):
+        attempts = []
+
+        async def broken_body():
+            yield b'{"files": ["a", "b", '
+            raise httpx.ReadError("connection reset")
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                return httpx.Response(200, content=broken_body())
+            return httpx.Response(200, json={"files": ["a", "b", "c"]})
+
+        sdk = mock_sdk(handler, retry_policy=RetryPolicy(base_delay=0))
+        assert await _collect(sdk.content.iter_list("group", page_size=5)) == ["a", "b", "c"]
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_page_size_must_be_positive(self, mock_sdk):
+        sdk = mock_sdk(lambda request: httpx.Response(200, json={"files": []}))
+        with pytest.raises(ValueError):
+            await _collect(sdk.content.iter_list("group", page_size=0))
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK
+from CriadexSDK.ragflow_priority import Priority, PriorityScheduler, as_priority
+from CriadexSDK.ragflow_concurrency import AdaptiveConcurrencyLimiter
+
+
+async def _admission_order(scheduler, priorities):
+    """Queue one waiter per priority behind a held slot and return the order they are admitted in."""
+    order = []
+
+    async def waiter(index, priority):
+        await scheduler.acquire(priority)
+        order.append(index)
+
+    await scheduler.acquire(Priority.HIGH)
+    tasks = [asyncio.ensure_future(waiter(index, priority)) for index, priority in enumerate(priorities)]
+    await asyncio.sleep(0)
+    for _ in priorities:
+        scheduler.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestPriorityScheduler:
+    """Tests for priority admission and the low-priority minimum share."""
+
+    def test_as_priority(self):
+        assert as_priority("high") is Priority.HIGH
+        assert as_priority(2) is Priority.LOW
+        assert as_priority(None) is Priority.NORMAL
+
+    @pytest.mark.asyncio
+    async def test_high_priority_admitted_first(self):
+        scheduler = PriorityScheduler(max_concurrency=1, min_share=0.0)
+        order = await _admission_order(scheduler, [Priority.LOW, Priority.NORMAL, Priority.HIGH])
+        assert order == [2, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_low_priority_gets_minimum_share(self):
+        scheduler = PriorityScheduler(max_concurrency=1, min_share=0.5)
+        priorities = [Priority.LOW] + [Priority.HIGH] * 4
+        order = await _admission_order(scheduler, priorities)
+        # Passed over once (0.5 credit), then admitted on the second decision (1.0 credit)
+        assert order == [1, 0, 2, 3, 4]
+        assert scheduler.stats.admitted[Priority.LOW] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = PriorityScheduler(max_concurrency=1)
+        await scheduler.acquire()
+        task = asyncio.ensure_future(scheduler.acquire(Priority.LOW))
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth(Priority.LOW) == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert scheduler.queue_depth() == 0
+        scheduler.release()
+        assert scheduler.in_flight == 0
+
+
+class TestPrioritizedRequests:
+    """Tests for priorities threaded through the routers."""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_defaults_and_overrides(self, ok_response):
+        scheduler = PriorityScheduler(max_concurrency=4)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", scheduler=scheduler)
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"status": "ok"})
+            await sdk.content.search("group", {"prompt": "hi"})
+            await sdk.content.upload("group", {"file_name": "a.txt"})
+            await sdk.models.list()
+            await sdk.content.with_options(priority=Priority.HIGH).upload("group", {"file_name": "b.txt"})
+        assert scheduler.stats.admitted == {Priority.HIGH: 2, Priority.NORMAL: 1, Priority.LOW: 1}
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_in_scheduler_releases_limiter_slot(self):
+        scheduler = PriorityScheduler(max_concurrency=1)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", scheduler=scheduler, concurrency_limiter=limiter)
+        await scheduler.acquire(Priority.HIGH)
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            calls = [asyncio.ensure_future(sdk.models.list()) for _ in range(5)]
+            await asyncio.sleep(0.01)
+            assert limiter.in_flight == 5
+            for call in calls:
+                call.cancel()
+            await asyncio.gather(*calls, return_exceptions=True)
+            mock_request.assert_not_called()
+        assert limiter.in_flight == 0
+        assert scheduler.queue_depth() == 0
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import pytest
+from CriadexSDK.ragflow_sdk import CriadexAPIError
+from CriadexSDK.ragflow_schemas import GraphSearchResponse
+import httpx
+
+_BUILT = {"status": "BUILT", "source": "graph", "expanded_terms": ["loops"]}
+_FALLBACK = {"status": "NOT_BUILT", "source": "standard", "fallback_reason": "graph not built"}
+
+
+def _node(text, score):
+    node = {"text": text, "metadata": {}, "class_name": "TextNode", "text_template": "", "metadata_template": ""}
+    return {"node": node, "score": score}
+
+
+class _Server:
+    """MockTransport handler with configurable delays and graph metadata per path."""
+
+    def __init__(self, graph_delay=0.0, standard_delay=0.0, graph_metadata=_BUILT, standard_status=200):
+        self.graph_delay = graph_delay
+        self.standard_delay = standard_delay
+        self.graph_metadata = graph_metadata
+        self.standard_status = standard_status
+        self.bodies = {}
+        self.finished = []
+
+    async def __call__(self, request):
+        path = "graph" if request.url.path.endswith("/graph_search") else "standard"
+        self.bodies[path] = json.loads(request.content)
+        await asyncio.sleep(self.graph_delay if path == "graph" else self.standard_delay)
+        self.finished.append(path)
+        if path == "graph":
+            return httpx.Response(200, json={
+                "nodes": [_node("graph", 0.9)], "assets": [], "graph_metadata": self.graph_metadata,
+            })
+        if self.standard_status != 200:
+            return httpx.Response(self.standard_status, json={"detail": "unavailable"})
+        return httpx.Response(200, json={"nodes": [_node("standard", 0.8)], "assets": [], "search_units": 1})
+
+
+class TestRaceSearch:
+    """Tests for GroupsRouter.race_search."""
+
+    @pytest.mark.asyncio
+    async def test_graph_wins_within_budget(self, mock_sdk):
+        server = _Server(graph_delay=0.01, standard_delay=0.5)
+        sdk = mock_sdk(server, max_retries=1)
+        result = await sdk.manage.race_search("group", {"query": "loops", "top_k": 3, "max_hops": 2})
+        assert result["nodes"][0]["node"]["text"] == "graph"
+        race = result["metadata"]["race"]
+        assert race["winner"] == "graph"
+        assert race["graph"]["status"] == "ok"
+        assert race["standard"]["status"] == "cancelled"
+        assert server.finished == ["graph"]
+        assert server.bodies["standard"] == {"prompt": "loops", "top_k": 3}
+
+    @pytest.mark.asyncio
+    async def test_slow_graph_falls_back_to_standard(self, mock_sdk):
+        server = _Server(graph_delay=0.5, standard_delay=0.01)
+        sdk = mock_sdk(server, max_retries=1)
+        result = await sdk.manage.race_search("group", {"query": "loops"}, latency_budget=0.05)
+        race = result["metadata"]["race"]
+        assert result["nodes"][0]["node"]["text"] == "standard"
+        assert race["winner"] == "standard"
+        assert race["graph"]["status"] == "timeout"
+        assert race["standard"]["status"] == "ok"
+        assert race["graph"]["latency_ms"] >= 40
+        assert server.finished == ["standard"]
+
+    @pytest.mark.asyncio
+    async def test_unbuilt_graph_uses_standard_results(self, mock_sdk):
+        server = _Server(graph_metadata=_FALLBACK, standard_delay=0.02)
+        sdk = mock_sdk(server, max_retries=1, typed_responses=True)
+        result = await sdk.manage.race_search("group", {"query": "loops"})
+        assert not isinstance(result, GraphSearchResponse)
+        assert result.nodes[0].node.text == "standard"
+        assert result.metadata["race"]["graph"]["status"] == "unusable"
+
+    @pytest.mark.asyncio
+    async def test_standard_failure_returns_graph_fallback(self, mock_sdk):
+        server = _Server(graph_metadata=_FALLBACK, standard_status=503)
+        result = await mock_sdk(server, max_retries=1).manage.race_search("group", {"query": "loops"})
+        assert result["metadata"]["race"]["winner"] == "graph"
+        assert result["metadata"]["race"]["standard"]["status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_both_paths_failing_raises(self, mock_sdk):
+        server = _Server(graph_delay=0.5, standard_status=503)
+        with pytest.raises(CriadexAPIError):
+            await mock_sdk(server, max_retries=1).manage.race_search("group", {"query": "loops"}, latency_budget=0.01)
@@ -0,0 +1,152 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexCircuitOpenError, CriadexNetworkError, CriadexOverloadedError
+from CriadexSDK.ragflow_breaker import CircuitBreakerRegistry
+from CriadexSDK.ragflow_concurrency import AdaptiveConcurrencyLimiter
+from CriadexSDK.ragflow_ratelimit import AdaptiveRateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for the token bucket itself."""
+
+    def test_burst_then_queue(self):
+        bucket = TokenBucket(rate=10.0, burst=2)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_pause_holds_callers(self):
+        bucket = TokenBucket(rate=10.0, burst=5)
+        bucket.pause(3.0)
+        assert bucket.reserve() == pytest.approx(3.0, abs=0.05)
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for scoping and AIMD rate adaptation."""
+
+    def test_scope_keys(self):
+        limiter = AdaptiveRateLimiter(scope="group")
+        limiter.on_throttled("key", "http://h/groups/a/content/search")
+        assert limiter.current_rate("key", "http://h/groups/a/content/upload") == 5.0
+        assert limiter.current_rate("key", "http://h/groups/b/content/search") == 10.0
+        assert limiter.current_rate("other", "http://h/groups/a/content/search") == 10.0
+
+    def test_group_scope_behind_path_prefix(self):
+        limiter = AdaptiveRateLimiter(scope="group")
+        limiter.on_throttled("key", "http://h/api/groups/a/query")
+        assert limiter.current_rate("key", "http://h/api/groups/a/content/upload") == 5.0
+        assert limiter.current_rate("key", "http://h/api/groups/b/query") == 10.0
+
+    def test_invalid_scope(self):
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(scope="host")
+
+    def test_decrease_floor_and_recovery(self):
+        limiter = AdaptiveRateLimiter(rate=4.0, min_rate=1.0, increase_step=1.0, recovery_interval=0.0)
+        url = "http://h/models/1/about"
+        for _ in range(5):
+            limiter.on_throttled("key", url)
+        assert limiter.current_rate("key", url) == 1.0
+        for _ in range(10):
+            limiter.on_success("key", url)
+        assert limiter.current_rate("key", url) == 4.0
+        assert limiter.stats.throttled == 5
+
+    def test_no_recovery_during_interval(self):
+        limiter = AdaptiveRateLimiter(rate=4.0, recovery_interval=60.0)
+        url = "http://h/models/1/about"
+        limiter.on_throttled("key", url)
+        limiter.on_success("key", url)
+        assert limiter.current_rate("key", url) == 2.0
+
+    @pytest.mark.asyncio
+    async def test_acquire_sleeps_when_empty(self):
+        limiter = AdaptiveRateLimiter(rate=1.0, burst=1)
+        with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            await limiter.acquire("key", "http://h/models/1/about")
+            mock_sleep.assert_not_called()
+            await limiter.acquire("key", "http://h/models/1/about")
+            assert mock_sleep.call_args.args[0] == pytest.approx(1.0, abs=0.05)
+        assert limiter.stats.delayed == 1
+
+
+    @pytest.mark.asyncio
+    async def test_wait_beyond_timeout_is_refused(self):
+        limiter = AdaptiveRateLimiter(rate=1.0, burst=1)
+        url = "http://h/models/1/about"
+        assert await limiter.acquire("key", url, timeout=0.5)
+        with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            assert not await limiter.acquire("key", url, timeout=0.5)
+            mock_sleep.assert_not_called()
+        assert limiter.stats.rejected == 1
+        # The refused reservation was refunded, so the next caller waits about one token, not two
+        with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            assert await limiter.acquire("key", url)
+            assert mock_sleep.call_args.args[0] == pytest.approx(1.0, abs=0.05)
+
+
+class TestRateLimitedRequests:
+    """Tests for the rate limiter wired through RAGFlowSDK."""
+
+    @pytest.mark.asyncio
+    async def test_429_slows_down_and_pauses_for_retry_after(self, error_response, ok_response):
+        limiter = AdaptiveRateLimiter(rate=10.0)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", rate_limiter=limiter)
+        sdk.authenticate("key")
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [error_response(429, {"retry-after": "2"}), ok_response({"status": "ok"})]
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                result = await sdk.models.list()
+            assert result == {"status": "ok"}
+            # Retry sleep honours Retry-After, then the paused bucket holds the retry as well
+            waits = [call.args[0] for call in mock_sleep.call_args_list]
+            assert waits[0] >= 2.0
+        assert limiter.current_rate("key", "http://localhost:8000/models") == 5.0
+        assert limiter.stats.throttled == 1
+        assert limiter.stats.acquired == 2
+
+    @pytest.mark.asyncio
+    async def test_paused_bucket_respects_deadline(self):
+        limiter = AdaptiveRateLimiter(rate=10.0)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", rate_limiter=limiter, deadline=5.0)
+        sdk.authenticate("key")
+        limiter.on_throttled("key", "http://localhost:8000/models/list", retry_after=60.0)
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                with pytest.raises(CriadexNetworkError):
+                    await sdk.models.list()
+                mock_sleep.assert_not_called()
+            mock_request.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_before_waiting_for_a_token(self):
+        limiter = AdaptiveRateLimiter(rate=10.0)
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", rate_limiter=limiter, circuit_breakers=registry)
+        url = "http://localhost:8000/models/list"
+        registry.get(url).record_failure()
+        limiter.on_throttled(None, url, retry_after=2.0)
+        with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            with pytest.raises(CriadexCircuitOpenError):
+                await sdk.models.list()
+            mock_sleep.assert_not_called()
+        assert limiter.stats.acquired == 0
+
+    @pytest.mark.asyncio
+    async def test_shed_call_refunds_its_token(self):
+        limiter = AdaptiveRateLimiter(rate=1.0, burst=1)
+        concurrency = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, max_queue=0)
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", rate_limiter=limiter, concurrency_limiter=concurrency)
+        assert await concurrency.acquire()
+        with pytest.raises(CriadexOverloadedError):
+            await sdk.models.list()
+        # The shed call gave its token back, so the next call does not wait for a refill
+        with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            assert await limiter.acquire(None, "http://localhost:8000/models/list")
+            mock_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_default_has_no_limiter(self):
+        sdk = RAGFlowSDK(api_base="http://localhost:8000")
+        assert "rate_limiter" not in sdk._request_options
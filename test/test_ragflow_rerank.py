@@ -0,0 +1,88 @@
+import asyncio
+import json
+import pytest
+from CriadexSDK.ragflow_sdk import CriadexAPIError
+from CriadexSDK.ragflow_schemas import AgentRerankResponse
+import httpx
+
+
+def _node(index):
+    node = {"text": f"doc{index}", "metadata": {}, "class_name": "TextNode", "text_template": "", "metadata_template": ""}
+    return {"node": node, "score": 0.0}
+
+
+class _Server:
+    """MockTransport handler that scores each document on its own, like an absolute-score reranker."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.payloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @staticmethod
+    def score(node):
+        # Deterministic, request-independent relevance in [0, 1)
+        return (int(node["node"]["text"][3:]) * 37 % 101) / 101
+
+    async def __call__(self, request):
+        payload = json.loads(request.content)
+        self.payloads.append(payload)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.fail_on is not None and any(node["node"]["text"] == self.fail_on for node in payload["documents"]):
+            return httpx.Response(413, json={"detail": "payload too large"})
+        ranked = sorted(
+            ({**node, "score": self.score(node)} for node in payload["documents"]),
+            key=lambda node: node["score"],
+            reverse=True,
+        )
+        ranked = [node for node in ranked if node["score"] >= payload.get("min_n", 0.0)][: payload.get("top_n")]
+        return httpx.Response(200, json={
+            "agent_response": {"message": None, "ranked_nodes": ranked, "search_units": 1},
+        })
+
+
+class TestChunkedRerank:
+    """Tests for chunked parallel reranking."""
+
+    @pytest.mark.asyncio
+    async def test_matches_single_shot(self, mock_sdk):
+        config = {"prompt": "loops", "nodes": [_node(i) for i in range(500)], "top_n": 10, "min_n": 0.2}
+        single = await mock_sdk(_Server(), api_key="test_key", max_retries=1).agents.cohere.rerank("m", config)
+        server = _Server()
+        sdk = mock_sdk(server, api_key="test_key", max_retries=1)
+        chunked = await sdk.agents.cohere.rerank("m", config, chunk_size=64, concurrency=3)
+        assert chunked["agent_response"]["ranked_nodes"] == single["agent_response"]["ranked_nodes"]
+        assert len(server.payloads) == 8
+        assert max(len(payload["documents"]) for payload in server.payloads) == 64
+        assert all(payload["top_n"] == 10 for payload in server.payloads)
+        assert server.max_in_flight == 3
+        assert chunked["agent_response"]["search_units"] == 8
+
+    @pytest.mark.asyncio
+    async def test_small_lists_are_sent_in_one_request(self, mock_sdk):
+        server = _Server()
+        sdk = mock_sdk(server, api_key="test_key", max_retries=1)
+        await sdk.agents.cohere.rerank("m", {"prompt": "q", "nodes": [_node(1)]}, chunk_size=64)
+        assert len(server.payloads) == 1
+
+    @pytest.mark.asyncio
+    async def test_typed_and_top_n_capped_to_chunk(self, mock_sdk):
+        server = _Server()
+        config = {"prompt": "q", "nodes": [_node(i) for i in range(5)], "top_n": 4}
+        sdk = mock_sdk(server, api_key="test_key", max_retries=1, typed_responses=True)
+        result = await sdk.agents.cohere.rerank("m", config, chunk_size=2)
+        assert isinstance(result, AgentRerankResponse)
+        assert len(result.agent_response.ranked_nodes) == 4
+        assert [payload["top_n"] for payload in server.payloads] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_raises(self, mock_sdk):
+        server = _Server(fail_on="doc3")
+        config = {"prompt": "q", "nodes": [_node(i) for i in range(8)]}
+        with pytest.raises(CriadexAPIError) as excinfo:
+            await mock_sdk(server, api_key="test_key", max_retries=1).agents.cohere.rerank("m", config, chunk_size=2)
+        assert excinfo.value.status_code == 413
@@ -0,0 +1,107 @@
+import datetime
+from email.utils import format_datetime
+import pytest
+from unittest.mock import patch, AsyncMock
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexAPIError, CriadexNetworkError
+from CriadexSDK.ragflow_retry import RetryBudget, RetryPolicy, parse_retry_after
+import httpx
+
+
+class TestRetryPolicy:
+    """Tests for backoff and Retry-After handling."""
+
+    def test_full_jitter_bounds(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        with patch("CriadexSDK.ragflow_retry.random.uniform", side_effect=lambda low, high: high) as uniform:
+            assert policy.backoff(0) == 1.0
+            assert policy.backoff(2) == 4.0
+            assert policy.backoff(10) == 5.0
+            assert all(call.args[0] == 0 for call in uniform.call_args_list)
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        future = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+        assert 25 < parse_retry_after(format_datetime(future, usegmt=True)) <= 30
+
+    def test_retry_after_raises_delay_and_is_capped(self):
+        policy = RetryPolicy(max_retry_after=10.0)
+        with patch("CriadexSDK.ragflow_retry.random.uniform", return_value=0.1):
+            assert policy.delay(0, {"retry-after": "3"}) == 3.0
+            assert policy.delay(0, {"retry-after": "120"}) == 10.0
+            assert policy.delay(0, {}) == 0.1
+
+
+class TestRetryBudget:
+    """Tests for the client-wide retry budget."""
+
+    def test_budget_caps_retry_ratio(self):
+        budget = RetryBudget(ratio=0.5, min_retries=1)
+        for _ in range(4):
+            budget.record_request()
+        assert [budget.try_acquire_retry() for _ in range(4)] == [True, True, True, False]
+        assert budget.rejected == 1
+
+
+class TestRetryBehaviour:
+    """Tests for retries through _request_with_retry."""
+
+    @pytest.mark.asyncio
+    async def test_429_is_retried_with_retry_after(self, error_response, ok_response):
+        sdk = RAGFlowSDK(api_base="http://localhost:8000")
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [error_response(429, {"retry-after": "2"}), ok_response({"status": "ok"})]
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                result = await sdk.models.list()
+            assert result == {"status": "ok"}
+            assert mock_request.call_count == 2
+            assert mock_sleep.call_args.args[0] >= 2.0
+
+    @pytest.mark.asyncio
+    async def test_429_exhausted_raises_api_error(self, error_response):
+        sdk = RAGFlowSDK(api_base="http://localhost:8000")
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = error_response(429)
+            with patch('asyncio.sleep', new_callable=AsyncMock):
+                with pytest.raises(CriadexAPIError) as excinfo:
+                    await sdk.models.list()
+            assert excinfo.value.status_code == 429
+            assert mock_request.call_count == sdk._max_retries
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_stops_retries(self, error_response):
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", retry_budget=RetryBudget(ratio=0.0, min_retries=0))
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = error_response(503)
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                with pytest.raises(CriadexAPIError):
+                    await sdk.models.list()
+            assert mock_request.call_count == 1
+            mock_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_attempt_timeout(self, ok_response):
+        sdk = RAGFlowSDK(api_base="http://localhost:8000", timeout=30.0)
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = ok_response({"status": "ok"})
+            await sdk.models.with_options(deadline=2.0).list()
+            timeout = mock_request.call_args.kwargs["timeout"]
+            assert timeout.read <= 2.0
+            assert timeout.connect <= 2.0
+
+    @pytest.mark.asyncio
+    async def test_deadline_skips_sleep_that_would_overrun(self):
+        sdk = RAGFlowSDK(
+            api_base="http://localhost:8000",
+            deadline=1.0,
+            retry_policy=RetryPolicy(base_delay=10.0, max_delay=10.0),
+        )
+        with patch.object(sdk._httpx, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = httpx.ConnectError("Connection failed")
+            with patch("CriadexSDK.ragflow_retry.random.uniform", return_value=5.0):
+                with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                    with pytest.raises(CriadexNetworkError):
+                        await sdk.models.list()
+            assert mock_request.call_count == 1
+            mock_sleep.assert_not_called()
@@ -0,0 +1,140 @@
+import json
+import pytest
+from CriadexSDK.ragflow_sdk import CriadexAPIError, CriadexCircuitOpenError
+from CriadexSDK.ragflow_breaker import CircuitBreakerRegistry
+from CriadexSDK.ragflow_concurrency import AdaptiveConcurrencyLimiter
+from CriadexSDK.ragflow_priority import Priority, PriorityScheduler
+from CriadexSDK.ragflow_ratelimit import AdaptiveRateLimiter
+from CriadexSDK.ragflow_retry import RetryPolicy
+from CriadexSDK.ragflow_schemas import ChatAgentResponse
+import httpx
+
+
+FINAL_RESPONSE = {
+    "message": "Hello world",
+    "usage": [{"completion_tokens": 2, "prompt_tokens": 5, "total_tokens": 7}],
+    "chat_response": {
+        "message": {"role": "assistant", "blocks": [{"block_type": "text", "text": "Hello world"}]},
+        "raw": {
+            "id": "chat-1",
+            "choices": [],
+            "created": 0,
+            "model": "gpt",
+            "object": "chat.completion",
+            "system_fingerprint": None,
+            "usage": {"completion_tokens": 2, "prompt_tokens": 5, "total_tokens": 7},
+        },
+    },
+}
+
+
+class TestChatStream:
+    """Tests for streamed agent chat responses."""
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_yields_deltas_and_final_response(self, mock_sdk):
+        seen = {}
+
+        def handler(request):
+            seen["body"] = json.loads(request.content)
+            seen["url"] = str(request.url)
+            events = [
+                {"delta": "Hello"},
+                {"choices": [{"delta": {"content": " world"}}]},
+                {"agent_response": FINAL_RESPONSE},
+            ]
+            body = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+            return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body.encode())
+
+        sdk = mock_sdk(handler)
+        async with sdk.agents.azure.chat_stream("test_model", {"history": []}) as stream:
+            deltas = [delta async for delta in stream]
+
+        assert deltas == ["Hello", " world"]
+        assert stream.text == "Hello world"
+        assert isinstance(stream.response, ChatAgentResponse)
+        assert stream.usage[0].total_tokens == 7
+        assert stream.time_to_first_token is not None
+        assert stream.duration >= stream.time_to_first_token
+        assert seen["url"] == "http://localhost:8000/models/ragflow/test_model/agents/chat"
+        assert seen["body"] == {"history": [], "stream": True}
+
+    @pytest.mark.asyncio
+    async def test_ndjson_stream(self, mock_sdk):
+        def handler(request):
+            lines = [{"delta": "a"}, {"delta": "b"}, {"usage": {"completion_tokens": 1, "prompt_tokens": 1, "total_tokens": 2}}]
+            body = "\n".join(json.dumps(line) for line in lines)
+            return httpx.Response(200, headers={"content-type": "application/x-ndjson"}, content=body.encode())
+
+        stream = mock_sdk(handler).agents.azure.chat_stream("test_model", {"history": []})
+        assert [delta async for delta in stream] == ["a", "b"]
+        assert stream.response is None
+        assert stream.usage[0].total_tokens == 2
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_server_falls_back(self, mock_sdk):
+        def handler(request):
+            return httpx.Response(200, json={"agent_response": FINAL_RESPONSE})
+
+        stream = mock_sdk(handler).agents.azure.chat_stream("test_model", {"history": []})
+        assert [delta async for delta in stream] == ["Hello world"]
+        assert stream.response.message == "Hello world"
+
+    @pytest.mark.asyncio
+    async def test_error_status_raises_api_error(self, mock_sdk):
+        def handler(request):
+            return httpx.Response(400, text="Bad Request")
+
+        stream = mock_sdk(handler).agents.azure.chat_stream("test_model", {"history": []})
+        with pytest.raises(CriadexAPIError) as excinfo:
+            async for _ in stream:
+                pass
+        assert excinfo.value.status_code == 400
+
+
+class TestChatStreamPolicies:
+    """Tests for the client's scheduling, limiting and retry policies applied to streamed chats."""
+
+    @pytest.mark.asyncio
+    async def test_slots_held_until_stream_closes(self, mock_sdk):
+        def handler(request):
+            body = "".join(f"data: {json.dumps({'delta': delta})}\n\n" for delta in "abc")
+            return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body.encode())
+
+        scheduler = PriorityScheduler(max_concurrency=1)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        sdk = mock_sdk(handler, scheduler=scheduler, concurrency_limiter=limiter)
+        async with sdk.agents.azure.chat_stream("test_model", {"history": []}) as stream:
+            async for _ in stream:
+                assert scheduler.in_flight == limiter.in_flight == 1
+                break
+        assert scheduler.in_flight == limiter.in_flight == 0
+        assert scheduler.stats.admitted[Priority.HIGH] == 1
+
+    @pytest.mark.asyncio
+    async def test_throttled_stream_is_retried_before_first_delta(self, mock_sdk):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"retry-after": "0"}, text="slow down")
+            return httpx.Response(200, headers={"content-type": "application/x-ndjson"}, content=b'{"delta": "ok"}')
+
+        rate_limiter = AdaptiveRateLimiter(rate=100.0)
+        sdk = mock_sdk(handler, rate_limiter=rate_limiter, retry_policy=RetryPolicy(base_delay=0))
+        stream = sdk.agents.azure.chat_stream("test_model", {"history": []})
+        assert [delta async for delta in stream] == ["ok"]
+        assert len(calls) == 2
+        assert rate_limiter.stats.throttled == 1
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self, mock_sdk):
+        calls = []
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+        sdk = mock_sdk(lambda request: calls.append(request), circuit_breakers=registry)
+        registry.get("http://localhost:8000/models/ragflow/test_model/agents/chat").record_failure()
+        with pytest.raises(CriadexCircuitOpenError):
+            async for _ in sdk.agents.azure.chat_stream("test_model", {"history": []}):
+                pass
+        assert calls == []
@@ -0,0 +1,129 @@
+import os
+import re
+import pytest
+from CriadexSDK.ragflow_sync import SyncManifest, plan_sync
+import httpx
+
+
+class _Server:
+    """MockTransport handler that keeps a group's documents in a dict."""
+
+    def __init__(self, files=None):
+        self.files = dict(files or {})
+        self.calls = []
+
+    async def __call__(self, request):
+        action = request.url.path.rsplit("/", 1)[-1]
+        if action == "list":
+            return httpx.Response(200, json={"files": sorted(self.files)})
+        if action == "delete":
+            name = request.url.params["document_name"]
+            self.calls.append(("delete", name))
+            self.files.pop(name, None)
+            return httpx.Response(200, json={})
+        body = b"".join([chunk async for chunk in request.stream])
+        name = re.search(rb'name="file_name"\r\n\r\n(.*?)\r\n', body).group(1).decode()
+        self.calls.append((action, name))
+        self.files[name] = body
+        return httpx.Response(200, json={"document_name": name, "token_usage": 1})
+
+
+@pytest.fixture
+def course(tmp_path):
+    (tmp_path / "week1").mkdir()
+    (tmp_path / "week1" / "notes.txt").write_text("intro")
+    (tmp_path / "syllabus.txt").write_text("grading")
+    return tmp_path
+
+
+class TestPlanSync:
+    """Tests for diff planning."""
+
+    def test_plan(self):
+        plan = plan_sync(
+            {"a": "h1", "b": "h2", "c": "h3"},
+            ["b", "c", "old"],
+            {"b": "h2", "c": "stale"},
+            delete_missing=True,
+        )
+        assert plan.upload == ["a"]
+        assert plan.update == ["c"]
+        assert plan.unchanged == ["b"]
+        assert plan.delete == ["old"]
+        assert plan.changes == 3
+
+    def test_keep_remote_only_documents_by_default(self):
+        assert plan_sync({}, ["old"], {}).delete == []
+
+
+class TestSyncManifest:
+    """Tests for the SQLite manifest."""
+
+    def test_persisted_hashes(self, tmp_path):
+        path = tmp_path / "manifest.sqlite"
+        manifest = SyncManifest(path)
+        manifest.record_hash("group", "a.txt", 1, 10, "h1")
+        manifest.mark_synced("group", "a.txt", "h1")
+        manifest.close()
+        reopened = SyncManifest(path)
+        assert reopened.cached_hash("group", "a.txt", 1, 10) == "h1"
+        assert reopened.cached_hash("group", "a.txt", 2, 10) is None
+        assert reopened.synced_hash("group", "a.txt") == "h1"
+
+
+class TestContentSync:
+    """Tests for ContentRouter.sync."""
+
+    @pytest.mark.asyncio
+    async def test_dry_run_makes_no_changes(self, mock_sdk, course):
+        server = _Server({"old.txt": b""})
+        plan = (await mock_sdk(server).content.sync("group", course, delete_missing=True, dry_run=True)).plan
+        assert plan.upload == ["syllabus.txt", "week1/notes.txt"]
+        assert plan.delete == ["old.txt"]
+        assert server.calls == []
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync(self, mock_sdk, course, tmp_path_factory):
+        manifest = SyncManifest(tmp_path_factory.mktemp("state") / "manifest.sqlite")
+        server = _Server({"old.txt": b""})
+        sdk = mock_sdk(server)
+
+        first = await sdk.content.sync("group", course, manifest=manifest, delete_missing=True)
+        assert first.result.succeeded == 3
+        assert sorted(server.calls) == [("delete", "old.txt"), ("upload", "syllabus.txt"), ("upload", "week1/notes.txt")]
+
+        server.calls.clear()
+        second = await sdk.content.sync("group", course, manifest=manifest)
+        assert second.plan.changes == 0
+        assert server.calls == []
+
+        notes = course / "week1" / "notes.txt"
+        notes.write_text("intro, revised")
+        os.utime(notes, ns=(notes.stat().st_atime_ns, notes.stat().st_mtime_ns + 1_000_000))
+        third = await sdk.content.sync("group", course, manifest=manifest)
+        assert third.plan.update == ["week1/notes.txt"]
+        assert server.calls == [("update", "week1/notes.txt")]
+
+    @pytest.mark.asyncio
+    async def test_without_manifest_existing_documents_are_updated(self, mock_sdk, course):
+        server = _Server({"syllabus.txt": b""})
+        result = await mock_sdk(server).content.sync("group", course)
+        assert result.plan.update == ["syllabus.txt"]
+        assert result.plan.upload == ["week1/notes.txt"]
+
+    @pytest.mark.asyncio
+    async def test_remote_only_documents_are_kept_by_default(self, mock_sdk, course):
+        server = _Server({"old.txt": b""})
+        result = await mock_sdk(server).content.sync("group", course)
+        assert result.plan.delete == []
+        assert "old.txt" in server.files
+
+    @pytest.mark.asyncio
+    async def test_missing_directory_raises(self, mock_sdk, tmp_path):
+        server = _Server({"old.txt": b""})
+        with pytest.raises(FileNotFoundError):
+            await mock_sdk(server).content.sync("group", tmp_path / "typo", delete_missing=True)
+        (tmp_path / "file.txt").write_text("")
+        with pytest.raises(NotADirectoryError):
+            await mock_sdk(server).content.sync("group", tmp_path / "file.txt", delete_missing=True)
+        assert server.calls == []
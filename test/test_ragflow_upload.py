@@ -0,0 +1,111 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from CriadexSDK.ragflow_sdk import RAGFlowSDK, CriadexNetworkError
+from CriadexSDK.ragflow_upload import MultipartUpload
+import httpx
+
+
+class _Server:
+    """MockTransport handler that records streamed request bodies and optionally fails first."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.requests = []
+        self.bodies = []
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        body = b"".join([chunk async for chunk in request.stream])
+        self.bodies.append(body)
+        if self.failures:
+            self.failures -= 1
+            raise httpx.ConnectError("connection reset")
+        return httpx.Response(200, json={"document_name": "lecture.pdf", "token_usage": 3})
+
+
+def _file_part(body, boundary):
+    """Return the bytes of the multipart part named ``file``."""
+    for part in body.split(f"--{boundary}".encode()):
+        if b'name="file"' in part:
+            return part.split(b"\r\n\r\n", 1)[1][: -len(b"\r\n")]
+    raise AssertionError("no file part")
+
+
+class TestMultipartUpload:
+    """Tests for the multipart body itself."""
+
+    @pytest.mark.asyncio
+    async def test_file_is_read_in_chunks(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"abcdefghij" * 10)
+        upload = MultipartUpload(str(path), "notes.txt", chunk_size=16)
+        chunks = [chunk async for chunk in upload]
+        assert max(len(chunk) for chunk in chunks[1:-1]) <= 16
+        body = b"".join(chunks)
+        assert len(body) == upload.content_length
+        assert _file_part(body, upload.boundary) == b"abcdefghij" * 10
+
+    @pytest.mark.asyncio
+    async def test_stream_can_only_be_sent_once(self):
+        async def stream():
+            yield b"data"
+
+        upload = MultipartUpload(stream(), "data.bin")
+        assert upload.content_length is None
+        assert [chunk async for chunk in upload]
+        with pytest.raises(RuntimeError):
+            [chunk async for chunk in upload]
+
+
+class TestUploadFile:
+    """Tests for ContentRouter.upload_file."""
+
+    @pytest.mark.asyncio
+    async def test_upload_from_path(self, mock_sdk, tmp_path):
+        path = tmp_path / "lecture.pdf"
+        path.write_bytes(b"%PDF" + bytes(range(256)) * 64)
+        server = _Server()
+        sdk = mock_sdk(server)
+        result = await sdk.content.upload_file("group", str(path), file_metadata={"course": "EECS 1001"})
+        assert result == {"document_name": "lecture.pdf", "token_usage": 3}
+        request = server.requests[0]
+        assert request.url.path == "/groups/group/content/upload"
+        assert request.headers["content-type"].startswith("multipart/form-data; boundary=")
+        assert int(request.headers["content-length"]) == len(server.bodies[0])
+        boundary = request.headers["content-type"].split("boundary=")[1]
+        assert _file_part(server.bodies[0], boundary) == path.read_bytes()
+        assert b'{"course": "EECS 1001"}' in server.bodies[0]
+        assert b'filename="lecture.pdf"' in server.bodies[0]
+
+    @pytest.mark.asyncio
+    async def test_path_upload_is_replayed_on_retry(self, mock_sdk, tmp_path):
+        path = tmp_path / "lecture.pdf"
+        path.write_bytes(b"x" * 1000)
+        server = _Server(failures=1)
+        sdk = mock_sdk(server)
+        with patch('asyncio.sleep', new_callable=AsyncMock):
+            await sdk.content.upload_file("group", path)
+        assert len(server.requests) == 2
+        assert server.bodies[0] == server.bodies[1]
+
+    @pytest.mark.asyncio
+    async def test_stream_upload_is_not_retried(self, mock_sdk):
+        async def stream():
+            for _ in range(4):
+                yield b"chunk"
+
+        server = _Server(failures=1)
+        sdk = mock_sdk(server)
+        with pytest.raises(CriadexNetworkError):
+            await sdk.content.upload_file("group", stream(), file_name="transcript.txt")
+        assert len(server.requests) == 1
+        assert "content-length" not in server.requests[0].headers
+
+    @pytest.mark.asyncio
+    async def test_stream_requires_file_name(self):
+        async def stream():
+            yield b""
+
+        sdk = RAGFlowSDK(api_base="http://localhost:8000")
+        with pytest.raises(ValueError):
+            await sdk.content.upload_file("group", stream())